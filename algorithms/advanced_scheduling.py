@@ -1,8 +1,18 @@
 from db import db
 from models.court_booking import CourtBookingModel
 from models.match import MatchModel
+from models.team import TeamModel
+from algorithms.occupancy import OccupancyIndex
+from algorithms.optimized_scheduling import optimize_schedule, day_lower_bound
+from utils.time_slots import to_minutes, to_time_str
+from utils.metrics import timed
+from sqlalchemy import insert
 from datetime import datetime, timedelta
 from collections import defaultdict
+import uuid
+
+MAX_DAYS = 30  # Search window for the scheduler
+MATCH_DURATION_MINUTES = 60  # Default, overridable per scheduling run
 
 def get_player_schedule(player_id, start_date, end_date):
     """Get all booked times for a player within date range"""
@@ -76,7 +86,7 @@ def has_match_on_date(team_id, booking_date):
     
     return False
 
-def can_schedule_match(match, court, booking_date, start_time, end_time, buffer_minutes=10):
+def can_schedule_match(match, court, booking_date, start_time, end_time, buffer_minutes=10, index=None):
     """
     Check if match can be scheduled at given time on court.
     Includes: court availability, buffer time, no player double-booking, 
@@ -84,56 +94,14 @@ def can_schedule_match(match, court, booking_date, start_time, end_time, buffer_
     Returns: (can_schedule: bool, conflict_details: str or None)
     """
     
-    # Check 1: Court is not already booked at this time
-    conflict_booking = CourtBookingModel.query.filter(
-        CourtBookingModel.court_id == court.id,
-        CourtBookingModel.booking_date == booking_date,
-        CourtBookingModel.start_time < end_time,
-        CourtBookingModel.end_time > start_time
-    ).first()
-    
-    if conflict_booking:
-        return False, f"Court {court.name} is already booked {conflict_booking.start_time}-{conflict_booking.end_time}"
-    
-    # Check 2: Court has buffer time (no back-to-back matches)
-    buffer_start = (datetime.strptime(start_time, "%H:%M") - timedelta(minutes=buffer_minutes)).strftime("%H:%M")
-    buffer_end = (datetime.strptime(end_time, "%H:%M") + timedelta(minutes=buffer_minutes)).strftime("%H:%M")
-    
-    buffer_conflict = CourtBookingModel.query.filter(
-        CourtBookingModel.court_id == court.id,
-        CourtBookingModel.booking_date == booking_date,
-        CourtBookingModel.start_time < buffer_end,
-        CourtBookingModel.end_time > buffer_start
-    ).first()
-    
-    if buffer_conflict:
-        return False, f"Not enough buffer time on {court.name} (need {buffer_minutes} min gap)"
-    
-    # Check 3: No player is double-booked
-    from models.team_member import TeamMemberModel
-    
-    team1_players = [m.player_id for m in TeamMemberModel.query.filter_by(team_id=match.team1_id).all()]
-    team2_players = [m.player_id for m in TeamMemberModel.query.filter_by(team_id=match.team2_id).all()]
-    all_players = team1_players + team2_players
-    
-    for player_id in all_players:
-        player_bookings = get_player_schedule(player_id, booking_date, booking_date)
-        
-        for booking in player_bookings:
-            if booking["date"] == booking_date:
-                if booking["start_time"] < end_time and booking["end_time"] > start_time:
-                    return False, f"Player in team has conflict: {booking['court']} at {booking['start_time']}-{booking['end_time']}"
-    
-    # Check 4: Team doesn't already have a match on this date (across all tournaments)
-    if has_match_on_date(match.team1_id, booking_date):
-        return False, f"Team 1 already has a match scheduled on {booking_date} (only 1 match per day allowed)"
+    if index is None:
+        index = OccupancyIndex.load([court], [match.team1_id, match.team2_id], booking_date, booking_date)
     
-    if has_match_on_date(match.team2_id, booking_date):
-        return False, f"Team 2 already has a match scheduled on {booking_date} (only 1 match per day allowed)"
-    
-    return True, None
+    return index.check(
+        match, court.id, booking_date, to_minutes(start_time), to_minutes(end_time), buffer_minutes
+    )
 
-def find_next_available_slot(match, courts, start_date, time_slots, buffer_minutes=10):
+def find_next_available_slot(match, courts, start_date, time_slots, buffer_minutes=10, index=None, match_duration_minutes=MATCH_DURATION_MINUTES):
     """
     Find the next available slot for a match across courts and dates.
     STRICT RULE: Each team can only play 1 match per day (no same-day matches).
@@ -141,47 +109,60 @@ def find_next_available_slot(match, courts, start_date, time_slots, buffer_minut
     """
     
     current_date = start_date
-    max_days = 30
     
-    for day_offset in range(max_days):
+    if index is None:
+        index = OccupancyIndex.load(
+            courts, [match.team1_id, match.team2_id],
+            start_date, start_date + timedelta(days=MAX_DAYS - 1)
+        )
+    
+    slots = [(to_minutes(time_slot), to_minutes(time_slot) + match_duration_minutes) for time_slot in time_slots]
+    
+    for day_offset in range(MAX_DAYS):
         search_date = current_date + timedelta(days=day_offset)
         
-        # Check if EITHER team already has a match on this date
-        team1_has_match = has_match_on_date(match.team1_id, search_date)
-        team2_has_match = has_match_on_date(match.team2_id, search_date)
-        
         # If either team busy, skip this entire day and go to next day
-        if team1_has_match or team2_has_match:
+        if index.team_has_match_on(match.team1_id, search_date) or index.team_has_match_on(match.team2_id, search_date):
             continue
         
         # Try each court and time slot on this date
         for court in courts:
-            for time_slot in time_slots:
-                start_time = time_slot
-                end_time = (datetime.strptime(time_slot, "%H:%M") + timedelta(hours=1)).strftime("%H:%M")
-                
-                can_schedule, conflict = can_schedule_match(
-                    match, court, search_date, start_time, end_time, buffer_minutes
+            for start, end in slots:
+                can_schedule, conflict = index.check(
+                    match, court.id, search_date, start, end, buffer_minutes
                 )
                 
                 if can_schedule:
-                    return court, search_date, start_time, end_time
+                    return court, search_date, to_time_str(start), to_time_str(end)
     
     return None, None, None, None
 
-def schedule_matches_intelligent(tournament, courts, start_date, time_slots=None, buffer_minutes=10):
+@timed("schedule_matches_intelligent")
+def schedule_matches_intelligent(tournament, courts, start_date, time_slots=None, buffer_minutes=10, mode="greedy", time_budget_seconds=10, match_duration_minutes=MATCH_DURATION_MINUTES):
     """
     Intelligently schedule all pending matches with conflict detection.
-    Uses backtracking to find valid schedules for all matches.
+    Loads every relevant booking once into an OccupancyIndex, answers all
+    conflict checks from memory and writes the new bookings in one bulk insert.
+    
+    Modes:
+    - "greedy": first free slot for each match, round by round
+    - "optimize": DSatur backtracking search minimising tournament days,
+      bounded by time_budget_seconds
     """
     
     if not time_slots:
         time_slots = ["10:00", "12:00", "14:00", "16:00", "18:00"]
     
-    # Get all pending matches
-    pending_matches = MatchModel.query.filter_by(
-        tournament_id=tournament.id,
-        status="pending"
+    # Get all pending matches that don't have a booking yet
+    pending_matches = MatchModel.query.outerjoin(
+        CourtBookingModel, CourtBookingModel.match_id == MatchModel.id
+    ).filter(
+        MatchModel.tournament_id == tournament.id,
+        MatchModel.status == "pending",
+        CourtBookingModel.id.is_(None)
+    ).order_by(
+        MatchModel.round_num,
+        MatchModel.created_at
     ).all()
     
     if not pending_matches:
@@ -190,37 +171,69 @@ def schedule_matches_intelligent(tournament, courts, start_date, time_slots=None
     if not courts:
         return False, "No courts available", 0
     
-    scheduled_count = 0
-    failed_matches = []
+    team_ids = {m.team1_id for m in pending_matches} | {m.team2_id for m in pending_matches}
+    team_names = dict(
+        db.session.query(TeamModel.id, TeamModel.name).filter(TeamModel.id.in_(team_ids)).all()
+    )
     
-    for match in pending_matches:
-        if match.court_booking:
-            continue
-        
-        # Find next available slot
-        court, date, start_time, end_time = find_next_available_slot(
-            match, courts, start_date, time_slots, buffer_minutes
+    # The optimizer isn't tied to the greedy 30-day window: it searches up
+    # to twice the theoretical minimum number of days
+    window_days = MAX_DAYS
+    if mode == "optimize":
+        window_days = max(MAX_DAYS, 2 * day_lower_bound(pending_matches, len(courts), len(time_slots)))
+    
+    index = OccupancyIndex.load(
+        courts, team_ids, start_date, start_date + timedelta(days=window_days - 1)
+    )
+    
+    placements = []
+    failed = []
+    
+    if mode == "optimize":
+        placements, failed = optimize_schedule(
+            pending_matches, courts, start_date, time_slots, buffer_minutes,
+            index, window_days, match_duration_minutes, time_budget_seconds
         )
-        
-        if court and date:
-            # Create booking
-            booking = CourtBookingModel(
-                match_id=match.id,
-                court_id=court.id,
-                booking_date=date,
-                start_time=start_time,
-                end_time=end_time
+    else:
+        for match in pending_matches:
+            # Find next available slot
+            court, date, start_time, end_time = find_next_available_slot(
+                match, courts, start_date, time_slots, buffer_minutes, index=index,
+                match_duration_minutes=match_duration_minutes
             )
-            db.session.add(booking)
-            scheduled_count += 1
             
-            print(f"✅ Scheduled: {match.team1.name} vs {match.team2.name}")
-            print(f"   Court: {court.name}, Date: {date}, Time: {start_time}-{end_time}")
-        else:
-            failed_matches.append(f"{match.team1.name} vs {match.team2.name}")
+            if court and date:
+                start, end = to_minutes(start_time), to_minutes(end_time)
+                index.add(match, court.id, date, start, end)
+                placements.append((match, court.id, date, start, end))
+            else:
+                failed.append(match)
+    
+    court_names = {court.id: court.name for court in courts}
+    new_bookings = []
+    
+    for match, court_id, date, start, end in sorted(placements, key=lambda p: (p[2], p[3], court_names[p[1]])):
+        new_bookings.append({
+            "id": str(uuid.uuid4()),
+            "match_id": match.id,
+            "court_id": court_id,
+            "booking_date": date,
+            "start_minutes": start,
+            "end_minutes": end
+        })
+        
+        print(f"✅ Scheduled: {team_names.get(match.team1_id)} vs {team_names.get(match.team2_id)}")
+        print(f"   Court: {court_names[court_id]}, Date: {date}, Time: {to_time_str(start)}-{to_time_str(end)}")
+    
+    failed_matches = [f"{team_names.get(m.team1_id)} vs {team_names.get(m.team2_id)}" for m in failed]
     
+    # Write all bookings in one bulk insert
+    if new_bookings:
+        db.session.execute(insert(CourtBookingModel), new_bookings)
     db.session.commit()
     
+    scheduled_count = len(new_bookings)
+    
     if failed_matches:
         message = f"Scheduled {scheduled_count} matches. Failed to schedule: {', '.join(failed_matches)}"
         return False, message, scheduled_count
@@ -1,9 +1,10 @@
 from db import db
 from models.court_booking import CourtBookingModel
 from models.match import MatchModel
+from utils.time_slots import to_minutes
 from datetime import datetime, timedelta
 
-def schedule_matches(tournament, courts, start_date, time_slots=None):
+def schedule_matches(tournament, courts, start_date, time_slots=None, match_duration_minutes=60):
     """
     Schedule matches on courts.
     time_slots: list of times like ["10:00", "12:00", "14:00", "16:00"]
@@ -39,15 +40,14 @@ def schedule_matches(tournament, courts, start_date, time_slots=None):
         time_slot = time_slots[slot_index % len(time_slots)]
         
         # Create booking
-        start_time = datetime.strptime(time_slot, "%H:%M")
-        end_time = start_time + timedelta(hours=1)  # 1 hour per match
+        start_minutes = to_minutes(time_slot)
         
         booking = CourtBookingModel(
             match_id=match.id,
             court_id=court.id,
             booking_date=current_date,
-            start_time=time_slot,
-            end_time=end_time.strftime("%H:%M")
+            start_minutes=start_minutes,
+            end_minutes=start_minutes + match_duration_minutes
         )
         
         db.session.add(booking)
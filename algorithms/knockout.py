@@ -1,113 +1,242 @@
 from db import db
 from models.match import MatchModel
-from algorithms.positions_table import get_tournament_standings
+from models.team import TeamModel
+from models.tournament import TournamentModel
+from models.bracket_slot import BracketSlotModel
+from algorithms.positions_table import UNRANKED, get_tournament_standings
+from sqlalchemy import insert
+from sqlalchemy.orm import aliased
+import math
+import uuid
+
+# Teams per pool that go through to the knockout phase
+QUALIFIERS_PER_POOL = 2
+
+def knockout_qualifiers(standings, per_pool=QUALIFIERS_PER_POOL):
+    """
+    Knockout seeds from pool standings: every pool winner, then every
+    runner-up, and so on; within a tier by points, game difference, games
+    won, then team ranking (unranked teams last).
+    A single pool sends its top 4 (top 8 from 9 teams up), in standings order.
+    """
+
+    pools = {}
+    for s in standings:
+        pools.setdefault(s["pool"], []).append(s)
+
+    if len(pools) <= 1:
+        return standings[:4] if len(standings) <= 8 else standings[:8]
+
+    seeds = []
+    for place in range(per_pool):
+        tier = [pool[place] for pool in pools.values() if place < len(pool)]
+        seeds.extend(sorted(tier, key=lambda s: (
+            -s["points"], -s["game_difference"], -s["games_for"],
+            UNRANKED if s["ranking"] is None else s["ranking"]
+        )))
+    return seeds
+
+def seed_order(size):
+    """
+    Seeds in first-round bracket order, so seeds 1 and 2 can only meet in the
+    final: size 8 -> [1, 8, 4, 5, 2, 7, 3, 6]
+    """
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [s for seed in order for s in (seed, total - seed)]
+    return order
+
+def round_name(round_num, rounds):
+    remaining = rounds - round_num
+    if remaining == 0:
+        return "Final"
+    if remaining == 1:
+        return "Semi-finals"
+    if remaining == 2:
+        return "Quarter-finals"
+    return f"Round of {2 ** (remaining + 1)}"
+
+def _match_row(tournament_id, slot):
+    return {
+        "id": str(uuid.uuid4()),
+        "tournament_id": tournament_id,
+        "team1_id": slot["team1_id"],
+        "team2_id": slot["team2_id"],
+        "status": "pending",
+        "phase": "knockout",
+        "round_num": slot["round_num"]
+    }
+
+def build_bracket(tournament_id, teams):
+    """
+    The whole single-elimination tree for teams (in seed order) as
+    bracket_slots rows, plus the matches that can already be played.
+    The bracket is padded to a power of two; the top seeds get the byes and
+    go straight into the next round.
+    Returns: (slot rows, match rows)
+    """
+
+    rounds = max(1, math.ceil(math.log2(len(teams))))
+    size = 2 ** rounds
+    order = seed_order(size)
+
+    # Create every slot top-down so each one knows its parent
+    slots = {}
+    for round_num in range(rounds, 0, -1):
+        for position in range(size >> round_num):
+            parent = slots.get((round_num + 1, position // 2))
+            slots[(round_num, position)] = {
+                "id": str(uuid.uuid4()),
+                "tournament_id": tournament_id,
+                "round_num": round_num,
+                "position": position,
+                "team1_id": None,
+                "team2_id": None,
+                "seed1": None,
+                "seed2": None,
+                "is_bye": False,
+                "match_id": None,
+                "winner_id": None,
+                "next_slot_id": parent["id"] if parent else None,
+                "next_side": position % 2 + 1 if parent else None
+            }
+
+    for position in range(size // 2):
+        slot = slots[(1, position)]
+        for side, seed in ((1, order[2 * position]), (2, order[2 * position + 1])):
+            if seed <= len(teams):
+                slot[f"team{side}_id"] = teams[seed - 1].id
+                slot[f"seed{side}"] = seed
+
+    # Byes advance at once; then every slot with both teams gets its match
+    matches = []
+    for round_num in range(1, rounds + 1):
+        for position in range(size >> round_num):
+            slot = slots[(round_num, position)]
+            if slot["team1_id"] and slot["team2_id"]:
+                match = _match_row(tournament_id, slot)
+                slot["match_id"] = match["id"]
+                matches.append(match)
+            elif round_num == 1 and (slot["team1_id"] or slot["team2_id"]):
+                slot["is_bye"] = True
+                slot["winner_id"] = slot["team1_id"] or slot["team2_id"]
+                parent = slots[(2, position // 2)]
+                parent[f"team{slot['next_side']}_id"] = slot["winner_id"]
+
+    return list(slots.values()), matches
 
 def generate_knockout_bracket(tournament):
     """
-    Generate knockout bracket based on group phase standings.
-    Takes top teams and creates semi-finals and finals.
+    Generate the full knockout bracket from group phase standings (top teams
+    of each pool, seeded) in one transaction.
     """
-    
-    # Get standings from group phase
-    standings = get_tournament_standings(tournament)
-    
-    if len(standings) < 2:
+
+    qualifiers = knockout_qualifiers(get_tournament_standings(tournament))
+
+    if len(qualifiers) < 2:
         return False
-    
-    # Determine number of knockout teams
-    # If 2-4 teams: direct finals
-    # If 5-8 teams: semi-finals + finals
-    # If 9+ teams: quarter-finals + semi-finals + finals
-    
-    num_teams = len(standings)
-    
-    if num_teams == 2:
-        # Direct final
-        create_final(tournament, standings[0]["team"], standings[1]["team"])
-    elif num_teams <= 4:
-        # Semi-finals (top 2 vs bottom 2)
-        create_semifinals(tournament, standings)
-    elif num_teams <= 8:
-        # Semi-finals (top 4 advance)
-        create_semifinals(tournament, standings[:4])
-    else:
-        # Quarter-finals (top 8 advance)
-        create_quarterfinals(tournament, standings[:8])
-    
-    print(f"✅ Knockout bracket generated with {num_teams} teams")
+
+    slots, matches = build_bracket(tournament.id, [s["team"] for s in qualifiers])
+
+    # Matches first: slots point at them
+    db.session.execute(insert(MatchModel), matches)
+    db.session.execute(insert(BracketSlotModel), slots)
+    db.session.commit()
+
+    print(f"✅ Knockout bracket generated for {len(qualifiers)} teams ({len(slots)} slots, {len(matches)} matches ready)")
     return True
 
-def create_quarterfinals(tournament, top_teams):
-    """Create quarter-final matches"""
-    matches_created = 0
-    
-    # Seed 1 vs Seed 8, Seed 2 vs Seed 7, etc.
-    for i in range(0, 8, 2):
-        team1 = top_teams[i]["team"]
-        team2 = top_teams[7 - i]["team"]
-        
+def advance_winner(match_id, winner_id):
+    """
+    Move a finished knockout match's winner into its next-round slot (the
+    slot and its parent by key, O(1)). Creates the next match once both teams
+    are known; the final's winner finishes the tournament. Runs inside the
+    caller's transaction.
+    Returns: (error message or None, id of the next-round match it changed or created, or None)
+    """
+
+    slot = BracketSlotModel.query.filter_by(match_id=match_id).first()
+    if slot is None:
+        # Knockout matches created before the bracket table
+        return None, None
+
+    slot.winner_id = winner_id
+
+    if slot.next_slot_id is None:
+        TournamentModel.query.filter_by(id=slot.tournament_id).update(
+            {"status": "finished"}, synchronize_session=False
+        )
+        return None, None
+
+    parent = db.session.get(BracketSlotModel, slot.next_slot_id)
+    side = f"team{slot.next_side}_id"
+    if getattr(parent, side) == winner_id:
+        return None, None
+
+    next_match = db.session.get(MatchModel, parent.match_id) if parent.match_id else None
+    if next_match is not None and next_match.status != "pending":
+        return "The next round match has already been played", None
+
+    # A corrected result swaps the team in the next round
+    setattr(parent, side, winner_id)
+    if next_match is not None:
+        setattr(next_match, side, winner_id)
+    elif parent.team1_id and parent.team2_id:
         match = MatchModel(
-            tournament_id=tournament.id,
-            team1_id=team1.id,
-            team2_id=team2.id,
+            tournament_id=parent.tournament_id,
+            team1_id=parent.team1_id,
+            team2_id=parent.team2_id,
             status="pending",
             phase="knockout",
-            round_num=1  # Quarter-finals
+            round_num=parent.round_num
         )
         db.session.add(match)
-        matches_created += 1
-    
-    db.session.commit()
-    print(f"✅ Created {matches_created} quarter-final matches")
-
-def create_semifinals(tournament, top_teams):
-    """Create semi-final matches"""
-    matches_created = 0
-    
-    # Top 2 teams and bottom 2 teams
-    if len(top_teams) >= 4:
-        team1 = top_teams[0]["team"]
-        team2 = top_teams[1]["team"]
-        team3 = top_teams[2]["team"]
-        team4 = top_teams[3]["team"]
-        
-        # Semi-final 1: Seed 1 vs Seed 4
-        match1 = MatchModel(
-            tournament_id=tournament.id,
-            team1_id=team1.id,
-            team2_id=team4.id,
-            status="pending",
-            phase="knockout",
-            round_num=2  # Semi-finals
-        )
-        
-        # Semi-final 2: Seed 2 vs Seed 3
-        match2 = MatchModel(
-            tournament_id=tournament.id,
-            team1_id=team2.id,
-            team2_id=team3.id,
-            status="pending",
-            phase="knockout",
-            round_num=2  # Semi-finals
-        )
-        
-        db.session.add(match1)
-        db.session.add(match2)
-        matches_created = 2
-    
-    db.session.commit()
-    print(f"✅ Created {matches_created} semi-final matches")
-
-def create_final(tournament, team1, team2):
-    """Create final match"""
-    match = MatchModel(
-        tournament_id=tournament.id,
-        team1_id=team1.id,
-        team2_id=team2.id,
-        status="pending",
-        phase="knockout",
-        round_num=3  # Final
-    )
-    db.session.add(match)
-    db.session.commit()
-    print(f"✅ Created final match")
\ No newline at end of file
+        db.session.flush()
+        parent.match_id = match.id
+
+    return None, parent.match_id
+
+def get_bracket(tournament_id):
+    """
+    The bracket by round, with team names and match results (one query).
+    Returns: list of {"round_num", "name", "slots"}
+    """
+
+    team1 = aliased(TeamModel)
+    team2 = aliased(TeamModel)
+    rows = db.session.query(
+        BracketSlotModel, team1.name, team2.name,
+        MatchModel.status, MatchModel.team1_score, MatchModel.team2_score
+    ).outerjoin(
+        team1, team1.id == BracketSlotModel.team1_id
+    ).outerjoin(
+        team2, team2.id == BracketSlotModel.team2_id
+    ).outerjoin(
+        MatchModel, MatchModel.id == BracketSlotModel.match_id
+    ).filter(
+        BracketSlotModel.tournament_id == tournament_id
+    ).order_by(
+        BracketSlotModel.round_num, BracketSlotModel.position
+    ).all()
+
+    if not rows:
+        return []
+
+    rounds = rows[-1][0].round_num
+    bracket = [
+        {"round_num": round_num, "name": round_name(round_num, rounds), "slots": []}
+        for round_num in range(1, rounds + 1)
+    ]
+
+    for slot, team1_name, team2_name, status, team1_score, team2_score in rows:
+        bracket[slot.round_num - 1]["slots"].append({
+            **slot.to_dict(),
+            "team1_name": team1_name,
+            "team2_name": team2_name,
+            "match_status": status,
+            "team1_score": team1_score,
+            "team2_score": team2_score
+        })
+
+    return bracket
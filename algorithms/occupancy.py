@@ -0,0 +1,158 @@
+from db import db
+from models.court import CourtModel
+from models.court_booking import CourtBookingModel
+from models.match import MatchModel
+from models.team_member import TeamMemberModel
+from utils.time_slots import to_minutes, to_time_str
+from collections import defaultdict
+
+
+class OccupancyIndex:
+    """
+    In-memory view of every booking that can conflict with a scheduling run.
+
+    Loaded once for a date window, then answers all conflict checks without
+    touching the database:
+    - per (court, date): booked intervals
+    - per (player, date): booked intervals (across all of the player's teams)
+    - per team: dates with a match (one match per day rule)
+    """
+
+    def __init__(self):
+        self.court_slots = defaultdict(list)    # (court_id, date) -> [(start, end)]
+        self.player_slots = defaultdict(list)   # (player_id, date) -> [(start, end, court_name)]
+        self.team_days = defaultdict(set)       # team_id -> {date}
+        self.team_players = defaultdict(list)   # team_id -> [player_id]
+        self.court_names = {}                   # court_id -> name
+
+    @classmethod
+    def load(cls, courts, team_ids, start_date, end_date):
+        """
+        Load all bookings relevant to the given courts and teams between
+        start_date and end_date (inclusive) in a constant number of queries.
+        """
+        index = cls()
+        court_ids = [court.id for court in courts]
+        for court in courts:
+            index.court_names[court.id] = court.name
+
+        team_ids = set(team_ids)
+
+        # Players of the teams being scheduled
+        player_ids = set()
+        if team_ids:
+            rows = db.session.query(
+                TeamMemberModel.team_id, TeamMemberModel.player_id
+            ).filter(TeamMemberModel.team_id.in_(team_ids)).all()
+            for team_id, player_id in rows:
+                index.team_players[team_id].append(player_id)
+                player_ids.add(player_id)
+
+        # Every team those players belong to (they may play in other tournaments)
+        player_teams = defaultdict(list)
+        if player_ids:
+            rows = db.session.query(
+                TeamMemberModel.team_id, TeamMemberModel.player_id
+            ).filter(TeamMemberModel.player_id.in_(player_ids)).all()
+            for team_id, player_id in rows:
+                player_teams[team_id].append(player_id)
+
+        related_team_ids = team_ids | set(player_teams)
+
+        # All bookings on the courts or involving the related teams
+        filters = []
+        if court_ids:
+            filters.append(CourtBookingModel.court_id.in_(court_ids))
+        if related_team_ids:
+            filters.append(MatchModel.team1_id.in_(related_team_ids))
+            filters.append(MatchModel.team2_id.in_(related_team_ids))
+
+        if filters:
+            bookings = db.session.query(
+                CourtBookingModel.court_id,
+                CourtBookingModel.booking_date,
+                CourtBookingModel.start_minutes,
+                CourtBookingModel.end_minutes,
+                MatchModel.team1_id,
+                MatchModel.team2_id,
+                CourtModel.name
+            ).join(
+                MatchModel, CourtBookingModel.match_id == MatchModel.id
+            ).join(
+                CourtModel, CourtBookingModel.court_id == CourtModel.id
+            ).filter(
+                CourtBookingModel.booking_date >= start_date,
+                CourtBookingModel.booking_date <= end_date,
+                db.or_(*filters)
+            ).all()
+
+            for court_id, booking_date, start, end, team1_id, team2_id, court_name in bookings:
+                index.court_slots[(court_id, booking_date)].append((start, end))
+                index.court_names.setdefault(court_id, court_name)
+
+                for team_id in (team1_id, team2_id):
+                    if team_id not in related_team_ids:
+                        continue
+                    index.team_days[team_id].add(booking_date)
+                    for player_id in player_teams.get(team_id, []):
+                        index.player_slots[(player_id, booking_date)].append((start, end, court_name))
+
+        return index
+
+    def team_has_match_on(self, team_id, booking_date):
+        """Check if team already has a match on this date"""
+        return booking_date in self.team_days[team_id]
+
+    def check(self, match, court_id, booking_date, start, end, buffer_minutes=10):
+        """
+        Check if match can be placed at [start, end) minutes on court and date.
+        Returns: (can_schedule: bool, conflict_details: str or None)
+        """
+        court_name = self.court_names.get(court_id, court_id)
+        slots = self.court_slots[(court_id, booking_date)]
+
+        # Check 1: Court is not already booked at this time
+        for slot_start, slot_end in slots:
+            if slot_start < end and slot_end > start:
+                return False, f"Court {court_name} is already booked {to_time_str(slot_start)}-{to_time_str(slot_end)}"
+
+        # Check 2: Court has buffer time (no back-to-back matches)
+        for slot_start, slot_end in slots:
+            if slot_start < end + buffer_minutes and slot_end > start - buffer_minutes:
+                return False, f"Not enough buffer time on {court_name} (need {buffer_minutes} min gap)"
+
+        # Check 3: No player is double-booked
+        for team_id in (match.team1_id, match.team2_id):
+            for player_id in self.team_players[team_id]:
+                for slot_start, slot_end, slot_court in self.player_slots[(player_id, booking_date)]:
+                    if slot_start < end and slot_end > start:
+                        return False, f"Player in team has conflict: {slot_court} at {to_time_str(slot_start)}-{to_time_str(slot_end)}"
+
+        # Check 4: Team doesn't already have a match on this date
+        if self.team_has_match_on(match.team1_id, booking_date):
+            return False, f"Team 1 already has a match scheduled on {booking_date} (only 1 match per day allowed)"
+
+        if self.team_has_match_on(match.team2_id, booking_date):
+            return False, f"Team 2 already has a match scheduled on {booking_date} (only 1 match per day allowed)"
+
+        return True, None
+
+    def add(self, match, court_id, booking_date, start, end):
+        """Record a new booking so later checks see it"""
+        court_name = self.court_names.get(court_id, court_id)
+        self.court_slots[(court_id, booking_date)].append((start, end))
+
+        for team_id in (match.team1_id, match.team2_id):
+            self.team_days[team_id].add(booking_date)
+            for player_id in self.team_players[team_id]:
+                self.player_slots[(player_id, booking_date)].append((start, end, court_name))
+
+    def remove(self, match, court_id, booking_date, start, end):
+        """Undo a booking previously recorded with add()"""
+        court_name = self.court_names.get(court_id, court_id)
+        self.court_slots[(court_id, booking_date)].remove((start, end))
+
+        for team_id in (match.team1_id, match.team2_id):
+            self.team_days[team_id].discard(booking_date)
+            for player_id in self.team_players[team_id]:
+                self.player_slots[(player_id, booking_date)].remove((start, end, court_name))
@@ -0,0 +1,250 @@
+from utils.time_slots import to_minutes
+from collections import defaultdict
+from datetime import timedelta
+import math
+import time
+
+
+def _find_slot(index, match, courts, booking_date, slots, buffer_minutes):
+    """First (court_id, start, end) on this date where the match fits, or None"""
+    for court in courts:
+        for start, end in slots:
+            can_schedule, conflict = index.check(match, court.id, booking_date, start, end, buffer_minutes)
+            if can_schedule:
+                return court.id, start, end
+    return None
+
+
+def _first_fit(matches, courts, dates, slots, buffer_minutes, index):
+    """
+    Place matches in round order on the earliest free day.
+    The index is restored before returning.
+    Returns: (placements, complete)
+    """
+
+    placements = {}
+    ordered = sorted(matches, key=lambda m: m.round_num or 0)
+
+    try:
+        for match in ordered:
+            for booking_date in dates:
+                if index.team_has_match_on(match.team1_id, booking_date) or index.team_has_match_on(match.team2_id, booking_date):
+                    continue
+                slot = _find_slot(index, match, courts, booking_date, slots, buffer_minutes)
+                if slot is not None:
+                    court_id, start, end = slot
+                    index.add(match, court_id, booking_date, start, end)
+                    placements[match.id] = (court_id, booking_date, start, end)
+                    break
+        return dict(placements), len(placements) == len(matches)
+    finally:
+        for match in ordered:
+            if match.id in placements:
+                index.remove(match, *placements[match.id])
+
+
+def _solve_for_days(matches, courts, dates, slots, buffer_minutes, index, deadline, max_steps, allow_skip=False):
+    """
+    Try to place every match within the given dates.
+
+    DSatur ordering: always branch on the match with the fewest days left
+    (ties broken by how many other matches its teams still have to play,
+    then by round robin round),
+    trying days earliest first, and backtrack chronologically on a dead end.
+    With allow_skip, a match with no day left is dropped instead.
+
+    The index is restored before returning.
+    Returns: (placements, complete) where placements maps match.id ->
+    (court_id, date, start, end).
+    """
+
+    remaining_by_team = defaultdict(int)
+    for match in matches:
+        remaining_by_team[match.team1_id] += 1
+        remaining_by_team[match.team2_id] += 1
+
+    day_capacity = len(courts) * len(slots)
+    day_load = defaultdict(int)
+    open_days = set(dates)
+    # Days each team is still free on (one match per team per day)
+    team_free = {
+        team_id: {d for d in dates if not index.team_has_match_on(team_id, d)}
+        for team_id in remaining_by_team
+    }
+    # Days on which a match was found not to fit at any slot
+    no_slot = defaultdict(set)
+
+    def domain_set(match):
+        return (team_free[match.team1_id] & team_free[match.team2_id] & open_days) - no_slot[match.id]
+
+    def domain(match):
+        return sorted(domain_set(match))
+
+    unplaced = {match.id: match for match in matches}
+    placements = {}
+    stack = []  # (match, remaining candidate days)
+
+    def place(match, candidates):
+        while candidates:
+            booking_date = candidates.pop(0)
+            slot = _find_slot(index, match, courts, booking_date, slots, buffer_minutes)
+            if slot is None:
+                no_slot[match.id].add(booking_date)
+                continue
+            court_id, start, end = slot
+            index.add(match, court_id, booking_date, start, end)
+            day_load[booking_date] += 1
+            if day_load[booking_date] >= day_capacity:
+                open_days.discard(booking_date)
+            team_free[match.team1_id].discard(booking_date)
+            team_free[match.team2_id].discard(booking_date)
+            remaining_by_team[match.team1_id] -= 1
+            remaining_by_team[match.team2_id] -= 1
+            del unplaced[match.id]
+            placements[match.id] = (court_id, booking_date, start, end)
+            stack.append((match, candidates))
+            return True
+        return False
+
+    def undo():
+        match, candidates = stack.pop()
+        court_id, booking_date, start, end = placements.pop(match.id)
+        index.remove(match, court_id, booking_date, start, end)
+        day_load[booking_date] -= 1
+        open_days.add(booking_date)
+        team_free[match.team1_id].add(booking_date)
+        team_free[match.team2_id].add(booking_date)
+        remaining_by_team[match.team1_id] += 1
+        remaining_by_team[match.team2_id] += 1
+        unplaced[match.id] = match
+        # A slot was freed on this day, so earlier "no slot" findings are stale
+        for days in no_slot.values():
+            days.discard(booking_date)
+        return match, candidates
+
+    steps = 0
+    complete = True
+
+    try:
+        while unplaced:
+            steps += 1
+            if steps > max_steps or time.monotonic() > deadline:
+                complete = False
+                break
+
+            # DSatur: most constrained match first
+            match = min(
+                unplaced.values(),
+                key=lambda m: (
+                    len(domain_set(m)),
+                    -(remaining_by_team[m.team1_id] + remaining_by_team[m.team2_id]),
+                    m.round_num or 0
+                )
+            )
+
+            if place(match, domain(match)):
+                continue
+
+            if allow_skip:
+                del unplaced[match.id]
+                complete = False
+                continue
+
+            # Dead end: backtrack to the latest match that still has untried days
+            placed = False
+            while stack and not placed:
+                previous, candidates = undo()
+                placed = place(previous, candidates)
+
+            if not placed:
+                complete = False
+                break
+
+        return dict(placements), complete
+    finally:
+        while stack:
+            undo()
+
+
+def day_lower_bound(matches, num_courts, num_slots):
+    """Fewest days any schedule needs: one match per team per day, and day capacity"""
+    matches_per_team = defaultdict(int)
+    for match in matches:
+        matches_per_team[match.team1_id] += 1
+        matches_per_team[match.team2_id] += 1
+
+    return max(
+        max(matches_per_team.values(), default=0),
+        math.ceil(len(matches) / max(num_courts * num_slots, 1))
+    )
+
+
+def optimize_schedule(matches, courts, start_date, time_slots, buffer_minutes, index, max_days, match_duration_minutes, time_budget_seconds=10):
+    """
+    Assign matches to (court, date, time slot) minimising the number of
+    tournament days.
+
+    The round robin is treated as a graph-colouring problem where days are
+    colours and two matches sharing a team can't get the same day. The
+    better of a DSatur pass and a round-order first fit over the whole window
+    gives a starting schedule; then, while the time
+    budget lasts, the window is shrunk one day at a time and re-solved with
+    bounded backtracking until it can't be shrunk or the lower bound
+    (matches per team, matches per day capacity) is reached.
+
+    Returns: (placements, failed) where placements is a list of
+    (match, court_id, date, start, end) and failed a list of matches.
+    """
+
+    if not matches:
+        return [], []
+
+    deadline = time.monotonic() + time_budget_seconds
+    slots = [(to_minutes(t), to_minutes(t) + match_duration_minutes) for t in time_slots]
+    all_dates = [start_date + timedelta(days=offset) for offset in range(max_days)]
+    by_id = {match.id: match for match in matches}
+
+    lower_bound = day_lower_bound(matches, len(courts), len(slots))
+
+    def span(placements):
+        last_date = max(booking_date for court_id, booking_date, start, end in placements.values())
+        return (last_date - start_date).days + 1
+
+    # Two cheap starting points: DSatur over the whole window, and first fit
+    # in round robin order (already near optimal when rounds are assigned)
+    placements, complete = _solve_for_days(
+        matches, courts, all_dates, slots, buffer_minutes,
+        index, float("inf"), max_steps=len(matches), allow_skip=True
+    )
+    by_round, by_round_complete = _first_fit(matches, courts, all_dates, slots, buffer_minutes, index)
+    if by_round_complete and (not complete or span(by_round) < span(placements)):
+        placements, complete = by_round, True
+    elif not complete and len(by_round) > len(placements):
+        placements = by_round
+
+    if complete:
+        num_days = span(placements)
+        while num_days > lower_bound and time.monotonic() < deadline:
+            result, complete = _solve_for_days(
+                matches, courts, all_dates[:num_days - 1], slots, buffer_minutes,
+                index, deadline, max_steps=50 * len(matches)
+            )
+            if not complete:
+                break
+            placements = result
+            num_days = span(placements)
+
+        print(f"✅ Optimizer found a schedule over {num_days} days (lower bound {lower_bound})")
+    else:
+        print("⚠️ Optimizer could not place every match within the window")
+
+    # Keep the index in sync for the caller
+    for match_id, (court_id, booking_date, start, end) in placements.items():
+        index.add(by_id[match_id], court_id, booking_date, start, end)
+
+    placed = [
+        (by_id[match_id], court_id, booking_date, start, end)
+        for match_id, (court_id, booking_date, start, end) in placements.items()
+    ]
+    failed = [match for match in matches if match.id not in placements]
+    return placed, failed
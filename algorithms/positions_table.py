@@ -1,48 +1,286 @@
+from db import db
 from models.match import MatchModel
+from models.team import TeamModel
+from models.team_member import TeamMemberModel
+from models.tournament import TournamentTeamModel
+from models.tournament_standing import TournamentStandingModel
+from utils.metrics import timed
+from sqlalchemy import bindparam, insert
+from sqlalchemy.orm import joinedload
+import numpy as np
+import uuid
 
+WIN_POINTS = 3
+DRAW_POINTS = 1
+
+# Group phase totals kept per team in tournament_standings
+STANDING_TOTALS = ("matches_played", "wins", "draws", "losses", "points", "games_for", "games_against")
+
+# Ranking tie-break value of a team without a ranking: after every ranked team
+UNRANKED = np.iinfo(np.int64).max
+
+def ensure_standing(tournament_id, team_id):
+    """Get or create the persisted standings row for a team in a tournament"""
+    standing = TournamentStandingModel.query.filter_by(
+        tournament_id=tournament_id,
+        team_id=team_id
+    ).first()
+
+    if not standing:
+        standing = TournamentStandingModel(tournament_id=tournament_id, team_id=team_id)
+        db.session.add(standing)
+        db.session.flush()
+
+    return standing
+
+def ensure_standings(tournament_id, team_ids):
+    """Create the missing standings rows for many teams of a tournament (one bulk INSERT)"""
+    existing = {
+        team_id for (team_id,) in db.session.query(TournamentStandingModel.team_id).filter(
+            TournamentStandingModel.tournament_id == tournament_id,
+            TournamentStandingModel.team_id.in_(team_ids)
+        )
+    }
+    rows = [
+        {"id": str(uuid.uuid4()), "tournament_id": tournament_id, "team_id": team_id}
+        for team_id in dict.fromkeys(team_ids)
+        if team_id not in existing
+    ]
+    if rows:
+        db.session.execute(insert(TournamentStandingModel), rows)
+
+def _result(match):
+    """The add_result_deltas values of a match"""
+    return {
+        "tournament_id": match.tournament_id,
+        "team1_id": match.team1_id,
+        "team2_id": match.team2_id,
+        "team1_score": match.team1_score,
+        "team2_score": match.team2_score,
+        "winner_id": match.winner_id,
+        "phase": match.phase,
+        "status": match.status
+    }
+
+def apply_match_result(match, sign=1):
+    """
+    Add (sign=1) or reverse (sign=-1) a finished group match in the
+    persisted standings. Runs inside the caller's transaction; the caller
+    commits together with the match update.
+    """
+
+    deltas = {}
+    add_result_deltas(deltas, _result(match), sign)
+    apply_standings_deltas(deltas)
+
+def add_result_deltas(deltas, result, sign=1):
+    """
+    Add (sign=1) or reverse (sign=-1) a finished group result in deltas,
+    keyed (tournament_id, team_id) -> one value per STANDING_TOTALS column.
+    result: dict with the MatchModel tournament_id, team1_id, team2_id,
+    team1_score, team2_score, winner_id, phase and status values.
+    A finished match without a winner is a draw.
+    Points system: Win=3, Draw=1, Loss=0
+    """
+
+    if result["phase"] != "group" or result["status"] != "finished":
+        return
+
+    sides = (
+        (result["team1_id"], result["team1_score"] or 0, result["team2_score"] or 0),
+        (result["team2_id"], result["team2_score"] or 0, result["team1_score"] or 0),
+    )
+    for team_id, games_for, games_against in sides:
+        won = result["winner_id"] == team_id
+        drawn = not result["winner_id"]
+        lost = not (won or drawn)
+        totals = (1, won, drawn, lost, WIN_POINTS * won + DRAW_POINTS * drawn, games_for, games_against)
+
+        delta = deltas.setdefault((result["tournament_id"], team_id), [0] * len(STANDING_TOTALS))
+        for i, value in enumerate(totals):
+            delta[i] += value * sign
+
+def apply_standings_deltas(deltas):
+    """
+    Apply add_result_deltas totals as one executemany of increments (missing
+    standings rows are created first). Runs inside the caller's transaction.
+    """
+
+    deltas = {key: delta for key, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+
+    teams_by_tournament = {}
+    for tournament_id, team_id in deltas:
+        teams_by_tournament.setdefault(tournament_id, []).append(team_id)
+    for tournament_id, team_ids in teams_by_tournament.items():
+        ensure_standings(tournament_id, team_ids)
+
+    table = TournamentStandingModel.__table__
+    db.session.execute(
+        table.update()
+        .where(table.c.tournament_id == bindparam("b_tournament_id"), table.c.team_id == bindparam("b_team_id"))
+        .values({column: table.c[column] + bindparam(f"b_{column}") for column in STANDING_TOTALS}),
+        [
+            {
+                "b_tournament_id": tournament_id, "b_team_id": team_id,
+                **{f"b_{column}": value for column, value in zip(STANDING_TOTALS, delta)}
+            }
+            for (tournament_id, team_id), delta in deltas.items()
+        ]
+    )
+
+def replace_tournament_standings(tournament_id):
+    """
+    Recompute the persisted standings of a tournament from its finished group
+    matches, with a row for every registered team. Runs inside the caller's
+    transaction.
+    """
+
+    team_ids = [
+        team_id for (team_id,) in db.session.query(TournamentTeamModel.team_id).filter(
+            TournamentTeamModel.tournament_id == tournament_id
+        )
+    ]
+    deltas = {(tournament_id, team_id): [0] * len(STANDING_TOTALS) for team_id in team_ids}
+
+    results = db.session.query(
+        MatchModel.tournament_id, MatchModel.team1_id, MatchModel.team2_id, MatchModel.team1_score,
+        MatchModel.team2_score, MatchModel.winner_id, MatchModel.phase, MatchModel.status
+    ).filter(
+        MatchModel.tournament_id == tournament_id,
+        MatchModel.phase == "group",
+        MatchModel.status == "finished"
+    )
+    for result in results:
+        add_result_deltas(deltas, result._asdict())
+
+    TournamentStandingModel.query.filter_by(tournament_id=tournament_id).delete(synchronize_session=False)
+    if deltas:
+        db.session.execute(insert(TournamentStandingModel), [
+            {
+                "id": str(uuid.uuid4()), "tournament_id": tournament_id, "team_id": team_id,
+                **dict(zip(STANDING_TOTALS, delta))
+            }
+            for (_, team_id), delta in deltas.items()
+        ])
+
+def rebuild_tournament_standings(tournament):
+    """Recompute the persisted standings of a tournament from its matches"""
+
+    replace_tournament_standings(tournament.id)
+    db.session.commit()
+
+def order_standings(standings, matches):
+    """
+    Sort standings pool by pool, in one vectorised pass: points, then
+    head-to-head points among the teams level on points, game difference,
+    games won, and finally team ranking (lower is stronger, unranked last).
+    standings: dicts with team_id, pool, ranking and the STANDING_TOTALS
+    matches: finished (team1_id, team2_id, winner_id) tuples, only needed
+    for teams level on points
+    Returns: the same dicts in order, with head_to_head_points and game_difference
+    """
+
+    n = len(standings)
+    if n == 0:
+        return []
+    index = {s["team_id"]: i for i, s in enumerate(standings)}
+    matches = [m for m in matches if m[0] in index and m[1] in index]
+
+    def column(key):
+        return np.array([s[key] or 0 for s in standings], dtype=np.int64)
+
+    pool = column("pool")
+    points = column("points")
+    games_for = column("games_for")
+    games_against = column("games_against")
+    ranking = np.array(
+        [UNRANKED if s["ranking"] is None else s["ranking"] for s in standings], dtype=np.int64
+    )
+
+    # Head-to-head: points from matches between teams of the same pool level on points
+    t1 = np.array([index[m[0]] for m in matches], dtype=np.int64)
+    t2 = np.array([index[m[1]] for m in matches], dtype=np.int64)
+    winner = np.array([index.get(m[2], -1) for m in matches], dtype=np.int64)
+    drawn = winner == -1
+
+    _, level = np.unique(np.stack([pool, points]), axis=1, return_inverse=True)
+    level = level.reshape(-1)
+    between_level = level[t1] == level[t2]
+    head_to_head = (
+        np.bincount(t1, weights=(WIN_POINTS * (winner == t1) + DRAW_POINTS * drawn) * between_level, minlength=n)
+        + np.bincount(t2, weights=(WIN_POINTS * (winner == t2) + DRAW_POINTS * drawn) * between_level, minlength=n)
+    ).astype(np.int64)
+
+    # lexsort: last key first
+    order = np.lexsort((ranking, -games_for, -(games_for - games_against), -head_to_head, -points, pool))
+
+    ordered = []
+    for i in order:
+        s = standings[i]
+        s["head_to_head_points"] = int(head_to_head[i])
+        s["game_difference"] = s["games_for"] - s["games_against"]
+        ordered.append(s)
+    return ordered
+
+@timed("get_tournament_standings")
 def get_tournament_standings(tournament):
     """
-    Calculate standings based on finished matches.
-    Points system: Win=3, Loss=0
+    Tie-break aware standings of a tournament, pool by pool (see
+    order_standings), from the persisted standings table. Finished group
+    matches are only read between teams level on points; teams come with
+    their members and players in one more query.
     """
-    
-    # Get all finished matches
-    finished_matches = MatchModel.query.filter_by(
-        tournament_id=tournament.id,
-        status="finished",
-        phase="group"
+
+    rows = db.session.query(
+        TournamentStandingModel, TournamentTeamModel.pool, TeamModel.ranking
+    ).join(
+        TournamentTeamModel,
+        (TournamentTeamModel.tournament_id == TournamentStandingModel.tournament_id)
+        & (TournamentTeamModel.team_id == TournamentStandingModel.team_id)
+    ).join(
+        TeamModel, TeamModel.id == TournamentStandingModel.team_id
+    ).filter(
+        TournamentStandingModel.tournament_id == tournament.id
     ).all()
-    
-    # Initialize standings
-    standings = {}
-    for tt in tournament.teams:
-        standings[tt.team_id] = {
-            "team": tt.team,
-            "matches_played": 0,
-            "wins": 0,
-            "losses": 0,
-            "points": 0
+
+    standings = [
+        {
+            "team_id": standing.team_id,
+            "pool": pool,
+            "ranking": ranking,
+            **{column: getattr(standing, column) for column in STANDING_TOTALS}
         }
-    
-    # Calculate standings from matches
-    for match in finished_matches:
-        standings[match.team1_id]["matches_played"] += 1
-        standings[match.team2_id]["matches_played"] += 1
-        
-        if match.winner_id == match.team1_id:
-            standings[match.team1_id]["wins"] += 1
-            standings[match.team1_id]["points"] += 3
-            standings[match.team2_id]["losses"] += 1
-        elif match.winner_id == match.team2_id:
-            standings[match.team2_id]["wins"] += 1
-            standings[match.team2_id]["points"] += 3
-            standings[match.team1_id]["losses"] += 1
-    
-    # Sort by points (descending)
-    sorted_standings = sorted(
-        standings.values(),
-        key=lambda x: x["points"],
-        reverse=True
-    )
-    
-    return sorted_standings
\ No newline at end of file
+        for standing, pool, ranking in rows
+    ]
+
+    levels = {}
+    for s in standings:
+        levels.setdefault((s["pool"], s["points"]), []).append(s["team_id"])
+    tied = [team_id for team_ids in levels.values() if len(team_ids) > 1 for team_id in team_ids]
+
+    matches = []
+    if tied:
+        matches = db.session.query(
+            MatchModel.team1_id, MatchModel.team2_id, MatchModel.winner_id
+        ).filter(
+            MatchModel.tournament_id == tournament.id,
+            MatchModel.phase == "group",
+            MatchModel.status == "finished",
+            MatchModel.team1_id.in_(tied),
+            MatchModel.team2_id.in_(tied)
+        ).all()
+
+    standings = order_standings(standings, matches)
+
+    team_by_id = {
+        team.id: team
+        for team in TeamModel.query.options(
+            joinedload(TeamModel.members).joinedload(TeamMemberModel.player)
+        ).filter(TeamModel.id.in_([s["team_id"] for s in standings]))
+    }
+
+    for s in standings:
+        s["team"] = team_by_id[s.pop("team_id")]
+    return standings
@@ -1,30 +1,111 @@
 from db import db
 from models.match import MatchModel
+from models.tournament import TournamentTeamModel
+from sqlalchemy import insert, update
+import math
+import uuid
 
-def generate_round_robin_matches(tournament, teams):
+# Group phase pools: fields up to MAX_SINGLE_POOL_TEAMS play one round robin,
+# larger ones are split into pools of about POOL_SIZE teams
+POOL_SIZE = 4
+MAX_SINGLE_POOL_TEAMS = 8
+
+def generate_round_robin_rounds(teams):
     """
-    Generate all matches for round robin phase.
-    Each team plays every other team once.
+    Split the round robin into rounds using the circle (Berger) method.
+    Every team plays at most once per round; with an odd number of teams
+    one team rests each round.
+    Returns: list of rounds, each a list of (team1, team2) pairs
     """
-    
-    matches_created = 0
-    
-    for i in range(len(teams)):
-        for j in range(i + 1, len(teams)):
-            team1 = teams[i]
-            team2 = teams[j]
-            
-            # Create match
-            match = MatchModel(
-                tournament_id=tournament.id,
-                team1_id=team1.id,
-                team2_id=team2.id,
-                status="pending",
-                phase="group"
-            )
-            db.session.add(match)
-            matches_created += 1
-    
+
+    rotation = list(teams)
+    if len(rotation) % 2 == 1:
+        rotation.append(None)  # Bye
+
+    n = len(rotation)
+    rounds = []
+
+    for round_index in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            team1 = rotation[i]
+            team2 = rotation[n - 1 - i]
+            if team1 is None or team2 is None:
+                continue
+            # Alternate the fixed team's side so team1/team2 stay balanced
+            if i == 0 and round_index % 2 == 1:
+                team1, team2 = team2, team1
+            pairs.append((team1, team2))
+        rounds.append(pairs)
+
+        # Keep the first team fixed, rotate everyone else one step
+        rotation = [rotation[0], rotation[-1]] + rotation[1:-1]
+
+    return rounds
+
+def default_pool_count(team_count):
+    """One pool for small fields, otherwise pools of about POOL_SIZE teams"""
+    if team_count <= MAX_SINGLE_POOL_TEAMS:
+        return 1
+    return math.ceil(team_count / POOL_SIZE)
+
+def snake_seed_pools(teams, pool_count):
+    """
+    Deal teams into pool_count pools by snake seeding on ranking (lowest
+    ranking = strongest): seeds 1..P go to pools 1..P, the next P seeds back
+    from pool P to 1, and so on, so every pool gets one team of each tier.
+    Returns: list of pools, each a list of teams in seed order
+    """
+
+    seeded = sorted(teams, key=lambda team: (team.ranking, team.name, team.id))
+    pools = [[] for _ in range(pool_count)]
+
+    for seed, team in enumerate(seeded):
+        tier, position = divmod(seed, pool_count)
+        pools[position if tier % 2 == 0 else pool_count - 1 - position].append(team)
+
+    return pools
+
+def generate_round_robin_matches(tournament, pools):
+    """
+    Generate all matches for the group phase: a round robin inside each pool
+    (pools numbered from 1). Each team plays every other team of its pool
+    once; round_num is the round within the pool, so round 1 of every pool
+    can be played at the same time.
+    """
+
+    rows = []
+
+    for pool, teams in enumerate(pools, start=1):
+        for round_num, pairs in enumerate(generate_round_robin_rounds(teams), start=1):
+            for team1, team2 in pairs:
+                rows.append({
+                    "id": str(uuid.uuid4()),
+                    "tournament_id": tournament.id,
+                    "team1_id": team1.id,
+                    "team2_id": team2.id,
+                    "status": "pending",
+                    "phase": "group",
+                    "round_num": round_num,
+                    "pool": pool
+                })
+
+    # Single executemany for all matches
+    if rows:
+        db.session.execute(insert(MatchModel), rows)
     db.session.commit()
-    print(f"✅ Created {matches_created} round robin matches")
-    return matches_created
\ No newline at end of file
+
+    matches_created = len(rows)
+    print(f"✅ Created {matches_created} round robin matches in {len(pools)} pools")
+    return matches_created
+
+def assign_pools(tournament, pools):
+    """Store each registered team's pool number (one bulk UPDATE, no commit)"""
+    pool_by_team = {team.id: pool for pool, teams in enumerate(pools, start=1) for team in teams}
+    rows = [
+        {"id": tt.id, "pool": pool_by_team[tt.team_id]}
+        for tt in tournament.teams
+        if tt.team_id in pool_by_team
+    ]
+    if rows:
+        db.session.execute(update(TournamentTeamModel), rows)
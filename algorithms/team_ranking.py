@@ -0,0 +1,60 @@
+from db import db
+from models.player import PlayerModel
+from models.team import TeamModel
+from models.team_member import TeamMemberModel
+from sqlalchemy import func, select, update
+
+# A team's ranking is the sum of its members' rang. It is kept up to date by
+# one aggregate UPDATE over team_members JOIN players whenever ranks or
+# members change; reconcile_team_rankings() repairs any drift left behind.
+
+def _member_rang_sum():
+    """Correlated subquery: sum of the members' rang for the team being updated"""
+    return (
+        select(func.coalesce(func.sum(PlayerModel.rang), 0))
+        .select_from(TeamMemberModel)
+        .join(PlayerModel, PlayerModel.id == TeamMemberModel.player_id)
+        .where(TeamMemberModel.team_id == TeamModel.id)
+        .scalar_subquery()
+    )
+
+def recompute_team_rankings(player_ids=None, team_ids=None):
+    """
+    Recompute in one UPDATE the ranking of the teams of player_ids and/or
+    team_ids (every team when both are None). Does not commit.
+    Returns: number of teams updated
+    """
+
+    statement = update(TeamModel).values(ranking=_member_rang_sum())
+
+    if player_ids is not None or team_ids is not None:
+        conditions = []
+        if player_ids:
+            conditions.append(TeamModel.id.in_(
+                select(TeamMemberModel.team_id).where(TeamMemberModel.player_id.in_(list(player_ids)))
+            ))
+        if team_ids:
+            conditions.append(TeamModel.id.in_(list(team_ids)))
+        if not conditions:
+            return 0
+        statement = statement.where(db.or_(*conditions))
+
+    result = db.session.execute(statement.execution_options(synchronize_session=False))
+    return result.rowcount
+
+def reconcile_team_rankings():
+    """
+    Fix every team whose stored ranking differs from its members' rang sum
+    (one UPDATE, commits).
+    Returns: number of teams that had drifted
+    """
+
+    member_rang_sum = _member_rang_sum()
+    result = db.session.execute(
+        update(TeamModel)
+        .where(TeamModel.ranking != member_rang_sum)
+        .values(ranking=member_rang_sum)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
@@ -1,23 +1,296 @@
-from services.weather_service import get_live_weather
+from services.weather_service import get_forecasts, forecast_at
+from algorithms.occupancy import OccupancyIndex
 from models.court import CourtModel
 from models.court_booking import CourtBookingModel
+from models.match import MatchModel
 from db import db
-from datetime import datetime, timedelta
+from utils.metrics import timed
+from sqlalchemy import update
+from collections import defaultdict
+from datetime import date, datetime, timedelta, time
+
+# How far ahead a match may be postponed when no indoor court is free
+POSTPONE_MAX_DAYS = 7
+# Same gap between matches on a court as the scheduler uses
+BUFFER_MINUTES = 10
+
+def _load_bookings(*filters):
+    """Bookings to check with their match teams and court, in one query"""
+    return db.session.query(
+        CourtBookingModel.id,
+        CourtBookingModel.match_id,
+        CourtBookingModel.court_id,
+        CourtBookingModel.booking_date,
+        CourtBookingModel.start_minutes,
+        CourtBookingModel.end_minutes,
+        MatchModel.team1_id,
+        MatchModel.team2_id,
+        CourtModel.name.label("court_name"),
+        CourtModel.is_indoor,
+        CourtModel.location.label("court_location")
+    ).join(
+        MatchModel, CourtBookingModel.match_id == MatchModel.id
+    ).join(
+        CourtModel, CourtBookingModel.court_id == CourtModel.id
+    ).filter(*filters).order_by(
+        CourtBookingModel.booking_date, CourtBookingModel.start_minutes
+    ).all()
+
+def _slot_start(booking_date, start_minutes):
+    return datetime.combine(booking_date, time(start_minutes // 60, start_minutes % 60))
+
+def _match_to_courts(candidates):
+    """
+    Maximum bipartite matching of bookings to courts (augmenting paths).
+    candidates: {booking_id: [court_id, ...]} -> {booking_id: court_id}
+    """
+    owner = {}  # court_id -> booking_id
+
+    def assign(booking_id, seen):
+        for court_id in candidates[booking_id]:
+            if court_id in seen:
+                continue
+            seen.add(court_id)
+            if court_id not in owner or assign(owner[court_id], seen):
+                owner[court_id] = booking_id
+                return True
+        return False
+
+    for booking_id in candidates:
+        assign(booking_id, set())
+
+    return {booking_id: court_id for court_id, booking_id in owner.items()}
+
+def _plan_relocations(bad, indoor_courts_for, index):
+    """
+    Move bad-weather bookings to indoor courts (indoor_courts_for[booking_id],
+    i.e. at the same venue) at the same date and time. Bookings sharing a
+    slot are matched to the free indoor courts together, so one court is
+    never promised to two matches.
+    Returns: {booking_id: court_id}
+    """
+    slots = defaultdict(list)
+    for booking in bad:
+        slots[(booking.booking_date, booking.start_minutes, booking.end_minutes)].append(booking)
+
+    relocations = {}
+    for (booking_date, start, end), bookings in sorted(slots.items()):
+        # Free the bookings being moved before looking for their new court
+        for booking in bookings:
+            index.remove(booking, booking.court_id, booking_date, start, end)
+
+        candidates = {
+            booking.id: [
+                court.id for court in indoor_courts_for[booking.id]
+                if index.check(booking, court.id, booking_date, start, end, BUFFER_MINUTES)[0]
+            ]
+            for booking in bookings
+        }
+        assigned = _match_to_courts(candidates)
+
+        for booking in bookings:
+            court_id = assigned.get(booking.id, booking.court_id)
+            index.add(booking, court_id, booking_date, start, end)
+            if booking.id in assigned:
+                relocations[booking.id] = court_id
+
+    return relocations
+
+def _plan_postponement(booking, indoor_courts, index, readings):
+    """
+    Earliest later day, same start time, where the match fits on its own
+    court (if the forecast there is not bad) or on an indoor court.
+    Honours the court buffer, player conflicts and one match per day.
+    Returns: (new_date, court_id) or None
+    """
+    start, end = booking.start_minutes, booking.end_minutes
+    index.remove(booking, booking.court_id, booking.booking_date, start, end)
+
+    for offset in range(1, POSTPONE_MAX_DAYS + 1):
+        new_date = booking.booking_date + timedelta(days=offset)
+
+        court_ids = [court.id for court in indoor_courts]
+        weather = forecast_at(readings, _slot_start(new_date, start))
+        if weather is None or weather["is_suitable"]:
+            court_ids.insert(0, booking.court_id)
+
+        for court_id in court_ids:
+            if index.check(booking, court_id, new_date, start, end, BUFFER_MINUTES)[0]:
+                index.add(booking, court_id, new_date, start, end)
+                return new_date, court_id
+
+    index.add(booking, booking.court_id, booking.booking_date, start, end)
+    return None
+
+def _guard_bookings(bookings, default_location):
+    """
+    Check the forecast for every booking and relocate/postpone the outdoor
+    ones with bad weather. Each court's own location is used (default_location
+    for courts without one), and all distinct locations are fetched at once.
+    Occupancy is loaded once for all affected dates, all changes are written
+    with bulk UPDATEs and committed once.
+
+    Returns: {booking_id: result dict} (see check_match_weather_and_relocate)
+    """
+
+    results = {}
+    weather_rows = []
+    bad = []
+    checked_at = datetime.utcnow()
+
+    locations = {booking.id: booking.court_location or default_location for booking in bookings}
+    forecasts = get_forecasts(
+        {locations[booking.id] for booking in bookings if not booking.is_indoor}
+    )
+
+    for booking in bookings:
+        result = {
+            "booking_date": booking.booking_date.isoformat(),
+            "court": booking.court_name,
+            "location": locations[booking.id]
+        }
+        results[booking.id] = result
+
+        # Skip if already indoor
+        if booking.is_indoor:
+            result.update(action="no_action", reason="Court is indoor, weather doesn't affect play")
+            continue
+
+        # Forecast for the booked slot at the court's location
+        weather = forecast_at(forecasts[locations[booking.id]], _slot_start(booking.booking_date, booking.start_minutes))
+        if weather is None:
+            result.update(
+                action="no_action",
+                reason=f"No forecast available yet for {locations[booking.id]} on {booking.booking_date.isoformat()} {_slot_start(booking.booking_date, booking.start_minutes):%H:%M}"
+            )
+            continue
+
+        weather_rows.append({
+            "id": booking.id,
+            "temperature": weather["temperature"],
+            "rain_probability": weather["rain_probability"],
+            "wind_speed": weather["wind_speed"],
+            "weather_condition": weather["condition"],
+            "is_weather_suitable": weather["is_suitable"],
+            "weather_checked_at": checked_at
+        })
+        result["weather"] = weather
+
+        if weather["is_suitable"]:
+            result.update(action="no_action", reason="Weather is suitable for outdoor play")
+        else:
+            print(f"⚠️ Bad weather for match {booking.match_id}: {weather['condition']} (temp: {weather['temperature']}°C, rain: {weather['rain_probability']}%, wind: {weather['wind_speed']} km/h)")
+            bad.append(booking)
+
+    moves = []    # court_bookings updates, in the order they were decided
+    reasons = []  # matches.cancellation_reason updates
+
+    if bad:
+        # Indoor courts and the bad bookings' own courts, then every booking
+        # that can conflict with a move, for all affected dates at once
+        courts = CourtModel.query.filter(db.or_(
+            CourtModel.id.in_({booking.court_id for booking in bad}),
+            db.and_(CourtModel.is_indoor.is_(True), CourtModel.is_available.is_(True))
+        )).all()
+        courts_by_id = {court.id: court for court in courts}
+
+        # Matches only move to indoor courts in the same city
+        indoor_by_location = defaultdict(list)
+        for court in courts:
+            if court.is_indoor and court.is_available:
+                indoor_by_location[court.location or default_location].append(court)
+        indoor_courts_for = {booking.id: indoor_by_location[locations[booking.id]] for booking in bad}
+
+        team_ids = {team_id for booking in bad for team_id in (booking.team1_id, booking.team2_id)}
+        index = OccupancyIndex.load(
+            courts,
+            team_ids,
+            min(booking.booking_date for booking in bad),
+            max(booking.booking_date for booking in bad) + timedelta(days=POSTPONE_MAX_DAYS)
+        )
+
+        # 1. Same slot on an indoor court
+        relocations = _plan_relocations(bad, indoor_courts_for, index)
+        for booking in bad:
+            if booking.id not in relocations:
+                continue
+            new_court = courts_by_id[relocations[booking.id]]
+            condition = results[booking.id]["weather"]["condition"]
+            moves.append({"id": booking.id, "court_id": new_court.id, "booking_date": booking.booking_date})
+            reasons.append({
+                "id": booking.match_id,
+                "cancellation_reason": f"Relocated from '{booking.court_name}' to '{new_court.name}' due to {condition} weather"
+            })
+            results[booking.id].update(
+                action="relocated",
+                reason=f"Bad weather ({condition}), relocated to indoor court",
+                old_court=booking.court_name,
+                new_court=new_court.to_dict(),
+                court=new_court.name
+            )
+            print(f"✅ Match relocated to indoor court: {new_court.name}")
+
+        # 2. A later day at the same time
+        for booking in bad:
+            if booking.id in relocations:
+                continue
+            condition = results[booking.id]["weather"]["condition"]
+            postponement = _plan_postponement(
+                booking, indoor_courts_for[booking.id], index, forecasts[locations[booking.id]]
+            )
+
+            if postponement is None:
+                results[booking.id].update(
+                    action="no_action",
+                    reason=f"Bad weather ({condition}), but no indoor court or free slot in the next {POSTPONE_MAX_DAYS} days"
+                )
+                continue
+
+            new_date, court_id = postponement
+            new_court = courts_by_id[court_id]
+            moves.append({"id": booking.id, "court_id": court_id, "booking_date": new_date})
+            reasons.append({
+                "id": booking.match_id,
+                "cancellation_reason": f"Postponed from {booking.booking_date.isoformat()} to {new_date.isoformat()} due to {condition} weather (no indoor courts available)"
+            })
+            results[booking.id].update(
+                action="postponed",
+                reason=f"Bad weather ({condition}), postponed to {new_date.isoformat()} (no indoor courts available)",
+                original_date=booking.booking_date.isoformat(),
+                new_date=new_date.isoformat(),
+                booking_date=new_date.isoformat(),
+                court=new_court.name
+            )
+            if court_id != booking.court_id:
+                results[booking.id]["new_court"] = new_court.to_dict()
+            print(f"📅 Match postponed to {new_date.isoformat()} on {new_court.name}")
+
+    # Moves run in decision order: a slot freed by one move is vacated
+    # before a later move takes it, so the unique slot index always holds
+    if weather_rows:
+        db.session.execute(update(CourtBookingModel), weather_rows)
+    if moves:
+        db.session.execute(update(CourtBookingModel), moves)
+    if reasons:
+        db.session.execute(update(MatchModel), reasons)
+    db.session.commit()
+
+    return results
 
 def check_match_weather_and_relocate(match, location="Tunis,TN"):
     """
     Check weather for match and handle relocation/postponement.
-    
+
     Logic:
     1. Check if court is outdoor
-    2. If outdoor, check live weather via API
+    2. If outdoor, look up the forecast for the booking's date and start time
     3. If bad weather → find available indoor court
-    4. If no indoor court → postpone to next day
-    
+    4. If no indoor court → postpone to the next day the match fits
+
     Args:
         match: MatchModel instance
-        location: Location string for weather API (e.g., "Tunis,TN")
-    
+        location: Location for a court without its own (e.g., "Tunis,TN")
+
     Returns:
         dict: {
             "action": "relocated" | "postponed" | "no_action",
@@ -27,115 +300,28 @@ def check_match_weather_and_relocate(match, location="Tunis,TN"):
             "new_date": str (optional)
         }
     """
-    
+
     if not match.court_booking:
         return {
             "action": "no_action",
             "reason": "No booking to check"
         }
-    
-    booking = match.court_booking
-    court = booking.court
-    
-    # Skip if already indoor
-    if court.is_indoor:
-        return {
-            "action": "no_action",
-            "reason": "Court is indoor, weather doesn't affect play"
-        }
-    
-    print(f"🌤️ Checking weather for outdoor match {match.id}...")
-    
-    # Get live weather
-    weather = get_live_weather(location)
-    
-    # Update booking with weather data
-    booking.temperature = weather["temperature"]
-    booking.rain_probability = weather["rain_probability"]
-    booking.wind_speed = weather["wind_speed"]
-    booking.weather_condition = weather["condition"]
-    booking.is_weather_suitable = weather["is_suitable"]
-    booking.weather_checked_at = datetime.utcnow()
-    
-    # If weather is good, just save and return
-    if weather["is_suitable"]:
-        db.session.commit()
-        return {
-            "action": "no_action",
-            "reason": "Weather is suitable for outdoor play",
-            "weather": weather
-        }
-    
-    # Weather is BAD! Need to relocate or postpone
-    print(f"⚠️ Bad weather detected: {weather['condition']} (temp: {weather['temperature']}°C, rain: {weather['rain_probability']}%, wind: {weather['wind_speed']} km/h)")
-    
-    # Try to find an available indoor court on the same date/time
-    indoor_courts = CourtModel.query.filter_by(
-        is_indoor=True,
-        is_available=True
-    ).all()
-    
-    # Check if any indoor court is free at this time
-    available_indoor_court = None
-    for indoor_court in indoor_courts:
-        # Check if this court has a booking at the same time
-        conflicting_booking = CourtBookingModel.query.filter(
-            CourtBookingModel.court_id == indoor_court.id,
-            CourtBookingModel.booking_date == booking.booking_date,
-            CourtBookingModel.start_time == booking.start_time
-        ).first()
-        
-        if not conflicting_booking:
-            available_indoor_court = indoor_court
-            break
-    
-    if available_indoor_court:
-        # RELOCATE to indoor court
-        old_court_name = court.name
-        booking.court_id = available_indoor_court.id
-        match.cancellation_reason = f"Relocated from '{old_court_name}' to '{available_indoor_court.name}' due to {weather['condition']} weather"
-        
-        db.session.commit()
-        
-        print(f"✅ Match relocated to indoor court: {available_indoor_court.name}")
-        
-        return {
-            "action": "relocated",
-            "reason": f"Bad weather ({weather['condition']}), relocated to indoor court",
-            "weather": weather,
-            "old_court": old_court_name,
-            "new_court": available_indoor_court.to_dict()
-        }
-    
-    else:
-        # POSTPONE to next day (same time)
-        original_date = booking.booking_date
-        new_date = original_date + timedelta(days=1)
-        
-        booking.booking_date = new_date
-        match.cancellation_reason = f"Postponed from {original_date.isoformat()} to {new_date.isoformat()} due to {weather['condition']} weather (no indoor courts available)"
-        
-        db.session.commit()
-        
-        print(f"📅 Match postponed to next day: {new_date.isoformat()}")
-        
-        return {
-            "action": "postponed",
-            "reason": f"Bad weather ({weather['condition']}), postponed to next day (no indoor courts available)",
-            "weather": weather,
-            "original_date": original_date.isoformat(),
-            "new_date": new_date.isoformat()
-        }
 
+    print(f"🌤️ Checking weather for match {match.id}...")
+
+    bookings = _load_bookings(CourtBookingModel.id == match.court_booking.id)
+    return _guard_bookings(bookings, location)[match.court_booking.id]
+
+@timed("check_all_tournament_weather")
 def check_all_tournament_weather(tournament, location="Tunis,TN"):
     """
     Check weather for all upcoming matches in a tournament.
-    Auto-relocate or postpone as needed.
-    
+    Auto-relocate or postpone as needed, in one batch.
+
     Args:
         tournament: TournamentModel instance
-        location: Location string for weather API
-    
+        location: Location for courts without their own
+
     Returns:
         dict: {
             "total_checked": int,
@@ -145,50 +331,41 @@ def check_all_tournament_weather(tournament, location="Tunis,TN"):
             "results": list
         }
     """
-    
-    from datetime import date
-    
-    # Get all upcoming matches (today or future, pending status)
-    upcoming_matches = [
-        m for m in tournament.matches
-        if m.court_booking 
-        and m.court_booking.booking_date >= date.today() 
-        and m.status == "pending"
-    ]
-    
+
+    # Get all upcoming bookings (today or future, pending status)
+    bookings = _load_bookings(
+        MatchModel.tournament_id == tournament.id,
+        MatchModel.status == "pending",
+        CourtBookingModel.booking_date >= date.today()
+    )
+
+    print(f"🌤️ Checking weather for {len(bookings)} upcoming matches...")
+
+    guarded = _guard_bookings(bookings, location)
+
     results = []
-    relocated_count = 0
-    postponed_count = 0
-    no_action_count = 0
-    
-    print(f"🌤️ Checking weather for {len(upcoming_matches)} upcoming matches...")
-    
-    for match in upcoming_matches:
-        result = check_match_weather_and_relocate(match, location)
-        
+    counts = {"relocated": 0, "postponed": 0, "no_action": 0}
+
+    for booking in bookings:
+        result = guarded[booking.id]
+        counts[result["action"]] += 1
         results.append({
-            "match_id": match.id,
+            "match_id": booking.match_id,
             "action": result["action"],
             "reason": result["reason"],
-            "booking_date": match.court_booking.booking_date.isoformat(),
-            "court": match.court_booking.court.name
+            "booking_date": result["booking_date"],
+            "court": result["court"],
+            "location": result["location"]
         })
-        
-        if result["action"] == "relocated":
-            relocated_count += 1
-        elif result["action"] == "postponed":
-            postponed_count += 1
-        else:
-            no_action_count += 1
-    
+
     summary = {
-        "total_checked": len(upcoming_matches),
-        "relocated": relocated_count,
-        "postponed": postponed_count,
-        "no_action": no_action_count,
+        "total_checked": len(bookings),
+        "relocated": counts["relocated"],
+        "postponed": counts["postponed"],
+        "no_action": counts["no_action"],
         "results": results
     }
-    
-    print(f"✅ Weather check complete: {relocated_count} relocated, {postponed_count} postponed, {no_action_count} no action")
-    
-    return summary
\ No newline at end of file
+
+    print(f"✅ Weather check complete: {counts['relocated']} relocated, {counts['postponed']} postponed, {counts['no_action']} no action")
+
+    return summary
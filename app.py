@@ -2,6 +2,11 @@ from flask import Flask, jsonify, send_from_directory
 from flask_smorest import Api
 from flask_cors import CORS
 from db import db
+from migrations import run_migrations
+from utils.db_config import configure_database
+from utils.response_cache import init_response_cache
+from utils.query_stats import init_query_stats
+from utils.metrics import init_metrics, metrics_response
 import os
 
 # Import all models BEFORE creating app
@@ -9,10 +14,14 @@ from models.player import PlayerModel
 from models.team import TeamModel
 from models.team_member import TeamMemberModel
 from models.tournament import TournamentModel, TournamentTeamModel
+from models.tournament_standing import TournamentStandingModel
 from models.match import MatchModel
 from models.user import UserModel
 from models.court import CourtModel
 from models.court_booking import CourtBookingModel
+from models.job import JobModel
+from models.bracket_slot import BracketSlotModel
+from models.revoked_token import RevokedTokenModel
 
 # Import all resources
 from resources.auth import blp as AuthBlueprint
@@ -22,6 +31,8 @@ from resources.tournament import blp as TournamentBlueprint
 from resources.match import blp as MatchBlueprint
 from resources.court import blp as CourtBlueprint
 from resources.weather import blp as WeatherBlueprint
+from resources.job import blp as JobBlueprint
+from services.jobs import start_embedded_worker
 
 
 def create_app():
@@ -42,12 +53,12 @@ def create_app():
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
     # ========= DATABASE =========
+    # SQLite in instance/ (WAL + pragmas) unless DATABASE_URL is set
     os.makedirs(app.instance_path, exist_ok=True)
-    db_path = os.path.join(app.instance_path, "padel.db")
-    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
-    print(f"📍 Database path: {db_path}")
-
-    db.init_app(app)
+    configure_database(app, db)
+    init_query_stats(app)
+    init_metrics(app)
+    init_response_cache(app)
 
     # ✅ Only initialize DB when explicitly requested (safe with multi-worker gunicorn)
     if os.environ.get("INIT_DB") == "1":
@@ -65,6 +76,7 @@ def create_app():
             try:
                 with app.app_context():
                     db.create_all()
+                    run_migrations()
                     print("✅ Database tables ready!")
             finally:
                 # Remove lock so future init runs are possible
@@ -88,6 +100,7 @@ def create_app():
     api.register_blueprint(MatchBlueprint)
     api.register_blueprint(CourtBlueprint)
     api.register_blueprint(WeatherBlueprint)
+    api.register_blueprint(JobBlueprint)
 
     # ========== FRONTEND ROUTES ==========
 
@@ -139,6 +152,11 @@ def create_app():
     def ping():
         return jsonify({"message": "API is running!"}), 200
 
+    # Prometheus metrics of all workers (utils/metrics.py)
+    @app.route("/metrics")
+    def metrics():
+        return metrics_response()
+
     # Simple API info
     @app.route("/api")
     def api_info():
@@ -154,4 +172,6 @@ def create_app():
 app = create_app()
 
 if __name__ == "__main__":
+    # Development server runs jobs in-process (production: python -m services.jobs)
+    start_embedded_worker(app)
     app.run(host="0.0.0.0", port=5000)
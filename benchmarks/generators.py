@@ -0,0 +1,144 @@
+from db import db
+from models.player import PlayerModel
+from models.team import TeamModel
+from models.team_member import TeamMemberModel
+from models.tournament import TournamentModel, TournamentTeamModel
+from models.court import CourtModel
+from models.match import MatchModel
+from sqlalchemy import insert
+from itertools import combinations
+import uuid
+
+# Seeded synthetic data for the benchmarks. Everything is drawn from the
+# random.Random passed in, so the same seed always builds the same database,
+# and rows go in with bulk INSERTs so setup stays cheap next to what is measured.
+
+LOCATIONS = ["Tunis,TN", "Sousse,TN", "Sfax,TN"]
+
+def _id():
+    return str(uuid.uuid4())
+
+def generate_players(rng, count):
+    """count players with distinct federation ranks (1 = best)"""
+    ranks = rng.sample(range(1, count * 4 + 1), count)
+    rows = [
+        {
+            "id": _id(),
+            "name": f"Player {i + 1}",
+            "numero_licence": f"BM{i + 1:06d}",
+            "rang": rang
+        }
+        for i, rang in enumerate(ranks)
+    ]
+    db.session.execute(insert(PlayerModel), rows)
+    return rows
+
+def generate_teams(rng, count):
+    """count two-player teams over fresh players; ranking is the sum of both ranks"""
+    players = generate_players(rng, count * 2)
+    rng.shuffle(players)
+
+    teams = []
+    members = []
+    for i in range(count):
+        pair = players[2 * i:2 * i + 2]
+        team_id = _id()
+        teams.append({
+            "id": team_id,
+            "name": f"Team {i + 1}",
+            "ranking": sum(p["rang"] for p in pair)
+        })
+        members.extend({"id": _id(), "team_id": team_id, "player_id": p["id"]} for p in pair)
+
+    db.session.execute(insert(TeamModel), teams)
+    db.session.execute(insert(TeamMemberModel), members)
+    return teams
+
+def generate_courts(rng, count):
+    """
+    count courts spread over LOCATIONS. Only the last court of each location
+    is indoor: bad-weather matches have somewhere to go, and since the greedy
+    scheduler fills courts in order most matches still land outdoors.
+    """
+    rows = [
+        {
+            "id": _id(),
+            "name": f"Court {i + 1}",
+            "location": LOCATIONS[i % len(LOCATIONS)],
+            "is_available": True,
+            "is_indoor": i >= count - len(LOCATIONS)
+        }
+        for i in range(count)
+    ]
+    db.session.execute(insert(CourtModel), rows)
+    return rows
+
+def generate_tournament(rng, teams, pool_count=1, status="waiting"):
+    """A tournament with teams registered, snake-seeded into pool_count pools by ranking"""
+    tournament_id = _id()
+    db.session.execute(insert(TournamentModel), [{
+        "id": tournament_id,
+        "name": f"P{rng.choice([250, 500, 1000, 2000])}-{tournament_id[:8]}",
+        "status": status
+    }])
+
+    seeded = sorted(teams, key=lambda t: t["ranking"])
+    pools = {}
+    for index, team in enumerate(seeded):
+        row, col = divmod(index, pool_count)
+        pool = (col if row % 2 == 0 else pool_count - 1 - col) + 1
+        pools[team["id"]] = pool
+
+    db.session.execute(insert(TournamentTeamModel), [
+        {"id": _id(), "tournament_id": tournament_id, "team_id": team_id, "pool": pool}
+        for team_id, pool in pools.items()
+    ])
+    return tournament_id, pools
+
+def generate_group_results(rng, tournament_id, pools, legs=1):
+    """
+    Every round robin match within each pool, played legs times, finished
+    with random set scores (draws included). Returns the number of matches.
+    """
+    by_pool = {}
+    for team_id, pool in pools.items():
+        by_pool.setdefault(pool, []).append(team_id)
+
+    rows = []
+    for pool, team_ids in by_pool.items():
+        for leg in range(legs):
+            for team1_id, team2_id in combinations(team_ids, 2):
+                team1_score, team2_score = rng.randint(0, 7), rng.randint(0, 7)
+                winner_id = None
+                if team1_score != team2_score:
+                    winner_id = team1_id if team1_score > team2_score else team2_id
+                rows.append({
+                    "id": _id(),
+                    "tournament_id": tournament_id,
+                    "team1_id": team1_id,
+                    "team2_id": team2_id,
+                    "team1_score": team1_score,
+                    "team2_score": team2_score,
+                    "winner_id": winner_id,
+                    "status": "finished",
+                    "phase": "group",
+                    "pool": pool,
+                    "round_num": leg + 1
+                })
+
+    db.session.execute(insert(MatchModel), rows)
+    return len(rows)
+
+def seed_database(rng, teams=0, courts=0, tournaments=0):
+    """
+    Background data: teams (with their players), courts, and tournaments
+    each holding a random half of the teams. Returns the inserted rows by kind.
+    """
+    team_rows = generate_teams(rng, teams) if teams else []
+    court_rows = generate_courts(rng, courts) if courts else []
+    tournament_ids = [
+        generate_tournament(rng, rng.sample(team_rows, len(team_rows) // 2))[0]
+        for _ in range(tournaments)
+    ]
+    db.session.commit()
+    return {"teams": team_rows, "courts": court_rows, "tournaments": tournament_ids}
@@ -0,0 +1,191 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Benchmarks for the hot paths (scheduling, standings, weather checks, match
+# listing) on seeded synthetic data:
+#   python -m benchmarks.run                          # all scenarios vs benchmarks/baseline.json
+#   python -m benchmarks.run standings_10k_matches --repeat 10
+#   python -m benchmarks.run --update-baseline        # record the current numbers
+#
+# Every repetition gets a fresh throw-away SQLite database built from the same
+# seed. Wall time is the median of the timed runs; one more run, with
+# tracemalloc on (it slows Python down), gives the query count and peak memory.
+# Exits with status 1 when a scenario is slower or uses more memory than its
+# baseline by more than --threshold, or runs more queries than it did.
+#
+# Baselines are machine dependent: record them on the machine (or CI runner)
+# that compares against them.
+
+BENCH_DIR = tempfile.mkdtemp(prefix="padel-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}")
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "none")
+os.environ.setdefault("WEATHER_PROVIDER", "fake")
+os.environ.setdefault("METRICS_ENABLED", "0")
+
+from sqlalchemy import event
+from app import create_app
+from db import db
+from migrations import run_migrations
+from benchmarks.scenarios import SCENARIOS
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_SEED = 2024
+DEFAULT_THRESHOLD = 0.25
+# Timing differences below this are noise, whatever the ratio
+MIN_SLOWDOWN_MS = 5.0
+
+class QueryCounter:
+    """Counts statements sent to the database (an executemany counts once)"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+def _quiet(verbose):
+    """Silence the app's progress prints unless verbose"""
+    return contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+def run_once(app, name, seed, counter, profile=False, verbose=False):
+    """Build the scenario on an empty database and measure one run of it"""
+    with app.app_context(), _quiet(verbose):
+        db.drop_all()
+        db.create_all()
+        run_migrations()
+        run = SCENARIOS[name](app, random.Random(seed))
+        db.session.expire_all()
+
+        if profile:
+            tracemalloc.start()
+        queries = counter.count
+        started = time.perf_counter()
+        detail = run()
+        elapsed = time.perf_counter() - started
+        queries = counter.count - queries
+        peak = 0
+        if profile:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        db.session.remove()
+
+    return {"seconds": elapsed, "queries": queries, "peak_bytes": peak, "detail": detail}
+
+def measure(app, name, seed, repeat, counter, verbose=False):
+    """Median wall time of repeat runs, plus queries and peak memory from a profiled run"""
+    times = [run_once(app, name, seed, counter, verbose=verbose)["seconds"] for _ in range(repeat)]
+    profiled = run_once(app, name, seed, counter, profile=True, verbose=verbose)
+    return {
+        "wall_ms": round(statistics.median(times) * 1000, 2),
+        "min_ms": round(min(times) * 1000, 2),
+        "queries": profiled["queries"],
+        "peak_kib": round(profiled["peak_bytes"] / 1024, 1),
+        "detail": profiled["detail"]
+    }
+
+def regressions(name, result, baseline, threshold):
+    """Reasons result is worse than baseline, if any"""
+    reasons = []
+    limit_ms = max(baseline["wall_ms"] * (1 + threshold), baseline["wall_ms"] + MIN_SLOWDOWN_MS)
+    if result["wall_ms"] > limit_ms:
+        reasons.append(f"wall time {result['wall_ms']:.1f}ms > {limit_ms:.1f}ms")
+    if result["queries"] > baseline["queries"]:
+        reasons.append(f"queries {result['queries']} > {baseline['queries']}")
+    if result["peak_kib"] > baseline["peak_kib"] * (1 + threshold):
+        reasons.append(f"peak memory {result['peak_kib']:.0f}KiB > {baseline['peak_kib'] * (1 + threshold):.0f}KiB")
+    return [f"{name}: {reason}" for reason in reasons]
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(results, seed, path=BASELINE_PATH):
+    """Merge results into the baseline file (scenarios not run keep their numbers)"""
+    baseline = load_baseline(path)
+    baseline["seed"] = seed
+    scenarios = baseline.setdefault("scenarios", {})
+    for name, result in results.items():
+        scenarios[name] = {key: result[key] for key in ("wall_ms", "queries", "peak_kib")}
+    baseline["scenarios"] = dict(sorted(scenarios.items()))
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+def _change(value, base):
+    if not base:
+        return ""
+    return f"{(value - base) / base * 100:+.0f}%"
+
+def report(results, baseline):
+    """Print one line per scenario, with the change against its baseline"""
+    scenarios = baseline.get("scenarios", {})
+    print(f"{'scenario':<28} {'wall ms':>9} {'Δ':>6} {'queries':>8} {'peak KiB':>10} {'Δ':>6}  detail")
+    for name, result in results.items():
+        base = scenarios.get(name, {})
+        print(f"{name:<28} {result['wall_ms']:>9.1f} {_change(result['wall_ms'], base.get('wall_ms')):>6} "
+              f"{result['queries']:>8} {result['peak_kib']:>10.0f} {_change(result['peak_kib'], base.get('peak_kib')):>6}  "
+              f"{result['detail']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the performance benchmarks")
+    parser.add_argument("scenarios", nargs="*", help=f"Scenarios to run (default: all): {', '.join(SCENARIOS)}")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for the synthetic data")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown / memory growth over the baseline (0.25 = 25%%)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--verbose", action="store_true", help="Show the app's own output")
+    args = parser.parse_args(argv)
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    with _quiet(args.verbose):
+        app = create_app()
+    counter = QueryCounter()
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", counter)
+
+    results = {}
+    for name in args.scenarios or SCENARIOS:
+        results[name] = measure(app, name, args.seed, args.repeat, counter, args.verbose)
+
+    baseline = load_baseline(args.baseline)
+    report(results, baseline)
+
+    if args.update_baseline:
+        save_baseline(results, args.seed, args.baseline)
+        print(f"📌 Baseline saved to {args.baseline}")
+        return 0
+
+    if baseline.get("seed", args.seed) != args.seed:
+        print(f"⚠️ Baseline was recorded with seed {baseline['seed']}, not comparing")
+        return 0
+
+    failures = []
+    for name, result in results.items():
+        if name in baseline.get("scenarios", {}):
+            failures.extend(regressions(name, result, baseline["scenarios"][name], args.threshold))
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ No regressions")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
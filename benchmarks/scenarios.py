@@ -0,0 +1,116 @@
+from db import db
+from models.team import TeamModel
+from models.tournament import TournamentModel
+from models.court import CourtModel
+from algorithms.round_robin import MAX_SINGLE_POOL_TEAMS, generate_round_robin_matches
+from algorithms.advanced_scheduling import schedule_matches_intelligent
+from algorithms.positions_table import get_tournament_standings, rebuild_tournament_standings
+from algorithms.weather_guard import check_all_tournament_weather
+from services.weather_providers import FakeWeatherProvider, set_weather_provider
+from services.weather_cache import weather_cache
+from benchmarks.generators import LOCATIONS, generate_teams, generate_courts, generate_tournament, generate_group_results, seed_database
+from datetime import date, datetime, timedelta
+import math
+
+# Benchmark scenarios by name. A scenario function gets the app and a seeded
+# random.Random, builds its data (not measured) and returns the zero-argument
+# callable that is measured; that callable returns a one-line detail for the
+# report, so a run that "got faster" by doing nothing is easy to spot.
+SCENARIOS = {}
+
+def scenario(name):
+    def decorator(fn):
+        SCENARIOS[name] = fn
+        return fn
+    return decorator
+
+def _round_robin_tournament(rng, team_count, court_count):
+    """
+    A group phase the way the app splits it: pools of at most
+    MAX_SINGLE_POOL_TEAMS, each a full round robin. Returns the tournament
+    and its courts.
+    """
+    teams = generate_teams(rng, team_count)
+    generate_courts(rng, court_count)
+    pool_count = math.ceil(team_count / MAX_SINGLE_POOL_TEAMS)
+    tournament_id, pool_of = generate_tournament(rng, teams, pool_count, status="group_phase")
+    db.session.commit()
+
+    pools = [[] for _ in range(pool_count)]
+    for team in TeamModel.query.order_by(TeamModel.ranking).all():
+        pools[pool_of[team.id] - 1].append(team)
+
+    tournament = db.session.get(TournamentModel, tournament_id)
+    generate_round_robin_matches(tournament, pools)
+    return tournament, CourtModel.query.order_by(CourtModel.name).all()
+
+def _scheduling(team_count, court_count):
+    def setup(app, rng):
+        tournament, courts = _round_robin_tournament(rng, team_count, court_count)
+
+        def run():
+            success, message, scheduled = schedule_matches_intelligent(
+                tournament, courts, date.today() + timedelta(days=1)
+            )
+            return f"{scheduled} matches scheduled" if success else message
+        return run
+    return setup
+
+for _teams, _courts in ((8, 4), (16, 4), (32, 8), (64, 16)):
+    scenario(f"schedule_round_robin_{_teams}")(_scheduling(_teams, _courts))
+
+@scenario("standings_10k_matches")
+def standings_10k_matches(app, rng):
+    """408 teams in 8 pools of 51: 10,200 finished group matches, next to other tournaments"""
+    seed_database(rng, teams=400, courts=12, tournaments=4)
+    teams = generate_teams(rng, 408)
+    tournament_id, pools = generate_tournament(rng, teams, pool_count=8, status="group_phase")
+    generate_group_results(rng, tournament_id, pools)
+    tournament = db.session.get(TournamentModel, tournament_id)
+    rebuild_tournament_standings(tournament)
+
+    def run():
+        standings = get_tournament_standings(tournament)
+        return f"{len(standings)} teams ranked"
+    return run
+
+@scenario("weather_batch_check")
+def weather_batch_check(app, rng):
+    """48 teams in 6 pools (168 matches) booked from today on 9 courts, rain in a fifth of the forecast windows"""
+    tournament, courts = _round_robin_tournament(rng, 48, 9)
+    schedule_matches_intelligent(tournament, courts, date.today())
+
+    provider = FakeWeatherProvider()
+    start = datetime.now().replace(minute=0, second=0, microsecond=0)
+    for location in LOCATIONS:
+        for hours in range(0, provider.days * 24, 3):
+            if rng.random() < 0.2:
+                provider.set_weather(location, start + timedelta(hours=hours), rain_probability=90, condition="rainy")
+    set_weather_provider(provider)
+
+    def run():
+        # Cold cache: every location's forecast is fetched once in the batch
+        weather_cache.clear()
+        summary = check_all_tournament_weather(tournament)
+        return (f"{summary['total_checked']} checked, {summary['relocated']} relocated, "
+                f"{summary['postponed']} postponed, {provider.calls} forecasts fetched")
+    return run
+
+def _list_matches(query_string):
+    def setup(app, rng):
+        """100 teams, one pool: 4,950 matches listed through the API"""
+        seed_database(rng, teams=400, courts=12, tournaments=4)
+        teams = generate_teams(rng, 100)
+        tournament_id, pools = generate_tournament(rng, teams, status="group_phase")
+        generate_group_results(rng, tournament_id, pools)
+        db.session.commit()
+        client = app.test_client()
+
+        def run():
+            response = client.get(f"/match{query_string}")
+            return f"HTTP {response.status_code}, {len(response.get_json())} matches"
+        return run
+    return setup
+
+scenario("list_matches_page")(_list_matches("?limit=500"))
+scenario("list_matches_all")(_list_matches(""))
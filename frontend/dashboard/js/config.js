@@ -12,9 +12,64 @@ function setToken(token) {
   localStorage.setItem("jwt_token", token);
 }
 
+// Save the token pair returned by /auth/login and /auth/refresh
+function setTokens(data) {
+  setToken(data.token);
+  localStorage.setItem("refresh_token", data.refresh_token);
+}
+
+// Access tokens only last a few minutes: swap the refresh token for a new pair
+let refreshing = null;
+function refreshAccessToken() {
+  const refreshToken = localStorage.getItem("refresh_token");
+  if (!refreshToken) return Promise.resolve(false);
+
+  // Concurrent 401s share one refresh (a refresh token only works once)
+  refreshing = refreshing || nativeFetch(`${API_BASE_URL}/auth/refresh`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ refresh_token: refreshToken }),
+  })
+    .then(async (response) => {
+      if (!response.ok) return false;
+      setTokens(await response.json());
+      return true;
+    })
+    .catch(() => false)
+    .finally(() => {
+      refreshing = null;
+    });
+  return refreshing;
+}
+
+// Retry an authenticated request once with a refreshed token after a 401
+const nativeFetch = window.fetch.bind(window);
+window.fetch = async (input, init = {}) => {
+  const response = await nativeFetch(input, init);
+  const headers = new Headers(init.headers || {});
+  if (response.status !== 401 || !headers.has("Authorization")) return response;
+
+  if (!(await refreshAccessToken())) return response;
+  headers.set("Authorization", `Bearer ${getToken()}`);
+  return nativeFetch(input, { ...init, headers });
+};
+
 // Logout helper (use Flask route)
-function logout() {
+async function logout() {
+  try {
+    await nativeFetch(`${API_BASE_URL}/auth/logout`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        Authorization: `Bearer ${getToken()}`,
+      },
+      body: JSON.stringify({ refresh_token: localStorage.getItem("refresh_token") || undefined }),
+    });
+  } catch (error) {
+    console.error("Logout error:", error);
+  }
   localStorage.removeItem("jwt_token");
+  localStorage.removeItem("refresh_token");
   window.location.href = "/login";
 }
 
@@ -57,3 +112,24 @@ function showToast(message, type = "success") {
     toast.classList.add("hidden");
   }, 3000);
 }
+
+// Long-running admin operations (scheduling, weather checks, phase changes)
+// answer 202 with a job; poll it until it finishes and return its result
+async function waitForJob(response, intervalMs = 1000) {
+  const body = await response.json();
+  if (response.status !== 202) return body;
+
+  while (true) {
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+
+    const jobResponse = await fetch(`${API_BASE_URL}${body.status_url}`, {
+      headers: { Authorization: `Bearer ${getToken()}` },
+    });
+    const job = await jobResponse.json();
+
+    if (job.status === "succeeded") return job.result;
+    if (job.status === "failed") {
+      throw new Error(job.error || "Job failed");
+    }
+  }
+}
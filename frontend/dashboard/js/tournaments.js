@@ -204,6 +204,8 @@ async function startGroupPhase(tournamentId) {
             throw new Error(error.error || 'Failed to start group phase');
         }
         
+        await waitForJob(response);
+        
         showToast('Group phase started! All matches generated.', 'success');
         fetchTournaments(); // Reload tournaments
         
@@ -236,6 +238,8 @@ async function startKnockoutPhase(tournamentId) {
             throw new Error(error.error || 'Failed to start knockout phase');
         }
         
+        await waitForJob(response);
+        
         showToast('Knockout phase started! Bracket generated from standings.', 'success');
         fetchTournaments(); // Reload tournaments
         
@@ -501,10 +505,10 @@ async function handleScheduleMatches(event, tournamentId) {
         
         if (!response.ok) {
             const error = await response.json();
-            throw new Error(error.message || 'Failed to schedule matches');
+            throw new Error(error.error || error.message || 'Failed to schedule matches');
         }
         
-        const data = await response.json();
+        const data = await waitForJob(response);
         showToast(`Successfully scheduled ${data.scheduled_count} matches!`, 'success');
         closeScheduleModal();
         
@@ -569,7 +573,7 @@ function showStandingsModal(data) {
                 <tbody>
                     ${data.standings.map(s => `
                         <tr class="border-b hover:bg-gray-50">
-                            <td class="px-4 py-3 font-bold">${s.position}</td>
+                            <td class="px-4 py-3 font-bold">${s.pool ? `P${s.pool}-` : ''}${s.position}</td>
                             <td class="px-4 py-3">${s.team.name}</td>
                             <td class="px-4 py-3 text-center">${s.matches_played}</td>
                             <td class="px-4 py-3 text-center text-green-600">${s.wins}</td>
@@ -246,7 +246,7 @@ async function checkTournamentWeather() {
             throw new Error(error.error || 'Failed to check weather');
         }
         
-        const data = await response.json();
+        const data = await waitForJob(response);
         displayWeatherCheckResults(data);
         
     } catch (error) {
@@ -374,7 +374,7 @@ async function checkMatchWeather(matchId) {
             throw new Error(error.error || 'Failed to check weather');
         }
         
-        const data = await response.json();
+        const data = await waitForJob(response);
         
         let message = `Action: ${data.action_taken.toUpperCase()}\n`;
         message += `Reason: ${data.reason}\n\n`;
@@ -0,0 +1,224 @@
+import argparse
+import re
+import time
+import unicodedata
+import uuid
+from itertools import islice
+import camelot
+from camelot.handlers import PDFHandler
+from sqlalchemy import insert, update
+from app import create_app
+from db import db
+from models.player import PlayerModel
+from algorithms.team_ranking import recompute_team_rankings
+from resources.player import PLAYER_CHANGE_TAGS
+from utils.response_cache import invalidate
+
+# Import the federation "classement masculin" PDF:
+#   python -m load_data.import_players classement.pdf --batch-size 1000
+# Tables are read a few pages at a time, rows are upserted by numero_licence
+# in one transaction per batch, and the rankings of the teams whose players
+# changed are recomputed in a single UPDATE at the end.
+
+# Header cell patterns (lowercase, accents stripped) -> field, first match wins.
+# "Nom et Prénom" is the name column; a lone "Prénom" column is appended to it.
+HEADER_PATTERNS = (
+    (re.compile(r"licen"), "numero_licence"),
+    (re.compile(r"\bnom\b"), "name"),
+    (re.compile(r"\bprenom\b"), "first_name"),
+    (re.compile(r"\brang\b|class"), "rang"),
+)
+
+def _clean(cell):
+    """Collapse whitespace and odd PDF characters (non-breaking spaces, ligatures)"""
+    return " ".join(unicodedata.normalize("NFKC", str(cell)).split())
+
+def _fold(text):
+    """Lowercase without accents, for header matching"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def header_columns(cells):
+    """Column index of each field if cells is a header row, else None"""
+    columns = {}
+    for index, cell in enumerate(cells):
+        folded = _fold(_clean(cell))
+        for pattern, field in HEADER_PATTERNS:
+            if pattern.search(folded) and field not in columns:
+                columns[field] = index
+                break
+
+    if {"numero_licence", "name", "rang"} <= columns.keys():
+        return columns
+    return None
+
+def normalise_row(cells, columns):
+    """
+    {"numero_licence", "name", "rang"} for a data row, or None for rows that
+    are not players (blank lines, repeated headers, page footers)
+    """
+    if max(columns.values()) >= len(cells):
+        return None
+
+    licence = re.sub(r"\s+", "", _clean(cells[columns["numero_licence"]])).upper()
+    name = _clean(cells[columns["name"]])
+    if "first_name" in columns:
+        name = _clean(f"{name} {cells[columns['first_name']]}")
+    rang = re.search(r"\d+", _clean(cells[columns["rang"]]))
+
+    if not licence or not name or rang is None:
+        return None
+
+    return {"numero_licence": licence, "name": name, "rang": int(rang.group())}
+
+def extract_rows(path, pages="all", chunk_pages=20, flavor="lattice", stats=None):
+    """
+    Yield raw table rows from the PDF, parsing chunk_pages pages at a time so
+    memory stays flat however long the ranking is.
+    Tables without a header row (continued on the next page) reuse the last one.
+    """
+    page_numbers = PDFHandler(path, pages=pages).pages
+    columns = None
+
+    for start in range(0, len(page_numbers), chunk_pages):
+        chunk = page_numbers[start:start + chunk_pages]
+        tables = camelot.read_pdf(path, pages=",".join(map(str, chunk)), flavor=flavor)
+        if stats is not None:
+            stats["pages"] += len(chunk)
+
+        for table in tables:
+            for cells in table.df.itertuples(index=False):
+                header = header_columns(cells)
+                if header:
+                    columns = header
+                    continue
+                if columns is None:
+                    continue
+                yield cells, columns
+
+def normalised_players(raw_rows, stats):
+    """Normalised player dicts from raw rows, counting skipped rows in stats"""
+    for cells, columns in raw_rows:
+        stats["rows"] += 1
+        player = normalise_row(cells, columns)
+        if player is None:
+            stats["skipped"] += 1
+            continue
+        yield player
+
+def upsert_batch(batch, stats):
+    """Insert new licences and update changed ones in one transaction; return changed player ids"""
+
+    # Last row wins when a licence appears twice in the batch
+    by_licence = {}
+    for player in batch:
+        if player["numero_licence"] in by_licence:
+            stats["duplicates"] += 1
+        by_licence[player["numero_licence"]] = player
+
+    existing = db.session.query(
+        PlayerModel.id, PlayerModel.numero_licence, PlayerModel.name, PlayerModel.rang
+    ).filter(PlayerModel.numero_licence.in_(by_licence)).all()
+
+    updates = []
+    rang_changed = []
+    seen = set()
+    for player_id, licence, name, rang in existing:
+        seen.add(licence)
+        player = by_licence[licence]
+        if player["name"] == name and player["rang"] == rang:
+            stats["unchanged"] += 1
+            continue
+        updates.append({"id": player_id, "name": player["name"], "rang": player["rang"]})
+        if player["rang"] != rang:
+            rang_changed.append(player_id)
+
+    inserts = [
+        {"id": str(uuid.uuid4()), **player}
+        for licence, player in by_licence.items()
+        if licence not in seen
+    ]
+
+    if inserts:
+        db.session.execute(insert(PlayerModel), inserts)
+    if updates:
+        db.session.execute(update(PlayerModel), updates)
+    db.session.commit()
+
+    stats["inserted"] += len(inserts)
+    stats["updated"] += len(updates)
+    return rang_changed
+
+def new_stats():
+    return {
+        "pages": 0, "rows": 0, "skipped": 0, "duplicates": 0,
+        "inserted": 0, "updated": 0, "unchanged": 0, "teams_reranked": 0,
+        "read_seconds": 0.0, "write_seconds": 0.0,
+    }
+
+def import_players(players, batch_size=1000, stats=None):
+    """
+    Upsert an iterable of normalised players by numero_licence, batch_size
+    rows per transaction, then recompute the affected team rankings.
+    Returns: stats dict
+    """
+    stats = stats if stats is not None else new_stats()
+    players = iter(players)
+    rang_changed = []
+
+    while True:
+        started = time.perf_counter()
+        batch = list(islice(players, batch_size))
+        stats["read_seconds"] += time.perf_counter() - started
+        if not batch:
+            break
+
+        started = time.perf_counter()
+        rang_changed.extend(upsert_batch(batch, stats))
+        stats["write_seconds"] += time.perf_counter() - started
+        print(f"   ... {stats['inserted'] + stats['updated'] + stats['unchanged']} players upserted")
+
+    # New players are in no team yet; only changed ranks move team rankings
+    started = time.perf_counter()
+    stats["teams_reranked"] = recompute_team_rankings(rang_changed)
+    db.session.commit()
+    stats["write_seconds"] += time.perf_counter() - started
+
+    return stats
+
+def report(stats, elapsed):
+    """Print the import summary and throughput"""
+    print(f"📄 Read {stats['rows']} rows from {stats['pages']} pages "
+          f"({stats['skipped']} skipped, {stats['duplicates']} duplicate licences)")
+    print(f"✅ Players: {stats['inserted']} inserted, {stats['updated']} updated, "
+          f"{stats['unchanged']} unchanged")
+    print(f"🏆 Recomputed ranking of {stats['teams_reranked']} teams")
+    print(f"⚡ {stats['rows'] / elapsed:.0f} rows/s in {elapsed:.2f}s "
+          f"(PDF {stats['read_seconds']:.2f}s, database {stats['write_seconds']:.2f}s)")
+
+def import_ranking_pdf(path, pages="all", batch_size=1000, chunk_pages=20, flavor="lattice"):
+    """Import the federation ranking PDF at path"""
+    app = create_app()
+
+    with app.app_context():
+        started = time.perf_counter()
+        stats = new_stats()
+        players = normalised_players(extract_rows(path, pages, chunk_pages, flavor, stats), stats)
+        import_players(players, batch_size, stats)
+        invalidate(*PLAYER_CHANGE_TAGS)
+
+        report(stats, time.perf_counter() - started)
+        print("🎉 Ranking imported successfully!")
+        return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import players from a federation ranking PDF")
+    parser.add_argument("path", help="Ranking PDF (classement masculin)")
+    parser.add_argument("--pages", default="all", help="Pages to read, e.g. 1-20 (default: all)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Players per transaction")
+    parser.add_argument("--chunk-pages", type=int, default=20, help="Pages parsed at a time")
+    parser.add_argument("--flavor", default="lattice", choices=["lattice", "stream"],
+                        help="camelot parser: lattice for ruled tables, stream for whitespace-separated")
+    args = parser.parse_args()
+
+    import_ranking_pdf(args.path, args.pages, args.batch_size, args.chunk_pages, args.flavor)
@@ -0,0 +1,23 @@
+import sys
+from app import create_app
+from models.tournament import TournamentModel
+from algorithms.positions_table import rebuild_tournament_standings
+
+def rebuild_standings(tournament_names=None):
+    """Recompute the persisted standings table from finished matches"""
+    app = create_app()
+    
+    with app.app_context():
+        query = TournamentModel.query
+        if tournament_names:
+            query = query.filter(TournamentModel.name.in_(tournament_names))
+        
+        for tournament in query.all():
+            rebuild_tournament_standings(tournament)
+            print(f"✅ Rebuilt standings for {tournament.name}")
+        
+        print("🎉 Standings rebuilt successfully!")
+
+if __name__ == "__main__":
+    # Optional tournament names, e.g. python -m load_data.rebuild_standings P500 P1000
+    rebuild_standings(sys.argv[1:] or None)
\ No newline at end of file
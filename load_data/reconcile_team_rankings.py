@@ -0,0 +1,33 @@
+import argparse
+import time
+from app import create_app
+from db import db
+from algorithms.team_ranking import reconcile_team_rankings
+from resources.team import TEAM_CHANGE_TAGS
+from utils.response_cache import invalidate
+
+def reconcile(interval=None):
+    """Fix drifted team rankings once, or every interval seconds"""
+    app = create_app()
+
+    with app.app_context():
+        while True:
+            started = time.perf_counter()
+            fixed = reconcile_team_rankings()
+            if fixed:
+                invalidate(*TEAM_CHANGE_TAGS)
+            print(f"✅ Reconciled team rankings: {fixed} teams fixed in {time.perf_counter() - started:.3f}s")
+
+            if interval is None:
+                break
+            db.session.remove()
+            time.sleep(interval)
+
+if __name__ == "__main__":
+    # One pass:        python -m load_data.reconcile_team_rankings
+    # In background:   python -m load_data.reconcile_team_rankings --every 600 &
+    parser = argparse.ArgumentParser(description="Recompute team rankings that drifted from their members' rang")
+    parser.add_argument("--every", type=float, default=None, help="Repeat every N seconds instead of running once")
+    args = parser.parse_args()
+
+    reconcile(args.every)
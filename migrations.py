@@ -0,0 +1,160 @@
+from db import db
+from sqlalchemy import inspect, text
+from utils.time_slots import to_minutes
+import uuid
+
+# Schema changes for databases created before a model change. Fresh databases
+# get the same schema from db.create_all(); every step is written to be a
+# no-op there. Steps run once, in order, and are recorded in schema_migrations.
+
+def _hot_path_indexes():
+    """Indexes and unique keys for the predicates used by scheduling, standings and the resources"""
+    statements = [
+        "CREATE INDEX IF NOT EXISTS ix_matches_tournament_status_phase ON matches (tournament_id, status, phase)",
+        "CREATE INDEX IF NOT EXISTS ix_matches_team1_id ON matches (team1_id)",
+        "CREATE INDEX IF NOT EXISTS ix_matches_team2_id ON matches (team2_id)",
+        "CREATE INDEX IF NOT EXISTS ix_matches_created_at_id ON matches (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS ix_court_bookings_booking_date ON court_bookings (booking_date)",
+        "CREATE INDEX IF NOT EXISTS ix_court_bookings_match_id ON court_bookings (match_id)",
+        "CREATE INDEX IF NOT EXISTS ix_team_members_team_id ON team_members (team_id)",
+        "CREATE INDEX IF NOT EXISTS ix_team_members_player_id ON team_members (player_id)",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_tournament_teams_tournament_team ON tournament_teams (tournament_id, team_id)",
+        "CREATE INDEX IF NOT EXISTS ix_tournament_teams_team_id ON tournament_teams (team_id)",
+    ]
+    for statement in statements:
+        db.session.execute(text(statement))
+
+def _booking_times_to_minutes():
+    """Replace court_bookings start_time/end_time "HH:MM" strings with integer minutes"""
+    columns = {column["name"] for column in inspect(db.session.connection()).get_columns("court_bookings")}
+    if "start_time" not in columns:
+        return
+
+    db.session.execute(text("ALTER TABLE court_bookings ADD COLUMN start_minutes INTEGER"))
+    db.session.execute(text("ALTER TABLE court_bookings ADD COLUMN end_minutes INTEGER"))
+
+    rows = db.session.execute(text("SELECT id, start_time, end_time FROM court_bookings")).all()
+    if rows:
+        db.session.execute(
+            text("UPDATE court_bookings SET start_minutes = :start, end_minutes = :end WHERE id = :id"),
+            [{"id": row[0], "start": to_minutes(row[1]), "end": to_minutes(row[2])} for row in rows]
+        )
+
+    db.session.execute(text("DROP INDEX IF EXISTS uq_court_bookings_court_date_start"))
+    db.session.execute(text("ALTER TABLE court_bookings DROP COLUMN start_time"))
+    db.session.execute(text("ALTER TABLE court_bookings DROP COLUMN end_time"))
+    db.session.execute(text(
+        "CREATE UNIQUE INDEX uq_court_bookings_court_date_start "
+        "ON court_bookings (court_id, booking_date, start_minutes)"
+    ))
+
+def _players_numero_licence_index():
+    """Index for the licence-number lookups of the ranking import"""
+    db.session.execute(text("CREATE INDEX IF NOT EXISTS ix_players_numero_licence ON players (numero_licence)"))
+
+def _group_pools():
+    """Pool number on tournament registrations and group matches"""
+    for table in ("tournament_teams", "matches"):
+        columns = {column["name"] for column in inspect(db.session.connection()).get_columns(table)}
+        if "pool" not in columns:
+            db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN pool INTEGER"))
+
+# Each finished group match once per team, from that team's side
+_GROUP_RESULT_SIDES = (
+    "SELECT tournament_id, team1_id AS team_id, COALESCE(team1_score, 0) AS games_for, "
+    "COALESCE(team2_score, 0) AS games_against, winner_id "
+    "FROM matches WHERE phase = 'group' AND status = 'finished' "
+    "UNION ALL "
+    "SELECT tournament_id, team2_id, COALESCE(team2_score, 0), COALESCE(team1_score, 0), winner_id "
+    "FROM matches WHERE phase = 'group' AND status = 'finished'"
+)
+
+def _standings_draws_and_games():
+    """Draws and games for/against on tournament_standings, recomputed from the matches"""
+    columns = {column["name"] for column in inspect(db.session.connection()).get_columns("tournament_standings")}
+    if "draws" in columns:
+        return
+
+    for column in ("draws", "games_for", "games_against"):
+        db.session.execute(text(f"ALTER TABLE tournament_standings ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"))
+
+    # Every registered team gets a row
+    missing = db.session.execute(text(
+        "SELECT tt.tournament_id, tt.team_id FROM tournament_teams tt "
+        "LEFT JOIN tournament_standings ts ON ts.tournament_id = tt.tournament_id AND ts.team_id = tt.team_id "
+        "WHERE ts.id IS NULL"
+    )).all()
+    if missing:
+        db.session.execute(
+            text(
+                "INSERT INTO tournament_standings (id, tournament_id, team_id, matches_played, wins, losses, points) "
+                "VALUES (:id, :tournament_id, :team_id, 0, 0, 0, 0)"
+            ),
+            [{"id": str(uuid.uuid4()), "tournament_id": row[0], "team_id": row[1]} for row in missing]
+        )
+
+    # Recount every total: draws used to score 0 points (win 3, draw 1, loss 0)
+    def total(expression):
+        return (
+            f"(SELECT COALESCE(SUM({expression}), 0) FROM ({_GROUP_RESULT_SIDES}) s "
+            "WHERE s.tournament_id = tournament_standings.tournament_id "
+            "AND s.team_id = tournament_standings.team_id)"
+        )
+
+    won = "CASE WHEN s.winner_id = s.team_id THEN 1 ELSE 0 END"
+    drawn = "CASE WHEN s.winner_id IS NULL THEN 1 ELSE 0 END"
+    lost = "CASE WHEN s.winner_id IS NOT NULL AND s.winner_id <> s.team_id THEN 1 ELSE 0 END"
+    db.session.execute(text(
+        "UPDATE tournament_standings SET "
+        f"matches_played = {total('1')}, "
+        f"wins = {total(won)}, "
+        f"draws = {total(drawn)}, "
+        f"losses = {total(lost)}, "
+        f"points = {total(f'3 * {won} + {drawn}')}, "
+        f"games_for = {total('s.games_for')}, "
+        f"games_against = {total('s.games_against')}"
+    ))
+
+MIGRATIONS = [
+    ("0001_hot_path_indexes", _hot_path_indexes),
+    ("0002_booking_times_to_minutes", _booking_times_to_minutes),
+    ("0003_players_numero_licence_index", _players_numero_licence_index),
+    ("0004_group_pools", _group_pools),
+    ("0005_standings_draws_and_games", _standings_draws_and_games),
+]
+
+def run_migrations():
+    """Apply pending migrations (call inside an app context, after db.create_all())"""
+    db.session.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "id VARCHAR PRIMARY KEY, "
+        "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    ))
+    applied = {row[0] for row in db.session.execute(text("SELECT id FROM schema_migrations"))}
+
+    for migration_id, migrate in MIGRATIONS:
+        if migration_id in applied:
+            continue
+        try:
+            migrate()
+            db.session.execute(
+                text("INSERT INTO schema_migrations (id) VALUES (:id)"),
+                {"id": migration_id}
+            )
+            db.session.commit()
+            print(f"✅ Applied migration {migration_id}")
+        except Exception:
+            db.session.rollback()
+            print(f"❌ Migration {migration_id} failed")
+            raise
+
+    db.session.commit()
+
+if __name__ == "__main__":
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        run_migrations()
+        print("🎉 Database schema is up to date!")
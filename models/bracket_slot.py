@@ -0,0 +1,46 @@
+from db import db
+import uuid
+
+class BracketSlotModel(db.Model):
+    __tablename__ = "bracket_slots"
+    __table_args__ = (
+        db.Index("ix_bracket_slots_tournament_round", "tournament_id", "round_num", "position"),
+        db.Index("ix_bracket_slots_match_id", "match_id"),
+    )
+
+    id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    tournament_id = db.Column(db.String, db.ForeignKey("tournaments.id"), nullable=False)
+    round_num = db.Column(db.Integer, nullable=False)  # 1 = first knockout round, last = final
+    position = db.Column(db.Integer, nullable=False)  # 0-based, top to bottom within the round
+
+    # Teams fill in as earlier rounds finish; seeds are set in the first round
+    team1_id = db.Column(db.String, db.ForeignKey("teams.id"), nullable=True)
+    team2_id = db.Column(db.String, db.ForeignKey("teams.id"), nullable=True)
+    seed1 = db.Column(db.Integer, nullable=True)
+    seed2 = db.Column(db.Integer, nullable=True)
+    is_bye = db.Column(db.Boolean, nullable=False, default=False)  # One team, advances without playing
+
+    # Created once both teams are known
+    match_id = db.Column(db.String, db.ForeignKey("matches.id"), nullable=True)
+    winner_id = db.Column(db.String, db.ForeignKey("teams.id"), nullable=True)
+
+    # The winner goes to next_slot as team1 (next_side=1) or team2 (next_side=2); None for the final
+    next_slot_id = db.Column(db.String, db.ForeignKey("bracket_slots.id"), nullable=True)
+    next_side = db.Column(db.Integer, nullable=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "tournament_id": self.tournament_id,
+            "round_num": self.round_num,
+            "position": self.position,
+            "team1_id": self.team1_id,
+            "team2_id": self.team2_id,
+            "seed1": self.seed1,
+            "seed2": self.seed2,
+            "is_bye": self.is_bye,
+            "match_id": self.match_id,
+            "winner_id": self.winner_id,
+            "next_slot_id": self.next_slot_id,
+            "next_side": self.next_side
+        }
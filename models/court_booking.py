@@ -1,16 +1,22 @@
 from db import db
 import uuid
 from datetime import datetime
+from utils.time_slots import to_time_str
 
 class CourtBookingModel(db.Model):
     __tablename__ = "court_bookings"
+    __table_args__ = (
+        db.Index("uq_court_bookings_court_date_start", "court_id", "booking_date", "start_minutes", unique=True),
+        db.Index("ix_court_bookings_booking_date", "booking_date"),
+        db.Index("ix_court_bookings_match_id", "match_id"),
+    )
 
     id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     match_id = db.Column(db.String, db.ForeignKey("matches.id"), nullable=False)
     court_id = db.Column(db.String, db.ForeignKey("courts.id"), nullable=False)
     booking_date = db.Column(db.Date, nullable=False)
-    start_time = db.Column(db.String, nullable=False)  # Format: "HH:MM"
-    end_time = db.Column(db.String, nullable=False)    # Format: "HH:MM"
+    start_minutes = db.Column(db.Integer, nullable=False)  # Minutes from midnight
+    end_minutes = db.Column(db.Integer, nullable=False)    # Minutes from midnight
     created_at = db.Column(db.DateTime, default=db.func.now())
     
     # NEW: Weather fields
@@ -25,6 +31,16 @@ class CourtBookingModel(db.Model):
     match = db.relationship("MatchModel", back_populates="court_booking")
     court = db.relationship("CourtModel", back_populates="bookings")
     
+    @property
+    def start_time(self):
+        """Start time as "HH:MM" """
+        return to_time_str(self.start_minutes)
+    
+    @property
+    def end_time(self):
+        """End time as "HH:MM" """
+        return to_time_str(self.end_minutes)
+    
     def to_dict(self):
         return {
             "id": self.id,
@@ -0,0 +1,48 @@
+from db import db
+import uuid
+
+class JobModel(db.Model):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Only one active job per dedupe key; the key is cleared when the job ends
+        db.Index("uq_jobs_dedupe_key", "dedupe_key", unique=True),
+        db.Index("ix_jobs_status_created_at", "status", "created_at"),
+    )
+
+    id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    kind = db.Column(db.String, nullable=False)  # schedule_matches, check_all_weather, start_group_phase, start_knockout_phase
+    tournament_id = db.Column(db.String, db.ForeignKey("tournaments.id"), nullable=True)
+    params = db.Column(db.JSON, nullable=False, default=dict)
+    dedupe_key = db.Column(db.String, nullable=True)
+
+    # Progress
+    status = db.Column(db.String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    progress = db.Column(db.Integer, nullable=False, default=0)  # 0-100
+    message = db.Column(db.String, nullable=True)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.String, nullable=True)
+
+    # Worker lease (an expired lease means the worker died and the job can be resumed)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    worker_id = db.Column(db.String, nullable=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=db.func.now())
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "tournament_id": self.tournament_id,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "attempts": self.attempts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
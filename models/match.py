@@ -3,6 +3,12 @@ import uuid
 
 class MatchModel(db.Model):
     __tablename__ = "matches"
+    __table_args__ = (
+        db.Index("ix_matches_tournament_status_phase", "tournament_id", "status", "phase"),
+        db.Index("ix_matches_team1_id", "team1_id"),
+        db.Index("ix_matches_team2_id", "team2_id"),
+        db.Index("ix_matches_created_at_id", "created_at", "id"),
+    )
 
     id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     tournament_id = db.Column(db.String, db.ForeignKey("tournaments.id"), nullable=False)
@@ -17,7 +23,8 @@ class MatchModel(db.Model):
     # Match status
     status = db.Column(db.String, default="pending")  # pending, finished, cancelled
     phase = db.Column(db.String, default="group")  # group, knockout
-    round_num = db.Column(db.Integer, nullable=True)  # Which round in knockout
+    round_num = db.Column(db.Integer, nullable=True)  # Group: round robin round, knockout: bracket round
+    pool = db.Column(db.Integer, nullable=True)  # Group phase pool (1, 2, ...), None for knockout
     
     # Cancellation info
     cancelled_by_team_id = db.Column(db.String, db.ForeignKey("teams.id"), nullable=True)
@@ -44,6 +51,7 @@ class MatchModel(db.Model):
             "status": self.status,
             "phase": self.phase,
             "round_num": self.round_num,
+            "pool": self.pool,
             "cancelled_by_team": self.team1.to_dict() if self.cancelled_by_team_id == self.team1_id else (self.team2.to_dict() if self.cancelled_by_team_id else None),
             "cancellation_reason": self.cancellation_reason,
             "court_booking": self.court_booking.to_dict() if self.court_booking else None,
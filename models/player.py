@@ -3,6 +3,10 @@ import uuid
 
 class PlayerModel(db.Model):
     __tablename__ = "players"
+    __table_args__ = (
+        # Imports upsert players by licence number
+        db.Index("ix_players_numero_licence", "numero_licence"),
+    )
 
     id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String, nullable=False)
@@ -0,0 +1,10 @@
+from db import db
+
+class RevokedTokenModel(db.Model):
+    __tablename__ = "revoked_tokens"
+
+    jti = db.Column(db.String, primary_key=True)  # Token id ("jti" claim)
+    user_id = db.Column(db.String, db.ForeignKey("users.id"), nullable=True)
+    token_type = db.Column(db.String, nullable=False)  # "access" or "refresh"
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)  # Row can be purged after this
+    revoked_at = db.Column(db.DateTime, nullable=False, default=db.func.now())
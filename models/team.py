@@ -6,18 +6,13 @@ class TeamModel(db.Model):
 
     id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String, nullable=False)
-    ranking = db.Column(db.Integer, nullable=False, default=0)  # Sum of member rankings
+    ranking = db.Column(db.Integer, nullable=False, default=0)  # Sum of member rankings (algorithms/team_ranking.py)
     created_at = db.Column(db.DateTime, default=db.func.now())
     
     # Relationships
     members = db.relationship("TeamMemberModel", back_populates="team", cascade="all, delete-orphan")
     tournaments = db.relationship("TournamentTeamModel", back_populates="team", cascade="all, delete-orphan")
-    
-    def calculate_ranking(self):
-        """Calculate team ranking as sum of member rankings"""
-        total = sum(member.player.rang for member in self.members if member.player)
-        self.ranking = total
-        return total
+    standings = db.relationship("TournamentStandingModel", back_populates="team", cascade="all, delete-orphan")
     
     def to_dict(self):
         return {
@@ -3,6 +3,10 @@ import uuid
 
 class TeamMemberModel(db.Model):
     __tablename__ = "team_members"
+    __table_args__ = (
+        db.Index("ix_team_members_team_id", "team_id"),
+        db.Index("ix_team_members_player_id", "player_id"),
+    )
 
     id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     team_id = db.Column(db.String, db.ForeignKey("teams.id"), nullable=False)
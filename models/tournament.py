@@ -12,6 +12,7 @@ class TournamentModel(db.Model):
     # Relationships
     teams = db.relationship("TournamentTeamModel", back_populates="tournament", cascade="all, delete-orphan")
     matches = db.relationship("MatchModel", back_populates="tournament", cascade="all, delete-orphan")
+    standings = db.relationship("TournamentStandingModel", back_populates="tournament", cascade="all, delete-orphan")
     
     def to_dict(self):
         return {
@@ -25,11 +26,16 @@ class TournamentModel(db.Model):
 
 class TournamentTeamModel(db.Model):
     __tablename__ = "tournament_teams"
+    __table_args__ = (
+        db.Index("uq_tournament_teams_tournament_team", "tournament_id", "team_id", unique=True),
+        db.Index("ix_tournament_teams_team_id", "team_id"),
+    )
 
     id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
     tournament_id = db.Column(db.String, db.ForeignKey("tournaments.id"), nullable=False)
     team_id = db.Column(db.String, db.ForeignKey("teams.id"), nullable=False)
     registered_at = db.Column(db.DateTime, default=db.func.now())
+    pool = db.Column(db.Integer, nullable=True)  # Group phase pool, set when the group phase starts
     
     # Relationships
     tournament = db.relationship("TournamentModel", back_populates="teams")
@@ -40,5 +46,6 @@ class TournamentTeamModel(db.Model):
             "id": self.id,
             "tournament_id": self.tournament_id,
             "team": self.team.to_dict(),
+            "pool": self.pool,
             "registered_at": self.registered_at.isoformat()
         }
\ No newline at end of file
@@ -0,0 +1,41 @@
+from db import db
+import uuid
+
+class TournamentStandingModel(db.Model):
+    __tablename__ = "tournament_standings"
+    __table_args__ = (
+        db.UniqueConstraint("tournament_id", "team_id", name="uq_tournament_standings_tournament_team"),
+        db.Index("ix_tournament_standings_tournament_points", "tournament_id", "points"),
+    )
+
+    id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    tournament_id = db.Column(db.String, db.ForeignKey("tournaments.id"), nullable=False)
+    team_id = db.Column(db.String, db.ForeignKey("teams.id"), nullable=False)
+    
+    # Group phase totals, kept up to date when results are recorded
+    matches_played = db.Column(db.Integer, nullable=False, default=0)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    draws = db.Column(db.Integer, nullable=False, default=0)
+    losses = db.Column(db.Integer, nullable=False, default=0)
+    points = db.Column(db.Integer, nullable=False, default=0)
+    games_for = db.Column(db.Integer, nullable=False, default=0)
+    games_against = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=db.func.now(), onupdate=db.func.now())
+    
+    # Relationships
+    tournament = db.relationship("TournamentModel", back_populates="standings")
+    team = db.relationship("TeamModel", back_populates="standings")
+    
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "tournament_id": self.tournament_id,
+            "team_id": self.team_id,
+            "matches_played": self.matches_played,
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "points": self.points,
+            "games_for": self.games_for,
+            "games_against": self.games_against
+        }
\ No newline at end of file
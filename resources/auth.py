@@ -4,8 +4,8 @@ from flask import request
 from marshmallow import Schema, fields
 from db import db
 from models.user import UserModel
-import jwt
-from datetime import datetime, timedelta
+from utils.tokens import issue_tokens, decode_token, revocation_list
+from utils.auth_decorator import get_bearer_token
 import os
 from dotenv import load_dotenv
 
@@ -13,7 +13,6 @@ load_dotenv()
 
 blp = Blueprint("Auth", "auth", description="User authentication")
 
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this")
 ADMIN_KEY = os.getenv("ADMIN_KEY", "admin-secret-key")
 
 # Schemas
@@ -30,6 +29,12 @@ class LoginSchema(Schema):
     email = fields.String(required=True, metadata={"description": "User email address"})
     password = fields.String(required=True, metadata={"description": "User password"})
 
+class RefreshSchema(Schema):
+    refresh_token = fields.String(required=True, metadata={"description": "Refresh token from login"})
+
+class LogoutSchema(Schema):
+    refresh_token = fields.String(required=False, metadata={"description": "Refresh token to revoke as well"})
+
 @blp.route("/auth/register")
 class Register(MethodView):
     @blp.arguments(RegisterSchema)
@@ -89,16 +94,53 @@ class Login(MethodView):
         if not user or not user.check_password(data["password"]):
             return {"error": "Invalid email or password"}, 401
         
-        # Generate JWT token
-        token = jwt.encode({
-            "user_id": user.id,
-            "email": user.email,
-            "role": user.role,
-            "exp": datetime.utcnow() + timedelta(hours=24)
-        }, SECRET_KEY, algorithm="HS256")
-        
+        # Short-lived access token + refresh token
         return {
             "message": "Login successful",
-            "token": token,
+            **issue_tokens(user),
+            "user": user.to_dict()
+        }, 200
+
+@blp.route("/auth/refresh")
+class Refresh(MethodView):
+    @blp.arguments(RefreshSchema)
+    def post(self, data):
+        """Exchange a refresh token for a new token pair (the old refresh token is revoked)"""
+
+        claims = decode_token(data["refresh_token"], token_type="refresh")
+        if not claims:
+            return {"error": "Invalid or expired refresh token"}, 401
+
+        # Reload the user so role changes and deletions apply from here on
+        user = db.session.get(UserModel, claims["user_id"])
+        if not user:
+            return {"error": "Invalid or expired refresh token"}, 401
+
+        # A refresh token works once, whichever worker saw it first
+        if not revocation_list.use_once(claims):
+            return {"error": "Invalid or expired refresh token"}, 401
+
+        return {
+            "message": "Token refreshed",
+            **issue_tokens(user),
             "user": user.to_dict()
+        }, 200
+
+@blp.route("/auth/logout")
+class Logout(MethodView):
+    @blp.arguments(LogoutSchema)
+    def post(self, data):
+        """Revoke the current access token and, if given, the refresh token"""
+
+        revoked = 0
+        access_token = get_bearer_token()
+        for token, token_type in ((access_token, "access"), (data.get("refresh_token"), "refresh")):
+            claims = decode_token(token, token_type=token_type) if token else None
+            if claims:
+                revocation_list.revoke(claims)
+                revoked += 1
+
+        return {
+            "message": "Logged out",
+            "revoked": revoked
         }, 200
\ No newline at end of file
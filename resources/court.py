@@ -5,6 +5,11 @@ from marshmallow import Schema, fields
 from db import db
 from models.court import CourtModel
 from utils.auth_decorator import admin_required, token_required
+from utils.pagination import DateRangeArgsSchema, filter_created_between, paginate
+from utils.response_cache import cached_response, invalidate
+
+# Matches embed their court, so court edits reach every match response
+COURT_CHANGE_TAGS = ("courts", "match:*", "matches", "tournament:*")
 
 blp = Blueprint("Courts", "courts", description="Operations on courts")
 
@@ -22,10 +27,12 @@ class CourtUpdateSchema(Schema):
 
 @blp.route("/court")
 class CourtList(MethodView):
-    def get(self):
-        """Get all courts"""
-        courts = CourtModel.query.all()
-        return [c.to_dict() for c in courts], 200
+    @cached_response("courts")
+    @blp.arguments(DateRangeArgsSchema, location="query")
+    def get(self, args):
+        """Get all courts (optional creation date range, cursor pagination and field projection)"""
+        query = filter_created_between(CourtModel.query, CourtModel, args)
+        return paginate(query, CourtModel, args)
 
     @admin_required
     @blp.arguments(CourtCreateSchema)
@@ -39,10 +46,12 @@ class CourtList(MethodView):
         )
         db.session.add(court)
         db.session.commit()
+        invalidate("courts")
         return court.to_dict(), 201
 
 @blp.route("/court/<string:court_id>")
 class Court(MethodView):
+    @cached_response("court:{court_id}")
     def get(self, court_id):
         """Get a specific court"""
         court = CourtModel.query.get_or_404(court_id)
@@ -60,6 +69,7 @@ class Court(MethodView):
         court.is_indoor = data.get("is_indoor", court.is_indoor)
         
         db.session.commit()
+        invalidate(f"court:{court_id}", *COURT_CHANGE_TAGS)
         return court.to_dict(), 200
 
     @admin_required
@@ -68,4 +78,5 @@ class Court(MethodView):
         court = CourtModel.query.get_or_404(court_id)
         db.session.delete(court)
         db.session.commit()
+        invalidate(f"court:{court_id}", *COURT_CHANGE_TAGS)
         return {"message": "Court deleted"}, 200
\ No newline at end of file
@@ -0,0 +1,20 @@
+from flask.views import MethodView
+from flask_smorest import Blueprint
+from models.job import JobModel
+from utils.auth_decorator import admin_required
+
+blp = Blueprint("Jobs", "jobs", description="Background jobs for long-running tournament operations")
+
+@blp.route("/jobs/<string:job_id>")
+class Job(MethodView):
+    @admin_required
+    def get(self, job_id):
+        """
+        Get a job's status (admin only).
+        
+        status: queued → running → succeeded | failed
+        progress: 0-100, with a message for the current step
+        result: the operation's response body once finished
+        """
+        job = JobModel.query.get_or_404(job_id)
+        return job.to_dict(), 200
@@ -6,7 +6,15 @@ from db import db
 from models.match import MatchModel
 from models.team import TeamModel
 from models.court import CourtModel
+from models.court_booking import CourtBookingModel
 from algorithms.advanced_scheduling import can_schedule_match
+from algorithms.positions_table import apply_match_result, add_result_deltas, apply_standings_deltas
+from algorithms.knockout import advance_winner
+from sqlalchemy import update
+from utils.bulk import bulk_length, bulk_response, item_error
+from utils.eager_loading import eager_query, serialize
+from utils.pagination import MatchListArgsSchema, paginate
+from utils.response_cache import cached_response, invalidate
 from datetime import datetime
 
 blp = Blueprint("Matches", "matches", description="Operations on matches")
@@ -16,6 +24,12 @@ class RecordResultSchema(Schema):
     team1_score = fields.Integer(required=True, metadata={"description": "Team 1 score"})
     team2_score = fields.Integer(required=True, metadata={"description": "Team 2 score"})
 
+class MatchResultItemSchema(RecordResultSchema):
+    match_id = fields.String(required=True, metadata={"description": "Match ID"})
+
+class MatchResultsBulkSchema(Schema):
+    results = fields.List(fields.Nested(MatchResultItemSchema), required=True, validate=bulk_length, metadata={"description": "Results to record"})
+
 class CancelMatchSchema(Schema):
     team_id = fields.String(required=True, metadata={"description": "ID of team that forfeits"})
     reason = fields.String(required=False, load_default="Team forfeited", metadata={"description": "Cancellation reason"})
@@ -27,18 +41,43 @@ class ValidateScheduleSchema(Schema):
     end_time = fields.String(required=True, metadata={"description": "End time (HH:MM)"})
     buffer_minutes = fields.Integer(required=False, load_default=10, metadata={"description": "Buffer minutes"})
 
+def decide_winner(team1_id, team2_id, team1_score, team2_score):
+    """Winning team ID, or None on a tie (in real padel there's a tie-break)"""
+    if team1_score > team2_score:
+        return team1_id
+    if team2_score > team1_score:
+        return team2_id
+    return None
+
+def filter_matches(query, args):
+    """Push list filters (status, phase, booking date range) into SQL"""
+    if args.get("status"):
+        query = query.filter(MatchModel.status == args["status"])
+    if args.get("phase"):
+        query = query.filter(MatchModel.phase == args["phase"])
+    if args.get("date_from") or args.get("date_to"):
+        query = query.join(CourtBookingModel, CourtBookingModel.match_id == MatchModel.id)
+        if args.get("date_from"):
+            query = query.filter(CourtBookingModel.booking_date >= args["date_from"])
+        if args.get("date_to"):
+            query = query.filter(CourtBookingModel.booking_date <= args["date_to"])
+    return query
+
 @blp.route("/match")
 class MatchList(MethodView):
-    def get(self):
-        """Get all matches"""
-        matches = MatchModel.query.all()
-        return [m.to_dict() for m in matches], 200
+    @cached_response("matches")
+    @blp.arguments(MatchListArgsSchema, location="query")
+    def get(self, args):
+        """Get all matches (optional filters, cursor pagination and field projection)"""
+        query = filter_matches(eager_query(MatchModel), args)
+        return paginate(query, MatchModel, args)
 
 @blp.route("/match/<string:match_id>")
 class Match(MethodView):
+    @cached_response("match:{match_id}")
     def get(self, match_id):
         """Get a specific match"""
-        match = MatchModel.query.get_or_404(match_id)
+        match = eager_query(MatchModel).get_or_404(match_id)
         return match.to_dict(), 200
 
 @blp.route("/match/<string:match_id>/record-result")
@@ -48,27 +87,118 @@ class RecordResult(MethodView):
         """Record match result and set winner"""
         match = MatchModel.query.get_or_404(match_id)
         
+        # Correcting an earlier result: take it out of the standings first
+        apply_match_result(match, sign=-1)
+        
         match.team1_score = data["team1_score"]
         match.team2_score = data["team2_score"]
         
         # Determine winner
-        if match.team1_score > match.team2_score:
-            match.winner_id = match.team1_id
-        elif match.team2_score > match.team1_score:
-            match.winner_id = match.team2_id
-        else:
-            # Handle tie - in real padel, there's a tie-break
-            # For now, no winner on tie
-            match.winner_id = None
+        match.winner_id = decide_winner(match.team1_id, match.team2_id, match.team1_score, match.team2_score)
+        
+        if match.phase == "knockout" and match.winner_id is None:
+            db.session.rollback()
+            return {"error": "Knockout matches need a winner"}, 400
         
         match.status = "finished"
+        apply_match_result(match)
+        
+        # Knockout: the winner moves into the next round
+        next_match_id = None
+        if match.phase == "knockout":
+            error, next_match_id = advance_winner(match.id, match.winner_id)
+            if error:
+                db.session.rollback()
+                return {"error": error}, 409
+        
         db.session.commit()
+        invalidate(
+            f"match:{match.id}", "matches", f"tournament:{match.tournament_id}", "tournaments",
+            *([f"match:{next_match_id}"] if next_match_id else [])
+        )
         
         return {
             "message": "Match result recorded",
             "match": match.to_dict()
         }, 200
 
+@blp.route("/match/results/bulk")
+class MatchResultsBulk(MethodView):
+    @blp.arguments(MatchResultsBulkSchema)
+    def post(self, data):
+        """Record many match results in one transaction (standings updated in one pass)"""
+
+        match_ids = [item["match_id"] for item in data["results"]]
+        matches = {
+            row.id: row for row in db.session.query(
+                MatchModel.id, MatchModel.tournament_id, MatchModel.team1_id, MatchModel.team2_id,
+                MatchModel.team1_score, MatchModel.team2_score, MatchModel.winner_id,
+                MatchModel.phase, MatchModel.status, MatchModel.round_num
+            ).filter(MatchModel.id.in_(match_ids))
+        }
+
+        results = []
+        updates = []
+        deltas = {}
+        seen = set()
+        for index, item in enumerate(data["results"]):
+            match = matches.get(item["match_id"])
+            if match is None:
+                results.append(item_error(index, "Match not found", match_id=item["match_id"]))
+            elif match.id in seen:
+                results.append(item_error(index, "Match listed twice", match_id=match.id))
+            elif match.phase == "knockout" and item["team1_score"] == item["team2_score"]:
+                results.append(item_error(index, "Knockout matches need a winner", match_id=match.id))
+            else:
+                winner_id = decide_winner(match.team1_id, match.team2_id, item["team1_score"], item["team2_score"])
+                updates.append({
+                    "id": match.id,
+                    "team1_score": item["team1_score"],
+                    "team2_score": item["team2_score"],
+                    "winner_id": winner_id,
+                    "status": "finished"
+                })
+                # Correcting an earlier result: take it out of the standings first
+                previous = match._asdict()
+                add_result_deltas(deltas, previous, sign=-1)
+                add_result_deltas(deltas, {
+                    **previous,
+                    "team1_score": item["team1_score"],
+                    "team2_score": item["team2_score"],
+                    "winner_id": winner_id,
+                    "status": "finished"
+                })
+                results.append({"index": index, "status": "valid", "match_id": match.id, "winner_id": winner_id})
+            seen.add(item["match_id"])
+
+        if any(result["status"] == "error" for result in results):
+            return bulk_response(results)
+
+        db.session.execute(update(MatchModel), updates)
+        apply_standings_deltas(deltas)
+
+        # Knockout winners move on, earlier rounds first
+        knockout = sorted(
+            (result for result in results if matches[result["match_id"]].phase == "knockout"),
+            key=lambda result: matches[result["match_id"]].round_num or 0
+        )
+        for result in knockout:
+            error, _ = advance_winner(result["match_id"], result["winner_id"])
+            if error:
+                db.session.rollback()
+                results[result["index"]] = item_error(result["index"], error, match_id=result["match_id"])
+                return bulk_response(results)
+
+        db.session.commit()
+        invalidate(
+            "match:*", "matches", "tournaments",
+            *{f"tournament:{matches[match_id].tournament_id}" for match_id in match_ids}
+        )
+
+        for result in results:
+            result["status"] = "recorded"
+        return bulk_response(results)
+
 @blp.route("/match/<string:match_id>/cancel")
 class CancelMatch(MethodView):
     @blp.arguments(CancelMatchSchema)
@@ -97,7 +227,21 @@ class CancelMatch(MethodView):
         match.cancelled_by_team_id = cancelling_team_id
         match.cancellation_reason = data.get("reason", "Team forfeited")
         
+        apply_match_result(match)
+
+        # Knockout: the winner moves into the next round
+        next_match_id = None
+        if match.phase == "knockout":
+            error, next_match_id = advance_winner(match.id, match.winner_id)
+            if error:
+                db.session.rollback()
+                return {"error": error}, 409
+
         db.session.commit()
+        invalidate(
+            f"match:{match.id}", "matches", f"tournament:{match.tournament_id}", "tournaments",
+            *([f"match:{next_match_id}"] if next_match_id else [])
+        )
         
         return {
             "message": "Match cancelled - other team wins by forfeit",
@@ -135,17 +279,20 @@ class ValidateSchedule(MethodView):
 
 @blp.route("/tournament/<string:tournament_id>/matches")
 class TournamentMatches(MethodView):
-    def get(self, tournament_id):
-        """Get all matches for a tournament"""
-        matches = MatchModel.query.filter_by(tournament_id=tournament_id).all()
-        return [m.to_dict() for m in matches], 200
+    @cached_response("tournament:{tournament_id}")
+    @blp.arguments(MatchListArgsSchema, location="query")
+    def get(self, args, tournament_id):
+        """Get all matches for a tournament (optional filters, cursor pagination and field projection)"""
+        query = filter_matches(eager_query(MatchModel).filter_by(tournament_id=tournament_id), args)
+        return paginate(query, MatchModel, args)
 
 @blp.route("/team/<string:team_id>/matches")
 class TeamMatches(MethodView):
+    @cached_response("matches")
     def get(self, team_id):
         """Get all matches for a specific team (across all tournaments)"""
-        matches = MatchModel.query.filter(
+        matches = eager_query(MatchModel).filter(
             (MatchModel.team1_id == team_id) | 
             (MatchModel.team2_id == team_id)
         ).all()
-        return [m.to_dict() for m in matches], 200
\ No newline at end of file
+        return serialize(matches), 200
\ No newline at end of file
@@ -4,6 +4,15 @@ from flask import request
 from marshmallow import Schema, fields
 from db import db
 from models.player import PlayerModel
+from algorithms.team_ranking import recompute_team_rankings
+from sqlalchemy import insert
+from utils.bulk import bulk_length, bulk_response
+from utils.pagination import ListArgsSchema, paginate
+from utils.response_cache import invalidate
+import uuid
+
+# Players are embedded in team, match and tournament responses
+PLAYER_CHANGE_TAGS = ("match:*", "matches", "tournament:*", "tournaments")
 
 blp = Blueprint("Players", "players", description="Operations on players")
 
@@ -18,12 +27,15 @@ class PlayerUpdateSchema(Schema):
     rang = fields.Integer(required=False, metadata={"description": "Player ranking number"})
     numero_licence = fields.String(required=False, metadata={"description": "License number"})
 
+class PlayerBulkCreateSchema(Schema):
+    players = fields.List(fields.Nested(PlayerCreateSchema), required=True, validate=bulk_length, metadata={"description": "Players to create"})
+
 @blp.route("/player")
 class PlayerList(MethodView):
-    def get(self):
-        """Get all players"""
-        players = PlayerModel.query.all()
-        return [p.to_dict() for p in players], 200
+    @blp.arguments(ListArgsSchema, location="query")
+    def get(self, args):
+        """Get all players (optional cursor pagination and field projection)"""
+        return paginate(PlayerModel.query, PlayerModel, args)
 
     @blp.arguments(PlayerCreateSchema)
     def post(self, data):
@@ -38,6 +50,29 @@ class PlayerList(MethodView):
         db.session.commit()
         return player.to_dict(), 201
 
+@blp.route("/player/bulk")
+class PlayerBulk(MethodView):
+    @blp.arguments(PlayerBulkCreateSchema)
+    def post(self, data):
+        """Create many players in one transaction (one bulk INSERT)"""
+
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "name": player["name"],
+                "rang": player["rang"],
+                "numero_licence": player.get("numero_licence")
+            }
+            for player in data["players"]
+        ]
+        db.session.execute(insert(PlayerModel), rows)
+        db.session.commit()
+
+        return bulk_response([
+            {"index": index, "status": "created", "player": row}
+            for index, row in enumerate(rows)
+        ], 201)
+
 @blp.route("/player/<string:player_id>")
 class Player(MethodView):
     def get(self, player_id):
@@ -50,11 +85,19 @@ class Player(MethodView):
         """Update a player"""
         player = PlayerModel.query.get_or_404(player_id)
         
+        rang_changed = "rang" in data and data["rang"] != player.rang
+        
         player.name = data.get("name", player.name)
         player.rang = data.get("rang", player.rang)
         player.numero_licence = data.get("numero_licence", player.numero_licence)
         
+        # Rankings of the player's teams follow in the same transaction
+        if rang_changed:
+            db.session.flush()
+            recompute_team_rankings(player_ids=[player.id])
+        
         db.session.commit()
+        invalidate(*PLAYER_CHANGE_TAGS)
         return player.to_dict(), 200
 
     def delete(self, player_id):
@@ -62,4 +105,5 @@ class Player(MethodView):
         player = PlayerModel.query.get_or_404(player_id)
         db.session.delete(player)
         db.session.commit()
+        invalidate(*PLAYER_CHANGE_TAGS)
         return {"message": "Player deleted"}, 200
\ No newline at end of file
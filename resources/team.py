@@ -6,6 +6,16 @@ from db import db
 from models.team import TeamModel
 from models.team_member import TeamMemberModel
 from models.player import PlayerModel
+from algorithms.team_ranking import recompute_team_rankings
+from sqlalchemy import insert
+from utils.bulk import bulk_length, bulk_response, item_error
+from utils.eager_loading import eager_query
+from utils.pagination import DateRangeArgsSchema, filter_created_between, paginate
+from utils.response_cache import invalidate
+import uuid
+
+# Teams are embedded in match and tournament responses
+TEAM_CHANGE_TAGS = ("match:*", "matches", "tournament:*", "tournaments")
 
 blp = Blueprint("Teams", "teams", description="Operations on teams")
 
@@ -17,12 +27,19 @@ class TeamCreateSchema(Schema):
 class AddTeamMemberSchema(Schema):
     player2_id = fields.String(required=True, metadata={"description": "Second player ID"})
 
+class TeamBulkItemSchema(TeamCreateSchema):
+    player2_id = fields.String(required=False, metadata={"description": "Second player ID (optional)"})
+
+class TeamBulkCreateSchema(Schema):
+    teams = fields.List(fields.Nested(TeamBulkItemSchema), required=True, validate=bulk_length, metadata={"description": "Teams to create"})
+
 @blp.route("/team")
 class TeamList(MethodView):
-    def get(self):
-        """Get all teams"""
-        teams = TeamModel.query.all()
-        return [t.to_dict() for t in teams], 200
+    @blp.arguments(DateRangeArgsSchema, location="query")
+    def get(self, args):
+        """Get all teams (optional creation date range, cursor pagination and field projection)"""
+        query = filter_created_between(eager_query(TeamModel), TeamModel, args)
+        return paginate(query, TeamModel, args)
 
     @blp.arguments(TeamCreateSchema)
     def post(self, data):
@@ -44,11 +61,58 @@ class TeamList(MethodView):
         
         return team.to_dict(), 201
 
+@blp.route("/team/bulk")
+class TeamBulk(MethodView):
+    @blp.arguments(TeamBulkCreateSchema)
+    def post(self, data):
+        """Create many teams with their members in one transaction"""
+
+        player_ids = {item["player1_id"] for item in data["teams"]}
+        player_ids.update(item["player2_id"] for item in data["teams"] if item.get("player2_id"))
+        rang_by_player = dict(
+            db.session.query(PlayerModel.id, PlayerModel.rang).filter(PlayerModel.id.in_(player_ids)).all()
+        )
+
+        results = []
+        teams = []
+        members = []
+        for index, item in enumerate(data["teams"]):
+            member_ids = [item["player1_id"]] + ([item["player2_id"]] if item.get("player2_id") else [])
+            missing = [player_id for player_id in member_ids if player_id not in rang_by_player]
+
+            if missing:
+                results.append(item_error(index, f"Player {missing[0]} not found"))
+            elif len(set(member_ids)) != len(member_ids):
+                results.append(item_error(index, "Team members must be two different players"))
+            else:
+                team = {
+                    "id": str(uuid.uuid4()),
+                    "name": item["name"],
+                    "ranking": sum(rang_by_player[player_id] for player_id in member_ids)
+                }
+                teams.append(team)
+                members.extend(
+                    {"id": str(uuid.uuid4()), "team_id": team["id"], "player_id": player_id}
+                    for player_id in member_ids
+                )
+                results.append({"index": index, "status": "valid", "team": {**team, "player_ids": member_ids}})
+
+        if any(result["status"] == "error" for result in results):
+            return bulk_response(results)
+
+        db.session.execute(insert(TeamModel), teams)
+        db.session.execute(insert(TeamMemberModel), members)
+        db.session.commit()
+
+        for result in results:
+            result["status"] = "created"
+        return bulk_response(results, 201)
+
 @blp.route("/team/<string:team_id>")
 class Team(MethodView):
     def get(self, team_id):
         """Get a specific team"""
-        team = TeamModel.query.get_or_404(team_id)
+        team = eager_query(TeamModel).get_or_404(team_id)
         return team.to_dict(), 200
 
     def delete(self, team_id):
@@ -56,6 +120,7 @@ class Team(MethodView):
         team = TeamModel.query.get_or_404(team_id)
         db.session.delete(team)
         db.session.commit()
+        invalidate(*TEAM_CHANGE_TAGS)
         return {"message": "Team deleted"}, 200
 
 @blp.route("/team/<string:team_id>/add-member")
@@ -76,7 +141,9 @@ class AddTeamMember(MethodView):
         db.session.add(member2)
         
         # Recalculate team ranking
-        team.calculate_ranking()
+        db.session.flush()
+        recompute_team_rankings(team_ids=[team.id])
         db.session.commit()
+        invalidate(*TEAM_CHANGE_TAGS)
         
         return team.to_dict(), 200
\ No newline at end of file
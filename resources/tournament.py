@@ -1,18 +1,25 @@
 from flask.views import MethodView
 from flask_smorest import Blueprint
 from flask import request
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 from db import db
 from models.tournament import TournamentModel, TournamentTeamModel
 from models.team import TeamModel
 from models.court import CourtModel
 from models.match import MatchModel
-from algorithms.round_robin import generate_round_robin_matches
-from algorithms.positions_table import get_tournament_standings
-from algorithms.knockout import generate_knockout_bracket
-from algorithms.advanced_scheduling import schedule_matches_intelligent, can_schedule_match
+from algorithms.positions_table import get_tournament_standings, ensure_standing, ensure_standings
+from algorithms.advanced_scheduling import can_schedule_match
+from algorithms.knockout import get_bracket
+from sqlalchemy import insert
+from services.jobs import enqueue_job, job_accepted, JobConflictError
+from services.tournament_jobs import START_GROUP_PHASE, START_KNOCKOUT_PHASE, SCHEDULE_MATCHES
 from utils.auth_decorator import admin_required, token_required
+from utils.bulk import bulk_length, bulk_response, item_error
+from utils.eager_loading import eager_query
+from utils.pagination import StatusListArgsSchema, filter_created_between, paginate
+from utils.response_cache import cached_response, invalidate
 from datetime import datetime
+import uuid
 
 blp = Blueprint("Tournaments", "tournaments", description="Operations on tournaments")
 
@@ -20,11 +27,20 @@ blp = Blueprint("Tournaments", "tournaments", description="Operations on tournam
 class RegisterTeamSchema(Schema):
     team_id = fields.String(required=True, metadata={"description": "Team ID to register"})
 
+class StartGroupPhaseSchema(Schema):
+    pools = fields.Integer(required=False, validate=validate.Range(min=1), metadata={"description": "Number of pools (default: one pool up to 8 teams, then pools of about 4)"})
+
+class RegisterTeamsSchema(Schema):
+    team_ids = fields.List(fields.String(), required=True, validate=bulk_length, metadata={"description": "Team IDs to register"})
+
 class ScheduleMatchesSchema(Schema):
     court_ids = fields.List(fields.String(), required=True, metadata={"description": "List of court IDs"})
     start_date = fields.String(required=True, metadata={"description": "Start date (YYYY-MM-DD)"})
     time_slots = fields.List(fields.String(), required=False, load_default=["10:00", "12:00", "14:00", "16:00", "18:00"], metadata={"description": "Time slots (e.g., ['09:00', '11:00'])"})
     buffer_minutes = fields.Integer(required=False, load_default=10, metadata={"description": "Buffer minutes between matches"})
+    mode = fields.String(required=False, load_default="greedy", validate=validate.OneOf(["greedy", "optimize"]), metadata={"description": "Scheduling mode: 'greedy' (first free slot) or 'optimize' (minimise tournament days)"})
+    match_duration_minutes = fields.Integer(required=False, load_default=60, validate=validate.Range(min=15, max=300), metadata={"description": "Match duration in minutes"})
+    time_budget_seconds = fields.Float(required=False, load_default=10, validate=validate.Range(min=0, max=120), metadata={"description": "Search time budget for optimize mode"})
 
 class ValidateScheduleSchema(Schema):
     court_id = fields.String(required=True, metadata={"description": "Court ID"})
@@ -33,18 +49,32 @@ class ValidateScheduleSchema(Schema):
     end_time = fields.String(required=True, metadata={"description": "End time (HH:MM)"})
     buffer_minutes = fields.Integer(required=False, load_default=10, metadata={"description": "Buffer minutes"})
 
+def enqueue(kind, params, tournament_id):
+    """Queue a tournament job and answer 202, or 409 if a different one is running"""
+    try:
+        job, _ = enqueue_job(kind, params, tournament_id)
+    except JobConflictError as e:
+        return {"error": f"A {kind} job with different parameters is already {e.job.status}", "job_id": e.job.id}, 409
+    return job_accepted(job)
+
 @blp.route("/tournament")
 class TournamentList(MethodView):
-    def get(self):
-        """Get all tournaments"""
-        tournaments = TournamentModel.query.all()
-        return [t.to_dict() for t in tournaments], 200
+    @cached_response("tournaments")
+    @blp.arguments(StatusListArgsSchema, location="query")
+    def get(self, args):
+        """Get all tournaments (optional filters, cursor pagination and field projection)"""
+        query = eager_query(TournamentModel)
+        if args.get("status"):
+            query = query.filter(TournamentModel.status == args["status"])
+        query = filter_created_between(query, TournamentModel, args)
+        return paginate(query, TournamentModel, args)
 
 @blp.route("/tournament/<string:tournament_id>")
 class Tournament(MethodView):
+    @cached_response("tournament:{tournament_id}")
     def get(self, tournament_id):
         """Get a specific tournament"""
-        tournament = TournamentModel.query.get_or_404(tournament_id)
+        tournament = eager_query(TournamentModel).get_or_404(tournament_id)
         return tournament.to_dict(), 200
 
 @blp.route("/tournament/<string:tournament_id>/register-team")
@@ -71,128 +101,158 @@ class RegisterTeam(MethodView):
             team_id=team.id
         )
         db.session.add(tournament_team)
+        ensure_standing(tournament_id, team.id)
         db.session.commit()
+        invalidate(f"tournament:{tournament_id}", "tournaments")
         
         return {
             "message": "Team registered successfully",
             "tournament": tournament.to_dict()
         }, 201
 
+@blp.route("/tournament/<string:tournament_id>/register-teams")
+class RegisterTeams(MethodView):
+    @blp.arguments(RegisterTeamsSchema)
+    def post(self, data, tournament_id):
+        """Register many teams for a tournament in one transaction"""
+        TournamentModel.query.get_or_404(tournament_id)
+
+        team_ids = data["team_ids"]
+        known = {
+            team_id for (team_id,) in db.session.query(TeamModel.id).filter(TeamModel.id.in_(team_ids))
+        }
+        registered = {
+            team_id for (team_id,) in db.session.query(TournamentTeamModel.team_id).filter(
+                TournamentTeamModel.tournament_id == tournament_id,
+                TournamentTeamModel.team_id.in_(team_ids)
+            )
+        }
+
+        results = []
+        seen = set()
+        for index, team_id in enumerate(team_ids):
+            if team_id not in known:
+                results.append(item_error(index, "Team not found", team_id=team_id))
+            elif team_id in registered:
+                results.append(item_error(index, "Team already registered for this tournament", team_id=team_id))
+            elif team_id in seen:
+                results.append(item_error(index, "Team listed twice", team_id=team_id))
+            else:
+                results.append({"index": index, "status": "valid", "team_id": team_id})
+            seen.add(team_id)
+
+        if any(result["status"] == "error" for result in results):
+            return bulk_response(results)
+
+        db.session.execute(insert(TournamentTeamModel), [
+            {"id": str(uuid.uuid4()), "tournament_id": tournament_id, "team_id": team_id}
+            for team_id in team_ids
+        ])
+        ensure_standings(tournament_id, team_ids)
+        db.session.commit()
+        invalidate(f"tournament:{tournament_id}", "tournaments")
+
+        for result in results:
+            result["status"] = "registered"
+        return bulk_response(results, 201)
+
 @blp.route("/tournament/<string:tournament_id>/start-group-phase")
 class StartGroupPhase(MethodView):
     @admin_required
-    def post(self, tournament_id):
-        """Start group phase - generates round robin matches (admin only)"""
+    @blp.arguments(StartGroupPhaseSchema)
+    def post(self, data, tournament_id):
+        """Start group phase - queues seeded pools and their round robin matches (admin only, returns a job)"""
         tournament = TournamentModel.query.get_or_404(tournament_id)
         
         if tournament.status != "waiting":
             return {"error": "Tournament is not in waiting status"}, 400
         
-        # Get all registered teams
-        teams = [tt.team for tt in tournament.teams]
-        
-        if len(teams) < 2:
+        if len(tournament.teams) < 2:
             return {"error": "Need at least 2 teams to start tournament"}, 400
         
-        # Generate round robin matches
-        generate_round_robin_matches(tournament, teams)
-        
-        # Update tournament status
-        tournament.status = "group_phase"
-        db.session.commit()
+        if data.get("pools") and len(tournament.teams) < 2 * data["pools"]:
+            return {"error": "Every pool needs at least 2 teams"}, 400
         
-        return {
-            "message": "Group phase started",
-            "tournament": tournament.to_dict()
-        }, 200
+        return enqueue(START_GROUP_PHASE, {"pools": data.get("pools")}, tournament_id)
 
 @blp.route("/tournament/<string:tournament_id>/standings")
 class TournamentStandings(MethodView):
+    @cached_response("tournament:{tournament_id}")
     def get(self, tournament_id):
         """Get tournament standings/positions table"""
         tournament = TournamentModel.query.get_or_404(tournament_id)
         
         standings = get_tournament_standings(tournament)
         
+        # Positions count within each pool
+        positions = {}
+        rows = []
+        for s in standings:
+            positions[s["pool"]] = positions.get(s["pool"], 0) + 1
+            rows.append({
+                "position": positions[s["pool"]],
+                "pool": s["pool"],
+                "team": s["team"].to_dict(),
+                "matches_played": s["matches_played"],
+                "wins": s["wins"],
+                "draws": s["draws"],
+                "losses": s["losses"],
+                "points": s["points"],
+                "games_for": s["games_for"],
+                "games_against": s["games_against"],
+                "game_difference": s["game_difference"]
+            })
+        
+        return {
+            "tournament_id": tournament_id,
+            "tournament_name": tournament.name,
+            "standings": rows
+        }, 200
+
+@blp.route("/tournament/<string:tournament_id>/bracket")
+class TournamentBracket(MethodView):
+    @cached_response("tournament:{tournament_id}")
+    def get(self, tournament_id):
+        """Get the knockout bracket, round by round"""
+        tournament = TournamentModel.query.get_or_404(tournament_id)
+        
         return {
             "tournament_id": tournament_id,
             "tournament_name": tournament.name,
-            "standings": [
-                {
-                    "position": i + 1,
-                    "team": s["team"].to_dict(),
-                    "matches_played": s["matches_played"],
-                    "wins": s["wins"],
-                    "losses": s["losses"],
-                    "points": s["points"]
-                }
-                for i, s in enumerate(standings)
-            ]
+            "rounds": get_bracket(tournament_id)
         }, 200
 
 @blp.route("/tournament/<string:tournament_id>/start-knockout-phase")
 class StartKnockoutPhase(MethodView):
     @admin_required
     def post(self, tournament_id):
-        """Start knockout phase - generates bracket from standings (admin only)"""
+        """Start knockout phase - queues bracket generation from standings (admin only, returns a job)"""
         tournament = TournamentModel.query.get_or_404(tournament_id)
         
         if tournament.status != "group_phase":
             return {"error": "Tournament must be in group phase"}, 400
         
-        # Generate knockout bracket
-        success = generate_knockout_bracket(tournament)
-        
-        if not success:
-            return {"error": "Could not generate knockout bracket"}, 400
-        
-        # Update tournament status
-        tournament.status = "knockout_phase"
-        db.session.commit()
-        
-        return {
-            "message": "Knockout phase started",
-            "tournament": tournament.to_dict()
-        }, 200
+        return enqueue(START_KNOCKOUT_PHASE, {}, tournament_id)
 
 @blp.route("/tournament/<string:tournament_id>/schedule-matches")
 class ScheduleMatches(MethodView):
     @admin_required
     @blp.arguments(ScheduleMatchesSchema)
     def post(self, data, tournament_id):
-        """Schedule matches on courts with conflict detection (advanced scheduling)"""
-        tournament = TournamentModel.query.get_or_404(tournament_id)
-        
-        # Get courts
-        courts = []
-        for court_id in data["court_ids"]:
-            court = CourtModel.query.get(court_id)
-            if court:
-                courts.append(court)
+        """Schedule matches on courts with conflict detection (advanced scheduling, returns a job)"""
+        TournamentModel.query.get_or_404(tournament_id)
         
-        if not courts:
+        # Check courts
+        if not CourtModel.query.filter(CourtModel.id.in_(data["court_ids"])).count():
             return {"error": "No valid courts provided"}, 400
         
-        # Parse start date
+        # Check start date
         try:
-            start_date = datetime.strptime(data["start_date"], "%Y-%m-%d").date()
+            datetime.strptime(data["start_date"], "%Y-%m-%d")
         except ValueError:
             return {"error": "Invalid date format. Use YYYY-MM-DD"}, 400
         
-        time_slots = data.get("time_slots", ["10:00", "12:00", "14:00", "16:00", "18:00"])
-        buffer_minutes = data.get("buffer_minutes", 10)
-        
-        # Schedule matches with advanced algorithm
-        success, message, scheduled_count = schedule_matches_intelligent(
-            tournament, courts, start_date, time_slots, buffer_minutes
-        )
-        
-        return {
-            "success": success,
-            "message": message,
-            "scheduled_count": scheduled_count,
-            "tournament": tournament.to_dict()
-        }, 200 if success else 400
+        return enqueue(SCHEDULE_MATCHES, data, tournament_id)
 
 @blp.route("/match/<string:match_id>/validate-schedule")
 class ValidateSchedule(MethodView):
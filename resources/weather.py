@@ -4,14 +4,17 @@ from flask import request
 from marshmallow import Schema, fields
 from models.match import MatchModel
 from models.tournament import TournamentModel
-from algorithms.weather_guard import check_match_weather_and_relocate, check_all_tournament_weather
+from algorithms.weather_guard import check_match_weather_and_relocate
+from services.jobs import enqueue_job, job_accepted, JobConflictError
+from services.tournament_jobs import CHECK_ALL_WEATHER
 from utils.auth_decorator import admin_required
+from utils.response_cache import invalidate
 
 blp = Blueprint("Weather", "weather", description="Weather-based match management")
 
 # Schemas
 class WeatherCheckSchema(Schema):
-    location = fields.String(required=False, load_default="Tunis,TN", metadata={"description": "Location in format City,CountryCode (e.g., Tunis,TN)"})
+    location = fields.String(required=False, load_default="Tunis,TN", metadata={"description": "Location for courts without their own, City,CountryCode (e.g., Tunis,TN)"})
 
 @blp.route("/match/<string:match_id>/check-weather")
 class MatchWeatherCheck(MethodView):
@@ -19,11 +22,11 @@ class MatchWeatherCheck(MethodView):
     @blp.arguments(WeatherCheckSchema)
     def post(self, data, match_id):
         """
-        Check live weather and auto-relocate/postpone if needed (admin only).
+        Check the forecast for the booked slot and auto-relocate/postpone if needed (admin only).
         
         Actions:
         - If outdoor court + bad weather + indoor available → RELOCATE
-        - If outdoor court + bad weather + no indoor → POSTPONE to next day
+        - If outdoor court + bad weather + no indoor → POSTPONE to the next day the match fits
         - If indoor court OR good weather → NO ACTION
         """
         
@@ -33,6 +36,7 @@ class MatchWeatherCheck(MethodView):
         
         # Run weather guard
         result = check_match_weather_and_relocate(match, location)
+        invalidate(f"match:{match.id}", "matches", f"tournament:{match.tournament_id}")
         
         return {
             "match_id": match.id,
@@ -55,21 +59,21 @@ class TournamentWeatherCheck(MethodView):
         Check weather for ALL upcoming matches in tournament (admin only).
         Auto-relocate/postpone as needed.
         
-        Returns summary of actions taken for all matches.
+        Runs as a background job: returns 202 with the job id, and the
+        summary of actions taken is the job's result at /jobs/<job_id>.
         """
         
-        tournament = TournamentModel.query.get_or_404(tournament_id)
+        TournamentModel.query.get_or_404(tournament_id)
         
         location = data.get("location", "Tunis,TN")
         
-        # Check all matches
-        summary = check_all_tournament_weather(tournament, location)
+        # Check all matches in the background
+        try:
+            job, _ = enqueue_job(CHECK_ALL_WEATHER, {"location": location}, tournament_id)
+        except JobConflictError as e:
+            return {"error": f"A weather check for another location is already {e.job.status}", "job_id": e.job.id}, 409
         
-        return {
-            "tournament_id": tournament_id,
-            "tournament_name": tournament.name,
-            "summary": summary
-        }, 200
+        return job_accepted(job)
 
 @blp.route("/weather/test")
 class WeatherTest(MethodView):
@@ -0,0 +1,283 @@
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError, OperationalError
+from db import db
+from models.job import JobModel
+from utils.query_stats import collect_queries, log_query_stats
+from utils.metrics import flush_metrics
+
+# Long-running tournament operations are queued in the jobs table and run
+# by a pool of worker processes (python -m services.jobs), so they don't
+# hold a gunicorn worker. A running job keeps renewing its lease; if the
+# worker dies the lease expires and another worker picks the job up again.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1"))
+
+JOB_HANDLERS = {}  # kind -> handler(context) returning (body, status)
+
+def job_handler(kind):
+    """Register a handler for a job kind"""
+    def register(fn):
+        JOB_HANDLERS[kind] = fn
+        return fn
+    return register
+
+class JobConflictError(Exception):
+    """An active job with the same kind and tournament has different params"""
+
+    def __init__(self, job):
+        super().__init__(f"Job {job.id} is already {job.status}")
+        self.job = job
+
+class JobContext:
+    """What a handler gets: the job's params and a way to report progress"""
+
+    def __init__(self, job, worker_id):
+        self.job_id = job.id
+        self.tournament_id = job.tournament_id
+        self.params = job.params
+        self.attempts = job.attempts
+        self.worker_id = worker_id
+
+    def progress(self, percent, message=None):
+        """Record progress (call between commits) and renew the lease"""
+        _renew_lease(db.engine, self.job_id, self.worker_id, progress=percent, message=message)
+
+def enqueue_job(kind, params, tournament_id=None):
+    """
+    Queue a job, or return the active job already queued for the same kind
+    and tournament, so a retried request never starts a second run.
+
+    Returns: (job, created)
+    Raises: JobConflictError if the active job has different params
+    """
+
+    dedupe_key = f"{kind}:{tournament_id}"
+    existing = JobModel.query.filter_by(dedupe_key=dedupe_key).first()
+
+    if existing is None:
+        job = JobModel(kind=kind, tournament_id=tournament_id, params=params, dedupe_key=dedupe_key)
+        db.session.add(job)
+        try:
+            db.session.commit()
+            print(f"📥 Queued job {job.id} ({kind})")
+            return job, True
+        except IntegrityError:
+            # Another request queued the same job first
+            db.session.rollback()
+            existing = JobModel.query.filter_by(dedupe_key=dedupe_key).first()
+            if existing is None:
+                return enqueue_job(kind, params, tournament_id)
+
+    if existing.params != params:
+        raise JobConflictError(existing)
+    return existing, False
+
+def job_accepted(job):
+    """202 response pointing the client at the job's status URL"""
+    status_url = f"/jobs/{job.id}"
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "status_url": status_url
+    }, 202, {"Location": status_url}
+
+def _claimable(now):
+    return db.or_(
+        JobModel.status == "queued",
+        db.and_(JobModel.status == "running", JobModel.lease_expires_at < now)
+    )
+
+def claim_next_job(worker_id):
+    """
+    Take the oldest queued job, or a running one whose worker's lease has
+    expired. The conditional UPDATE makes the claim atomic across processes.
+    Returns: JobModel or None
+    """
+    now = datetime.utcnow()
+    candidate = db.session.query(JobModel.id).filter(_claimable(now)).order_by(
+        JobModel.created_at, JobModel.id
+    ).first()
+    if candidate is None:
+        return None
+
+    claimed = JobModel.query.filter(JobModel.id == candidate.id, _claimable(now)).update({
+        "status": "running",
+        "worker_id": worker_id,
+        "lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS),
+        "attempts": JobModel.attempts + 1,
+        "started_at": db.func.coalesce(JobModel.started_at, now)
+    }, synchronize_session=False)
+    db.session.commit()
+
+    if not claimed:
+        return None  # Another worker got it first
+    return db.session.get(JobModel, candidate.id)
+
+def _renew_lease(engine, job_id, worker_id, **values):
+    """Extend a running job's lease (plus any extra columns) on its own connection"""
+    values["lease_expires_at"] = datetime.utcnow() + timedelta(seconds=JOB_LEASE_SECONDS)
+    values = {key: value for key, value in values.items() if value is not None}
+    with engine.begin() as conn:
+        conn.execute(
+            update(JobModel)
+            .where(JobModel.id == job_id, JobModel.worker_id == worker_id)
+            .values(**values)
+        )
+
+def _heartbeat(engine, job_id, worker_id, stop):
+    while not stop.wait(JOB_LEASE_SECONDS / 3):
+        try:
+            _renew_lease(engine, job_id, worker_id)
+        except OperationalError as e:
+            # Database busy with the job's own writes; try again next beat
+            print(f"⚠️ Could not renew lease for job {job_id}: {e}")
+
+def _finish(job_id, worker_id, **values):
+    """Store the outcome, unless another worker has taken the job over"""
+    values.setdefault("dedupe_key", None)
+    values.setdefault("finished_at", datetime.utcnow())
+    values.setdefault("lease_expires_at", None)
+    JobModel.query.filter(JobModel.id == job_id, JobModel.worker_id == worker_id).update(
+        values, synchronize_session=False
+    )
+    db.session.commit()
+
+def run_job(job, worker_id):
+    """Run a claimed job and record its result, error or retry"""
+
+    job_id, attempts, kind = job.id, job.attempts, job.kind
+
+    handler = JOB_HANDLERS.get(job.kind)
+    if handler is None:
+        _finish(job_id, worker_id, status="failed", error=f"Unknown job kind '{job.kind}'")
+        return
+    if attempts > JOB_MAX_ATTEMPTS:
+        _finish(job_id, worker_id, status="failed", error=f"Gave up after {JOB_MAX_ATTEMPTS} attempts")
+        return
+
+    print(f"⚙️ Running job {job_id} ({job.kind}, attempt {attempts})")
+
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(db.engine, job_id, worker_id, stop), daemon=True)
+    heartbeat.start()
+
+    try:
+        with collect_queries(f"job {kind}") as stats:
+            body, status = handler(JobContext(job, worker_id))
+        log_query_stats(stats, job_id=job_id, kind=kind)
+
+        if status >= 400:
+            _finish(job_id, worker_id, status="failed", result=body,
+                    error=body.get("error") or body.get("message"))
+            print(f"❌ Job {job_id} failed: {body}")
+        else:
+            _finish(job_id, worker_id, status="succeeded", result=body, progress=100, message="Done")
+            print(f"✅ Job {job_id} succeeded")
+
+    except Exception as e:
+        db.session.rollback()
+        if attempts < JOB_MAX_ATTEMPTS:
+            # Handlers are idempotent, so the next attempt resumes the work
+            JobModel.query.filter(JobModel.id == job_id, JobModel.worker_id == worker_id).update(
+                {"status": "queued", "worker_id": None, "lease_expires_at": None, "error": str(e)},
+                synchronize_session=False
+            )
+            db.session.commit()
+            print(f"⚠️ Job {job_id} raised {e!r}, re-queued")
+        else:
+            _finish(job_id, worker_id, status="failed", error=str(e))
+            print(f"❌ Job {job_id} failed: {e!r}")
+
+    finally:
+        stop.set()
+        heartbeat.join()
+
+def work(stop=None):
+    """Claim and run jobs until stop is set (call inside an app context)"""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    stop = stop or threading.Event()
+    print(f"👷 Job worker {worker_id} started")
+
+    while not stop.is_set():
+        job = claim_next_job(worker_id)
+        if job is None:
+            flush_metrics()
+            stop.wait(JOB_POLL_SECONDS)
+            continue
+        run_job(job, worker_id)
+        db.session.remove()  # Fresh session for the next job
+        flush_metrics()
+
+    print(f"👋 Job worker {worker_id} stopped")
+
+def start_embedded_worker(app):
+    """Run one worker thread inside this process (development server)"""
+    def run():
+        with app.app_context():
+            work()
+
+    thread = threading.Thread(target=run, name="job-worker", daemon=True)
+    thread.start()
+    return thread
+
+def _worker_process():
+    from app import app
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    with app.app_context():
+        work(stop)
+
+def run_worker_pool(processes=JOB_WORKERS):
+    """
+    Start worker processes and restart any that crash. SIGTERM/SIGINT stop
+    them after their current job; a job cut off by a hard kill is resumed
+    by another worker once its lease expires.
+    """
+
+    stopping = threading.Event()
+
+    def shutdown(*_):
+        stopping.set()
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+
+    def spawn(number):
+        worker = multiprocessing.Process(target=_worker_process, name=f"job-worker-{number}")
+        worker.start()
+        return worker
+
+    workers = [spawn(number) for number in range(processes)]
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    while not stopping.is_set():
+        for number, worker in enumerate(workers):
+            if not worker.is_alive() and not stopping.is_set():
+                print(f"⚠️ {worker.name} exited with code {worker.exitcode}, restarting")
+                workers[number] = spawn(number)
+        time.sleep(1)
+
+    for worker in workers:
+        worker.join()
+
+if __name__ == "__main__":
+    import sys
+    # Go through the importable module so handlers register in the same registry
+    from services.jobs import run_worker_pool, JOB_WORKERS
+
+    run_worker_pool(int(sys.argv[1]) if len(sys.argv) > 1 else JOB_WORKERS)
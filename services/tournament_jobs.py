@@ -0,0 +1,140 @@
+from db import db
+from models.tournament import TournamentModel
+from models.court import CourtModel
+from models.match import MatchModel
+from algorithms.round_robin import generate_round_robin_matches, snake_seed_pools, assign_pools, default_pool_count
+from algorithms.positions_table import rebuild_tournament_standings
+from algorithms.knockout import generate_knockout_bracket
+from algorithms.advanced_scheduling import schedule_matches_intelligent
+from algorithms.weather_guard import check_all_tournament_weather
+from services.jobs import job_handler
+from utils.response_cache import invalidate
+from datetime import datetime
+
+# Job kinds. Every handler is safe to run again after a worker died half-way:
+# it checks what an earlier attempt already committed and carries on from there.
+START_GROUP_PHASE = "start_group_phase"
+START_KNOCKOUT_PHASE = "start_knockout_phase"
+SCHEDULE_MATCHES = "schedule_matches"
+CHECK_ALL_WEATHER = "check_all_weather"
+
+def _has_matches(tournament_id, phase):
+    return db.session.query(MatchModel.id).filter_by(tournament_id=tournament_id, phase=phase).first() is not None
+
+@job_handler(START_GROUP_PHASE)
+def start_group_phase(job):
+    """Seed teams into pools, generate each pool's round robin and open the group phase"""
+    tournament = db.session.get(TournamentModel, job.tournament_id)
+    if tournament is None:
+        return {"error": "Tournament not found"}, 404
+
+    resumed = job.attempts > 1 and tournament.status == "group_phase"
+    if tournament.status != "waiting" and not resumed:
+        return {"error": "Tournament is not in waiting status"}, 400
+
+    if not resumed:
+        teams = [tt.team for tt in tournament.teams]
+        if len(teams) < 2:
+            return {"error": "Need at least 2 teams to start tournament"}, 400
+
+        # A previous attempt may have created the matches before it died
+        if not _has_matches(tournament.id, "group"):
+            pool_count = job.params.get("pools") or default_pool_count(len(teams))
+            job.progress(10, f"Generating round robin matches for {len(teams)} teams in {pool_count} pools")
+            pools = snake_seed_pools(teams, pool_count)
+            assign_pools(tournament, pools)
+            generate_round_robin_matches(tournament, pools)
+
+        # Every registered team starts with a standings row
+        job.progress(60, "Building standings")
+        rebuild_tournament_standings(tournament)
+
+        tournament.status = "group_phase"
+        db.session.commit()
+
+    invalidate(f"tournament:{tournament.id}", "tournaments", "matches")
+
+    return {
+        "message": "Group phase started",
+        "tournament": tournament.to_dict()
+    }, 200
+
+@job_handler(START_KNOCKOUT_PHASE)
+def start_knockout_phase(job):
+    """Generate the knockout bracket from standings"""
+    tournament = db.session.get(TournamentModel, job.tournament_id)
+    if tournament is None:
+        return {"error": "Tournament not found"}, 404
+
+    resumed = job.attempts > 1 and tournament.status == "knockout_phase"
+    if tournament.status != "group_phase" and not resumed:
+        return {"error": "Tournament must be in group phase"}, 400
+
+    if not resumed:
+        if not _has_matches(tournament.id, "knockout"):
+            job.progress(10, "Generating knockout bracket")
+            if not generate_knockout_bracket(tournament):
+                return {"error": "Could not generate knockout bracket"}, 400
+
+        tournament.status = "knockout_phase"
+        db.session.commit()
+
+    invalidate(f"tournament:{tournament.id}", "tournaments", "matches")
+
+    return {
+        "message": "Knockout phase started",
+        "tournament": tournament.to_dict()
+    }, 200
+
+@job_handler(SCHEDULE_MATCHES)
+def schedule_matches(job):
+    """Schedule the tournament's unbooked matches (already-booked ones are skipped, so reruns resume)"""
+    tournament = db.session.get(TournamentModel, job.tournament_id)
+    if tournament is None:
+        return {"error": "Tournament not found"}, 404
+
+    params = job.params
+    courts_by_id = {
+        court.id: court
+        for court in CourtModel.query.filter(CourtModel.id.in_(params["court_ids"])).all()
+    }
+    courts = [courts_by_id[court_id] for court_id in params["court_ids"] if court_id in courts_by_id]
+    if not courts:
+        return {"error": "No valid courts provided"}, 400
+
+    job.progress(5, f"Scheduling on {len(courts)} courts ({params['mode']} mode)")
+
+    success, message, scheduled_count = schedule_matches_intelligent(
+        tournament, courts,
+        datetime.strptime(params["start_date"], "%Y-%m-%d").date(),
+        params["time_slots"], params["buffer_minutes"],
+        mode=params["mode"], time_budget_seconds=params["time_budget_seconds"],
+        match_duration_minutes=params["match_duration_minutes"]
+    )
+    # New bookings show up in each scheduled match's own response too
+    invalidate(f"tournament:{tournament.id}", "matches", "match:*")
+
+    return {
+        "success": success,
+        "message": message,
+        "scheduled_count": scheduled_count,
+        "tournament": tournament.to_dict()
+    }, 200 if success else 400
+
+@job_handler(CHECK_ALL_WEATHER)
+def check_all_weather(job):
+    """Check the forecast for all upcoming matches and relocate/postpone"""
+    tournament = db.session.get(TournamentModel, job.tournament_id)
+    if tournament is None:
+        return {"error": "Tournament not found"}, 404
+
+    job.progress(5, "Checking forecast for upcoming matches")
+    summary = check_all_tournament_weather(tournament, job.params["location"])
+    # Bookings now carry the checked weather, and some may have moved
+    invalidate(f"tournament:{tournament.id}", "matches", "match:*")
+
+    return {
+        "tournament_id": tournament.id,
+        "tournament_name": tournament.name,
+        "summary": summary
+    }, 200
@@ -0,0 +1,234 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from utils.metrics import inc
+
+# Weather responses are cached per (location, hour bucket): every match in a
+# tournament asks for the same location, so only the first lookup in an hour
+# goes to the API.
+WEATHER_CACHE_TTL_SECONDS = int(os.getenv("WEATHER_CACHE_TTL_SECONDS", "600"))
+WEATHER_CACHE_MAX_ENTRIES = int(os.getenv("WEATHER_CACHE_MAX_ENTRIES", "256"))
+# Optional SQLite file shared by all gunicorn workers (e.g. instance/weather_cache.db)
+WEATHER_CACHE_DB = os.getenv("WEATHER_CACHE_DB")
+
+def hour_bucket(timestamp=None):
+    """Hour-aligned bucket for a unix timestamp (default: now)"""
+    if timestamp is None:
+        timestamp = time.time()
+    return int(timestamp // 3600)
+
+class SQLiteWeatherStore:
+    """
+    Shared cache table so several processes reuse each other's API results.
+    A short lease per key lets one process fetch while the others wait for
+    its result instead of calling the API themselves.
+    """
+
+    LEASE_SECONDS = 10
+
+    def __init__(self, path):
+        self.path = path
+        # Readers don't block behind the worker that is writing a result
+        self._execute("PRAGMA journal_mode=WAL")
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS weather_cache ("
+            "location TEXT NOT NULL, "
+            "bucket INTEGER NOT NULL, "
+            "payload TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "PRIMARY KEY (location, bucket))"
+        )
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS weather_cache_leases ("
+            "location TEXT NOT NULL, "
+            "bucket INTEGER NOT NULL, "
+            "owner TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "PRIMARY KEY (location, bucket))"
+        )
+
+    def _execute(self, *statements):
+        """Run (sql, params) statements in one transaction, return the last cursor's rows"""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                rows = []
+                for statement in statements:
+                    sql, params = statement if isinstance(statement, tuple) else (statement, ())
+                    rows = conn.execute(sql, params).fetchall()
+                return rows
+        finally:
+            conn.close()
+
+    def get(self, key):
+        location, bucket = key
+        rows = self._execute((
+            "SELECT payload FROM weather_cache WHERE location = ? AND bucket = ? AND expires_at > ?",
+            (location, bucket, time.time())
+        ))
+        return json.loads(rows[0][0]) if rows else None
+
+    def set(self, key, value, ttl):
+        location, bucket = key
+        now = time.time()
+        self._execute(
+            ("INSERT OR REPLACE INTO weather_cache (location, bucket, payload, expires_at) VALUES (?, ?, ?, ?)",
+             (location, bucket, json.dumps(value), now + ttl)),
+            ("DELETE FROM weather_cache WHERE expires_at <= ?", (now,)),
+        )
+
+    def try_lease(self, key):
+        """Claim the right to fetch key: the lease owner token, or None if another process holds a live lease"""
+        location, bucket = key
+        owner = str(uuid.uuid4())
+        now = time.time()
+        rows = self._execute(
+            ("DELETE FROM weather_cache_leases WHERE expires_at <= ?", (now,)),
+            ("INSERT OR IGNORE INTO weather_cache_leases (location, bucket, owner, expires_at) VALUES (?, ?, ?, ?)",
+             (location, bucket, owner, now + self.LEASE_SECONDS)),
+            ("SELECT owner FROM weather_cache_leases WHERE location = ? AND bucket = ?",
+             (location, bucket)),
+        )
+        return owner if rows and rows[0][0] == owner else None
+
+    def release(self, key, owner):
+        """Drop the lease on key if owner (from try_lease) still holds it"""
+        location, bucket = key
+        self._execute((
+            "DELETE FROM weather_cache_leases WHERE location = ? AND bucket = ? AND owner = ?",
+            (location, bucket, owner)
+        ))
+
+    def wait_for(self, key, timeout=LEASE_SECONDS, interval=0.1):
+        """Poll for a value another process is fetching; None on timeout"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            value = self.get(key)
+            if value is not None:
+                return value
+            time.sleep(interval)
+        return None
+
+class WeatherCache:
+    """
+    In-process LRU cache with TTL and request coalescing.
+
+    - Entries expire after ttl seconds; the least recently used entry is
+      evicted once max_entries is reached.
+    - Concurrent lookups of the same key share one in-flight fetch.
+    - With a shared store, results are also read from / written to it so
+      other worker processes can reuse them.
+    """
+
+    def __init__(self, ttl=WEATHER_CACHE_TTL_SECONDS, max_entries=WEATHER_CACHE_MAX_ENTRIES, shared_store=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.shared_store = shared_store
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}            # key -> Future
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_local(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_local(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_shared(self, key):
+        """(shared value or None, our lease owner token or None)"""
+        if not self.shared_store:
+            return None, None
+        value = self.shared_store.get(key)
+        if value is not None:
+            return value, None
+        lease = self.shared_store.try_lease(key)
+        if lease is None:
+            # Another worker process is fetching it right now
+            value = self.shared_store.wait_for(key)
+        return value, lease
+
+    def _fetch_shared(self, key, fetch, cacheable, lease):
+        try:
+            value = fetch()
+            if self.shared_store and cacheable(value):
+                self.shared_store.set(key, value, self.ttl)
+            return value
+        finally:
+            # Only the lease holder releases: a process whose wait timed out
+            # must not drop the lease of the one still fetching
+            if lease is not None:
+                self.shared_store.release(key, lease)
+
+    def _count(self, hit):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        inc("padel_cache_requests_total", cache="weather", result="hit" if hit else "miss")
+
+    def get_or_fetch(self, key, fetch, cacheable=lambda value: True):
+        """
+        Return the cached value for key, or call fetch() once (even with
+        concurrent callers) and cache its result if cacheable(result).
+        """
+
+        with self._lock:
+            value = self._get_local(key)
+            if value is not None:
+                self._count(hit=True)
+                return value
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            # Another thread is already fetching this key
+            self._count(hit=True)
+            return future.result()
+
+        try:
+            value, lease = self._get_shared(key)
+            self._count(hit=value is not None)
+            if value is None:
+                value = self._fetch_shared(key, fetch, cacheable, lease)
+
+            with self._lock:
+                if cacheable(value):
+                    self._set_local(key, value)
+                del self._inflight[key]
+            future.set_result(value)
+            return value
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+weather_cache = WeatherCache(
+    shared_store=SQLiteWeatherStore(WEATHER_CACHE_DB) if WEATHER_CACHE_DB else None
+)
@@ -0,0 +1,149 @@
+import os
+import requests
+from datetime import datetime, timedelta
+
+# Get your free API key from: https://openweathermap.org/api
+OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "2058b3537797aa402bf5b9881a5bc387")
+# Point at a local stub (python -m services.weather_stub_server) for tests
+OPENWEATHER_API_ROOT = os.getenv("OPENWEATHER_API_ROOT", "https://api.openweathermap.org/data/2.5").rstrip("/")
+# Per-request timeout; weather_service also applies an overall deadline
+WEATHER_REQUEST_TIMEOUT_SECONDS = float(os.getenv("WEATHER_REQUEST_TIMEOUT_SECONDS", "5"))
+
+FORECAST_STEP = timedelta(hours=3)
+
+class WeatherProviderError(Exception):
+    """Weather could not be fetched or parsed"""
+
+class WeatherProvider:
+    """
+    Source of weather readings. A reading is a dict:
+        {"temperature": float (°C), "rain_probability": int (0-100),
+         "wind_speed": float (km/h), "condition": str}
+    Forecast readings also carry "time": local "YYYY-MM-DDTHH:MM" of the
+    start of the FORECAST_STEP window they cover.
+    """
+
+    def get_current(self, location):
+        raise NotImplementedError
+
+    def get_forecast(self, location):
+        """All forecast readings for location, sorted by time"""
+        raise NotImplementedError
+
+class OpenWeatherMapProvider(WeatherProvider):
+    """Current conditions and the 5 day / 3 hour forecast from OpenWeatherMap"""
+
+    def __init__(self, api_key=OPENWEATHER_API_KEY, timeout=WEATHER_REQUEST_TIMEOUT_SECONDS, api_root=OPENWEATHER_API_ROOT):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.current_url = f"{api_root.rstrip('/')}/weather"
+        self.forecast_url = f"{api_root.rstrip('/')}/forecast"
+
+    def _get(self, url, location):
+        params = {
+            "q": location,
+            "appid": self.api_key,
+            "units": "metric"  # Celsius
+        }
+        try:
+            response = requests.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise WeatherProviderError(str(e)) from e
+
+    def get_current(self, location):
+        data = self._get(self.current_url, location)
+        try:
+            # Check if rain exists
+            rain_probability = 0
+            if "rain" in data:
+                # Current conditions give rain volume, convert to probability estimate
+                rain_volume = data["rain"].get("1h", 0)
+                rain_probability = min(int(rain_volume * 20), 100)  # Rough conversion
+
+            return {
+                "temperature": data["main"]["temp"],
+                "rain_probability": rain_probability,
+                "wind_speed": data["wind"]["speed"] * 3.6,  # Convert m/s to km/h
+                "condition": data["weather"][0]["main"].lower()  # "clear", "rain", "clouds", etc.
+            }
+        except (KeyError, IndexError) as e:
+            raise WeatherProviderError(f"Invalid API response: {e}") from e
+
+    def get_forecast(self, location):
+        data = self._get(self.forecast_url, location)
+        try:
+            # Timestamps are UTC; bookings are in the venue's local time
+            utc_offset = timedelta(seconds=data["city"].get("timezone", 0))
+            readings = []
+            for item in data["list"]:
+                local_time = datetime.utcfromtimestamp(item["dt"]) + utc_offset
+                readings.append({
+                    "time": local_time.strftime("%Y-%m-%dT%H:%M"),
+                    "temperature": item["main"]["temp"],
+                    "rain_probability": int(round(item.get("pop", 0) * 100)),
+                    "wind_speed": item["wind"]["speed"] * 3.6,  # Convert m/s to km/h
+                    "condition": item["weather"][0]["main"].lower()
+                })
+            return sorted(readings, key=lambda r: r["time"])
+        except (KeyError, IndexError) as e:
+            raise WeatherProviderError(f"Invalid API response: {e}") from e
+
+class FakeWeatherProvider(WeatherProvider):
+    """
+    Local provider for tests and development (WEATHER_PROVIDER=fake).
+    Every slot has the default reading unless overridden with set_weather().
+    """
+
+    DEFAULT_READING = {
+        "temperature": 22.0,
+        "rain_probability": 0,
+        "wind_speed": 10.0,
+        "condition": "clear"
+    }
+
+    def __init__(self, default=None, days=5):
+        self.default = dict(default or self.DEFAULT_READING)
+        self.days = days
+        self.overrides = {}  # (location, "YYYY-MM-DDTHH:MM") -> reading
+        self.calls = 0
+
+    def set_weather(self, location, when, **reading):
+        """Override the forecast window containing `when` (a datetime) for location"""
+        self.overrides[(location, forecast_window_start(when))] = {**self.default, **reading}
+
+    def get_current(self, location):
+        self.calls += 1
+        return dict(self.overrides.get((location, forecast_window_start(datetime.now())), self.default))
+
+    def get_forecast(self, location):
+        self.calls += 1
+        start = datetime.strptime(forecast_window_start(datetime.now()), "%Y-%m-%dT%H:%M")
+        readings = []
+        for step in range(self.days * 24 // 3):
+            window = (start + step * FORECAST_STEP).strftime("%Y-%m-%dT%H:%M")
+            reading = self.overrides.get((location, window), self.default)
+            readings.append({"time": window, **reading})
+        return readings
+
+def forecast_window_start(when):
+    """Start of the 3-hour forecast window containing `when`, as "YYYY-MM-DDTHH:MM" """
+    return when.replace(hour=when.hour - when.hour % 3, minute=0, second=0, microsecond=0).strftime("%Y-%m-%dT%H:%M")
+
+_provider = None
+
+def get_weather_provider():
+    """Provider selected by WEATHER_PROVIDER ("openweathermap" by default, or "fake")"""
+    global _provider
+    if _provider is None:
+        if os.getenv("WEATHER_PROVIDER", "openweathermap") == "fake":
+            _provider = FakeWeatherProvider()
+        else:
+            _provider = OpenWeatherMapProvider()
+    return _provider
+
+def set_weather_provider(provider):
+    """Swap the provider (e.g. a FakeWeatherProvider in tests)"""
+    global _provider
+    _provider = provider
@@ -1,13 +1,47 @@
-import requests
+import os
+import time
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from services.weather_cache import weather_cache, hour_bucket
+from services.weather_providers import get_weather_provider, WeatherProviderError, FORECAST_STEP
+from utils.metrics import inc, observe
 
-# Get your free API key from: https://openweathermap.org/api
-OPENWEATHER_API_KEY = "2058b3537797aa402bf5b9881a5bc387"  
-OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
+# Concurrent forecast fetches for multi-venue checks, and the overall time
+# allowed for all of them (locations that miss it get no forecast this run)
+WEATHER_FETCH_WORKERS = int(os.getenv("WEATHER_FETCH_WORKERS", "8"))
+WEATHER_FETCH_DEADLINE_SECONDS = float(os.getenv("WEATHER_FETCH_DEADLINE_SECONDS", "10"))
+
+def call_provider(operation, location):
+    """provider.<operation>(location), counted and timed in the weather API metrics"""
+    provider = get_weather_provider()
+    labels = {"provider": type(provider).__name__, "operation": operation}
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        result = getattr(provider, operation)(location)
+        outcome = "ok"
+        return result
+    finally:
+        observe("padel_weather_api_duration_seconds", time.perf_counter() - started, **labels)
+        inc("padel_weather_api_calls_total", outcome=outcome, **labels)
 
 def get_live_weather(location="Tunis,TN"):
     """
-    Get live weather data from OpenWeatherMap.
+    Get live weather data, cached per (location, hour) so repeated checks
+    for the same location share one provider call.
+    Failed lookups (results with an "error" key) are not cached.
+    """
+    
+    return weather_cache.get_or_fetch(
+        (location, hour_bucket()),
+        lambda: fetch_live_weather(location),
+        cacheable=lambda weather: "error" not in weather
+    )
+
+def fetch_live_weather(location="Tunis,TN"):
+    """
+    Get live weather data from the weather provider (OpenWeatherMap by default).
     
     Args:
         location: City and country code (e.g., "Tunis,TN", "Paris,FR")
@@ -24,44 +58,10 @@ def get_live_weather(location="Tunis,TN"):
     """
     
     try:
-        params = {
-            "q": location,
-            "appid": OPENWEATHER_API_KEY,
-            "units": "metric"  # Celsius
-        }
+        reading = call_provider("get_current", location)
+        return describe_reading(reading)
         
-        response = requests.get(OPENWEATHER_BASE_URL, params=params, timeout=5)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        # Extract weather data
-        temperature = data["main"]["temp"]
-        wind_speed = data["wind"]["speed"] * 3.6  # Convert m/s to km/h
-        
-        # Check if rain exists
-        rain_probability = 0
-        if "rain" in data:
-            # OpenWeather gives rain volume, convert to probability estimate
-            rain_volume = data["rain"].get("1h", 0)
-            rain_probability = min(int(rain_volume * 20), 100)  # Rough conversion
-        
-        # Get weather condition
-        condition = data["weather"][0]["main"].lower()  # "clear", "rain", "clouds", etc.
-        
-        # Check suitability
-        is_suitable = check_weather_suitability(temperature, rain_probability, wind_speed)
-        
-        return {
-            "temperature": round(temperature, 1),
-            "rain_probability": rain_probability,
-            "wind_speed": round(wind_speed, 1),
-            "condition": condition,
-            "is_suitable": is_suitable,
-            "checked_at": datetime.utcnow().isoformat()
-        }
-        
-    except requests.exceptions.RequestException as e:
+    except WeatherProviderError as e:
         print(f" Weather API error: {e}")
         # Return safe default (assume good weather if API fails)
         return {
@@ -73,17 +73,112 @@ def get_live_weather(location="Tunis,TN"):
             "checked_at": datetime.utcnow().isoformat(),
             "error": str(e)
         }
-    except KeyError as e:
-        print(f"Weather API response parsing error: {e}")
-        return {
-            "temperature": 20.0,
-            "rain_probability": 0,
-            "wind_speed": 10.0,
-            "condition": "unknown",
-            "is_suitable": True,
-            "checked_at": datetime.utcnow().isoformat(),
-            "error": f"Invalid API response: {e}"
-        }
+
+def describe_reading(reading):
+    """Turn a provider reading into the weather dict used across the API"""
+    
+    temperature = reading["temperature"]
+    rain_probability = reading["rain_probability"]
+    wind_speed = reading["wind_speed"]
+    
+    weather = {
+        "temperature": round(temperature, 1),
+        "rain_probability": rain_probability,
+        "wind_speed": round(wind_speed, 1),
+        "condition": reading["condition"],
+        "is_suitable": check_weather_suitability(temperature, rain_probability, wind_speed),
+        "checked_at": datetime.utcnow().isoformat()
+    }
+    if "time" in reading:
+        weather["forecast_for"] = reading["time"]
+    return weather
+
+def get_forecast(location="Tunis,TN"):
+    """
+    Forecast readings for a location, sorted by time. Fetched once per
+    location and hour (shared through the weather cache).
+    Returns [] if the provider fails.
+    """
+    
+    def fetch():
+        try:
+            return call_provider("get_forecast", location)
+        except WeatherProviderError as e:
+            print(f" Weather forecast error: {e}")
+            return []
+    
+    return weather_cache.get_or_fetch(
+        (f"forecast:{location}", hour_bucket()),
+        fetch,
+        cacheable=lambda readings: len(readings) > 0
+    )
+
+def get_forecasts(locations, deadline_seconds=WEATHER_FETCH_DEADLINE_SECONDS):
+    """
+    Forecasts for several locations, fetched concurrently so a multi-venue
+    check costs one round trip instead of one per location.
+    
+    Returns:
+        dict: {location: readings}; a location whose fetch failed or did not
+        finish before the deadline maps to [] (it finishes in the background
+        and lands in the cache for the next check)
+    """
+    
+    locations = list(dict.fromkeys(locations))
+    if not locations:
+        return {}
+    if len(locations) == 1:
+        return {locations[0]: get_forecast(locations[0])}
+    
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=min(WEATHER_FETCH_WORKERS, len(locations)))
+    try:
+        futures = {location: executor.submit(get_forecast, location) for location in locations}
+        wait(futures.values(), timeout=deadline_seconds)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    forecasts = {}
+    for location, future in futures.items():
+        if not future.done():
+            print(f" Weather forecast for {location} missed the {deadline_seconds}s deadline")
+            forecasts[location] = []
+        elif future.exception():
+            print(f" Weather forecast error for {location}: {future.exception()}")
+            forecasts[location] = []
+        else:
+            forecasts[location] = future.result()
+    
+    print(f"🌤️ Fetched forecasts for {len(locations)} locations in {time.monotonic() - started:.2f}s")
+    return forecasts
+
+def forecast_at(readings, when):
+    """
+    Forecast weather at a local datetime from a location's readings.
+    
+    Returns:
+        dict like get_live_weather() plus "forecast_for", or None when the
+        time is outside the forecast horizon (or there are no readings)
+    """
+    
+    if not readings:
+        return None
+    
+    times = [reading["time"] for reading in readings]
+    position = bisect_right(times, when.strftime("%Y-%m-%dT%H:%M")) - 1
+    if position < 0:
+        return None
+    
+    reading = readings[position]
+    window_start = datetime.strptime(reading["time"], "%Y-%m-%dT%H:%M")
+    if when >= window_start + FORECAST_STEP:
+        return None
+    
+    return describe_reading(reading)
+
+def get_weather_at(location, when):
+    """Forecast weather for a location at a local datetime (None outside the horizon)"""
+    return forecast_at(get_forecast(location), when)
 
 def check_weather_suitability(temperature, rain_probability, wind_speed):
     """
@@ -0,0 +1,87 @@
+import argparse
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# Local stand-in for the OpenWeatherMap API, for tests and load checks:
+#   python -m services.weather_stub_server --port 8081 --delay 0.5 --rain Sousse,TN
+#   OPENWEATHER_API_ROOT=http://127.0.0.1:8081/data/2.5 python app.py
+# Every location is clear and mild, except the --rain ones. --delay adds a
+# fixed latency to each response to mimic the real round trip.
+
+FORECAST_STEPS = 40  # 5 days of 3-hour windows, like the real API
+
+def _reading(rainy):
+    return {
+        "main": {"temp": 14.0 if rainy else 22.0},
+        "wind": {"speed": 3.0},
+        "weather": [{"main": "Rain" if rainy else "Clear"}],
+    }
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    rainy_locations = frozenset()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        location = parse_qs(url.query).get("q", [""])[0]
+        rainy = location in self.rainy_locations
+        time.sleep(self.delay)
+
+        if url.path.endswith("/weather"):
+            body = {**_reading(rainy), "name": location}
+            if rainy:
+                body["rain"] = {"1h": 5.0}
+        elif url.path.endswith("/forecast"):
+            now = int(datetime.now(timezone.utc).timestamp())
+            start = now - now % (3 * 3600)
+            body = {
+                "city": {"name": location, "timezone": 0},
+                "list": [
+                    {**_reading(rainy), "dt": start + step * 3 * 3600, "pop": 0.9 if rainy else 0.0}
+                    for step in range(FORECAST_STEPS)
+                ],
+            }
+        else:
+            self.send_error(404)
+            return
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(port=0, delay=0.0, rainy_locations=()):
+    """
+    Serve the stub in a background thread.
+    Returns: (server, api_root) - call server.shutdown() when done
+    """
+    handler = type("Handler", (StubWeatherHandler,), {
+        "delay": delay,
+        "rainy_locations": frozenset(rainy_locations),
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/data/2.5"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub OpenWeatherMap API")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds of latency per request")
+    parser.add_argument("--rain", action="append", default=[], help="Location with rain all week (repeatable)")
+    args = parser.parse_args()
+
+    server, api_root = start_stub_server(args.port, args.delay, args.rain)
+    print(f"🌦️ Stub weather API at {api_root}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,55 +1,61 @@
 from functools import wraps
-from flask import request, jsonify
-import jwt
-import os
+from flask import request, g
 from dotenv import load_dotenv
+from db import db
 from models.user import UserModel
+from utils.tokens import decode_token
 
 load_dotenv()
 
-SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this")
+def get_bearer_token():
+    """Raw token from the Authorization header, or None"""
+    header = request.headers.get("Authorization", "")
+    scheme, _, token = header.partition(" ")
+    if scheme != "Bearer" or not token:
+        return None
+    return token
+
+def get_jwt_claims():
+    """Verified access token claims from the Authorization header, or None (no DB query)"""
+    if "jwt_claims" not in g:
+        token = get_bearer_token()
+        g.jwt_claims = decode_token(token) if token else None
+    return g.jwt_claims
 
 def get_jwt_identity():
-    """Extract user from JWT token"""
-    token = request.headers.get("Authorization")
-    
-    if not token:
-        return None
-    
-    try:
-        # Remove "Bearer " prefix
-        token = token.split(" ")[1]
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        user = UserModel.query.get(payload.get("user_id"))
-        return user
-    except:
+    """Extract user from JWT token (one query, for endpoints that need more than the claims)"""
+    payload = get_jwt_claims()
+
+    if not payload:
         return None
 
+    return db.session.get(UserModel, payload.get("user_id"))
+
 def admin_required(fn):
     """Decorator to require admin role"""
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        user = get_jwt_identity()
-        
-        if not user:
+        claims = get_jwt_claims()
+
+        if not claims:
             return {"error": "Unauthorized - Please login"}, 401
-        
-        if not user.is_admin():
+
+        if claims.get("role") != "admin":
             return {"error": "Forbidden - Admin privileges required"}, 403
-        
+
         return fn(*args, **kwargs)
-    
+
     return wrapper
 
 def token_required(fn):
     """Decorator to require valid token"""
     @wraps(fn)
     def wrapper(*args, **kwargs):
-        user = get_jwt_identity()
-        
-        if not user:
+        claims = get_jwt_claims()
+
+        if not claims:
             return {"error": "Unauthorized - Please login"}, 401
-        
+
         return fn(*args, **kwargs)
-    
-    return wrapper
\ No newline at end of file
+
+    return wrapper
@@ -0,0 +1,23 @@
+import os
+from marshmallow import validate
+
+# Largest payload accepted by the /bulk endpoints
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+
+bulk_length = validate.Length(min=1, max=BULK_MAX_ITEMS)
+
+def item_error(index, message, **extra):
+    return {"index": index, "status": "error", "error": message, **extra}
+
+def bulk_response(results, success_code=200):
+    """
+    Per-item results of a bulk write. Bulk writes are all-or-nothing: if any
+    item failed validation nothing was applied and the answer is 400.
+    """
+    failed = sum(1 for result in results if result["status"] == "error")
+    return {
+        "applied": failed == 0,
+        "total": len(results),
+        "failed": failed,
+        "results": results
+    }, (400 if failed else success_code)
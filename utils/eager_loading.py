@@ -0,0 +1,53 @@
+from sqlalchemy.orm import joinedload, selectinload, load_only
+from models.court_booking import CourtBookingModel
+from models.match import MatchModel
+from models.team import TeamModel
+from models.team_member import TeamMemberModel
+from models.tournament import TournamentModel, TournamentTeamModel
+
+# Relationship graphs walked by each model's to_dict(). Loading them up front
+# keeps list endpoints at a constant number of queries regardless of row count:
+# many-to-one hops are joined, collections are fetched with one SELECT ... IN.
+
+def team_load_options(path=None):
+    """Team -> members -> player"""
+    members = (path.selectinload(TeamModel.members) if path is not None
+               else selectinload(TeamModel.members))
+    return [members.joinedload(TeamMemberModel.player)]
+
+def court_booking_load_options(path=None):
+    """CourtBooking -> court"""
+    court = (path.joinedload(CourtBookingModel.court) if path is not None
+             else joinedload(CourtBookingModel.court))
+    return [court]
+
+def match_load_options():
+    """Match -> team1/team2/winner (with members) and court_booking -> court"""
+    options = []
+    for relationship in (MatchModel.team1, MatchModel.team2, MatchModel.winner):
+        options.extend(team_load_options(joinedload(relationship)))
+    options.extend(court_booking_load_options(joinedload(MatchModel.court_booking)))
+    return options
+
+def tournament_load_options():
+    """Tournament -> teams -> team (with members), and match ids for the count"""
+    options = team_load_options(
+        selectinload(TournamentModel.teams).joinedload(TournamentTeamModel.team)
+    )
+    options.append(selectinload(TournamentModel.matches).options(load_only(MatchModel.id)))
+    return options
+
+LOAD_OPTIONS = {
+    MatchModel: match_load_options,
+    TeamModel: team_load_options,
+    TournamentModel: tournament_load_options,
+    CourtBookingModel: court_booking_load_options,
+}
+
+def eager_query(model):
+    """Query for model with everything its to_dict() needs loaded up front"""
+    return model.query.options(*LOAD_OPTIONS[model]())
+
+def serialize(items):
+    """to_dict() every item of a list"""
+    return [item.to_dict() for item in items]
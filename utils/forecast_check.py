@@ -0,0 +1,113 @@
+import os
+import tempfile
+
+# Always a throw-away database (the check drops and seeds its tables), no
+# response or shared weather cache and no metrics store: set before the app
+# modules are imported, since they read their settings at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='padel-forecast-'), 'forecast.db')}"
+os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+os.environ["METRICS_ENABLED"] = "0"
+os.environ.pop("WEATHER_CACHE_DB", None)
+
+from db import db
+from models.court_booking import CourtBookingModel
+from models.match import MatchModel
+from models.tournament import TournamentModel
+from algorithms.weather_guard import check_all_tournament_weather
+from benchmarks.generators import generate_courts, generate_teams, generate_tournament
+from services.weather_cache import weather_cache
+from services.weather_providers import FakeWeatherProvider, set_weather_provider
+from services.weather_service import describe_reading
+from sqlalchemy import insert
+from datetime import date, datetime, timedelta, time
+import random
+import sys
+import uuid
+
+# Bookings must be judged by the forecast for their own date and start time,
+# not by the weather at the moment of the check. With a FakeWeatherProvider
+# where it rains now but tomorrow morning is clear, and the reverse for
+# tomorrow afternoon, only the afternoon match may leave its outdoor court.
+LOCATION = "Tunis,TN"
+RAINY = {"rain_probability": 90, "condition": "rainy"}
+
+def _book(tournament_id, team1, team2, court_id, booking_date, start_minutes):
+    match_id = str(uuid.uuid4())
+    db.session.execute(insert(MatchModel), [{
+        "id": match_id,
+        "tournament_id": tournament_id,
+        "team1_id": team1["id"],
+        "team2_id": team2["id"],
+        "status": "pending",
+        "phase": "group"
+    }])
+    db.session.execute(insert(CourtBookingModel), [{
+        "id": str(uuid.uuid4()),
+        "match_id": match_id,
+        "court_id": court_id,
+        "booking_date": booking_date,
+        "start_minutes": start_minutes,
+        "end_minutes": start_minutes + 90
+    }])
+    return match_id
+
+def check_bookings_use_slot_forecast():
+    """
+    Run check_all_tournament_weather on a seeded tournament (call inside an
+    app context, on a throw-away database).
+    Returns: list of failure messages
+    """
+
+    db.drop_all()
+    db.create_all()
+
+    rng = random.Random(2024)
+    teams = generate_teams(rng, 4)
+    # Court 1 is outdoor in Tunis, court 4 indoor in Tunis
+    courts = generate_courts(rng, 4)
+    outdoor, indoor = courts[0], courts[3]
+    tournament_id, _ = generate_tournament(rng, teams, status="group_phase")
+
+    tomorrow = date.today() + timedelta(days=1)
+    morning = _book(tournament_id, teams[0], teams[1], outdoor["id"], tomorrow, 10 * 60)
+    afternoon = _book(tournament_id, teams[2], teams[3], outdoor["id"], tomorrow, 16 * 60)
+    db.session.commit()
+
+    provider = FakeWeatherProvider()
+    provider.set_weather(LOCATION, datetime.now(), **RAINY)
+    provider.set_weather(LOCATION, datetime.combine(tomorrow, time(16, 0)), **RAINY)
+    set_weather_provider(provider)
+    weather_cache.clear()
+
+    failures = []
+    if describe_reading(provider.get_current(LOCATION))["is_suitable"]:
+        failures.append("current weather should be unsuitable for the check to mean anything")
+
+    summary = check_all_tournament_weather(db.session.get(TournamentModel, tournament_id), LOCATION)
+    actions = {result["match_id"]: result["action"] for result in summary["results"]}
+    if actions.get(morning) != "no_action":
+        failures.append(f"clear 10:00 slot, rain now: expected no_action, got {actions.get(morning)}")
+    if actions.get(afternoon) != "relocated":
+        failures.append(f"rainy 16:00 slot, clear now: expected relocated, got {actions.get(afternoon)}")
+
+    bookings = {
+        booking.match_id: booking
+        for booking in CourtBookingModel.query.filter(CourtBookingModel.match_id.in_([morning, afternoon]))
+    }
+    if bookings[morning].court_id != outdoor["id"] or not bookings[morning].is_weather_suitable:
+        failures.append("10:00 booking should stay outdoor, marked suitable")
+    if bookings[afternoon].court_id != indoor["id"] or bookings[afternoon].is_weather_suitable:
+        failures.append("16:00 booking should move to the indoor court, marked unsuitable")
+    return failures
+
+if __name__ == "__main__":
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        failures = check_bookings_use_slot_forecast()
+        for failure in failures:
+            print(f"❌ {failure}")
+        if failures:
+            sys.exit(1)
+        print("✅ Bookings are judged by the forecast for their slot")
@@ -0,0 +1,305 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, request
+from db import db
+
+# Prometheus metrics for the API, the job workers and the algorithm hot paths,
+# served as text at /metrics.
+#
+# Every process (gunicorn workers, job workers) counts in memory and adds its
+# deltas to a SQLite file shared by all of them (METRICS_DB, default
+# instance/metrics.db) at most every METRICS_FLUSH_SECONDS, so a scrape of any
+# worker reports the totals of all of them. Counters and histograms only grow
+# (delete the file to reset them). Gauges (DB pool) are per process, with a
+# pid label, and dropped once a process has not reported for METRICS_GAUGE_TTL_SECONDS.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+METRICS_DB = os.getenv("METRICS_DB")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+METRICS_GAUGE_TTL_SECONDS = float(os.getenv("METRICS_GAUGE_TTL_SECONDS", "120"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")  # if set, /metrics needs "Authorization: Bearer <token>"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+ALGORITHM_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# name -> (type, help, histogram buckets)
+METRICS = {
+    "padel_http_requests_total": ("counter", "HTTP requests by blueprint, route, method and status", None),
+    "padel_http_request_duration_seconds": ("histogram", "HTTP request latency by blueprint, route and method", LATENCY_BUCKETS),
+    "padel_weather_api_calls_total": ("counter", "Weather provider calls by operation and outcome (ok/error)", None),
+    "padel_weather_api_duration_seconds": ("histogram", "Weather provider call latency", LATENCY_BUCKETS),
+    "padel_cache_requests_total": ("counter", "Response and weather cache lookups by result (hit/miss)", None),
+    "padel_algorithm_duration_seconds": ("histogram", "Run time of scheduling, weather checks and standings", ALGORITHM_BUCKETS),
+}
+
+GAUGES = {
+    "padel_db_pool_size": "Connections the pool keeps open",
+    "padel_db_pool_checked_out": "Connections in use",
+    "padel_db_pool_checked_in": "Idle connections in the pool",
+    "padel_db_pool_overflow": "Connections opened beyond the pool size",
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _label_key(labels):
+    return json.dumps(sorted((name, str(value)) for name, value in labels.items()))
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def _format_le(bound):
+    return "+Inf" if bound == float("inf") else _format_value(bound)
+
+class MetricsStore:
+    """Counter/histogram totals and per-process gauges in a SQLite file shared by all processes"""
+
+    def __init__(self, path):
+        self.path = path
+        self._execute("PRAGMA journal_mode=WAL")
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS metric_samples ("
+            "name TEXT NOT NULL, "
+            "labels TEXT NOT NULL, "
+            "field TEXT NOT NULL, "
+            "value REAL NOT NULL, "
+            "PRIMARY KEY (name, labels, field))"
+        )
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS metric_gauges ("
+            "name TEXT NOT NULL, "
+            "labels TEXT NOT NULL, "
+            "value REAL NOT NULL, "
+            "updated_at REAL NOT NULL, "
+            "PRIMARY KEY (name, labels))"
+        )
+
+    def _execute(self, *statements):
+        """Run (sql, params) statements in one transaction, return the last cursor's rows"""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                rows = []
+                for statement in statements:
+                    sql, params = statement if isinstance(statement, tuple) else (statement, ())
+                    rows = conn.execute(sql, params).fetchall()
+                return rows
+        finally:
+            conn.close()
+
+    def add(self, deltas, gauges):
+        """Add counter/histogram deltas and replace this process's gauges"""
+        now = time.time()
+        self._execute(
+            *[
+                ("INSERT INTO metric_samples (name, labels, field, value) VALUES (?, ?, ?, ?) "
+                 "ON CONFLICT(name, labels, field) DO UPDATE SET value = value + excluded.value",
+                 (name, labels, field, delta))
+                for (name, labels, field), delta in deltas.items()
+            ],
+            *[
+                ("INSERT OR REPLACE INTO metric_gauges (name, labels, value, updated_at) VALUES (?, ?, ?, ?)",
+                 (name, labels, value, now))
+                for name, labels, value in gauges
+            ],
+            ("DELETE FROM metric_gauges WHERE updated_at < ?", (now - METRICS_GAUGE_TTL_SECONDS,)),
+        )
+
+    def samples(self):
+        return self._execute("SELECT name, labels, field, value FROM metric_samples")
+
+    def gauges(self):
+        return self._execute("SELECT name, labels, value FROM metric_gauges")
+
+class MetricsRegistry:
+    """In-process counts, added to the shared store on flush()"""
+
+    def __init__(self):
+        self.store = None
+        self.engine = None
+        self._pending = {}  # (name, label key, field) -> delta since the last flush
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _add(self, key, amount):
+        self._pending[key] = self._pending.get(key, 0) + amount
+
+    def inc(self, name, amount=1, **labels):
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._add((name, _label_key(labels), ""), amount)
+
+    def observe(self, name, value, **labels):
+        """Add value to a histogram (every bucket it fits in, plus sum and count)"""
+        if not METRICS_ENABLED:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            for bound in (*METRICS[name][2], float("inf")):
+                if value <= bound:
+                    self._add((name, key, f"le={bound}"), 1)
+            self._add((name, key, "sum"), value)
+            self._add((name, key, "count"), 1)
+
+    def _pool_gauges(self):
+        pool = self.engine.pool if self.engine is not None else None
+        labels = _label_key({"pid": os.getpid()})
+        stats = {
+            "padel_db_pool_size": "size",
+            "padel_db_pool_checked_out": "checkedout",
+            "padel_db_pool_checked_in": "checkedin",
+            "padel_db_pool_overflow": "overflow",
+        }
+        # Only QueuePool keeps these numbers; its overflow() is negative
+        # while fewer than pool_size connections have been opened
+        return [
+            (name, labels, max(getattr(pool, method)(), 0))
+            for name, method in stats.items()
+            if hasattr(pool, method)
+        ]
+
+    def flush(self, force=False):
+        """Add pending counts to the shared store (at most every METRICS_FLUSH_SECONDS unless forced)"""
+        if self.store is None:
+            return
+        with self._lock:
+            if not force and time.monotonic() - self._last_flush < METRICS_FLUSH_SECONDS:
+                return
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+
+        try:
+            self.store.add(pending, self._pool_gauges())
+        except sqlite3.Error as e:
+            # Keep the counts for the next flush
+            with self._lock:
+                for key, amount in pending.items():
+                    self._add(key, amount)
+            print(f"⚠️ Metrics flush failed: {e}")
+
+    def render(self):
+        """All processes' metrics in the Prometheus text format"""
+        self.flush(force=True)
+
+        series = {}  # name -> {label key: {field: value}}
+        for name, labels, field, value in self.store.samples():
+            series.setdefault(name, {}).setdefault(labels, {})[field] = value
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, fields in sorted(series.get(name, {}).items()):
+                pairs = json.loads(labels)
+                if kind == "counter":
+                    lines.append(f"{name}{_format_labels(pairs)} {_format_value(fields.get('', 0))}")
+                    continue
+                for bound in (*buckets, float("inf")):
+                    bucket_labels = _format_labels(pairs + [["le", _format_le(bound)]])
+                    lines.append(f"{name}_bucket{bucket_labels} {_format_value(fields.get(f'le={bound}', 0))}")
+                lines.append(f"{name}_sum{_format_labels(pairs)} {_format_value(fields.get('sum', 0))}")
+                lines.append(f"{name}_count{_format_labels(pairs)} {_format_value(fields.get('count', 0))}")
+
+        # Hit ratio per cache, from the aggregated lookups
+        lookups = {}
+        for labels, fields in series.get("padel_cache_requests_total", {}).items():
+            pairs = dict(json.loads(labels))
+            counts = lookups.setdefault(pairs["cache"], {"hit": 0, "miss": 0})
+            counts[pairs["result"]] += fields.get("", 0)
+        lines.append("# HELP padel_cache_hit_ratio Share of cache lookups answered from the cache")
+        lines.append("# TYPE padel_cache_hit_ratio gauge")
+        for cache, counts in sorted(lookups.items()):
+            total = counts["hit"] + counts["miss"]
+            ratio = counts["hit"] / total if total else 0
+            lines.append(f"padel_cache_hit_ratio{_format_labels([['cache', cache]])} {_format_value(ratio)}")
+
+        gauges = {}
+        for name, labels, value in self.store.gauges():
+            gauges.setdefault(name, []).append((labels, value))
+        for name, help_text in GAUGES.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in sorted(gauges.get(name, [])):
+                lines.append(f"{name}{_format_labels(json.loads(labels))} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+def inc(name, amount=1, **labels):
+    metrics.inc(name, amount, **labels)
+
+def observe(name, value, **labels):
+    metrics.observe(name, value, **labels)
+
+def flush_metrics(force=False):
+    metrics.flush(force)
+
+def timed(algorithm):
+    """Record the decorated function's run time in padel_algorithm_duration_seconds"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe("padel_algorithm_duration_seconds", time.perf_counter() - started, algorithm=algorithm)
+        return wrapper
+    return decorator
+
+def _start_request():
+    g.metrics_started = time.perf_counter()
+
+def _finish_request(response):
+    started = g.pop("metrics_started", None)
+    if started is None:
+        return response
+
+    labels = {
+        "blueprint": request.blueprint or "",
+        "route": request.url_rule.rule if request.url_rule else "unmatched",
+        "method": request.method
+    }
+    observe("padel_http_request_duration_seconds", time.perf_counter() - started, **labels)
+    inc("padel_http_requests_total", status=response.status_code, **labels)
+    metrics.flush()
+    return response
+
+def metrics_response():
+    """The /metrics view: every process's metrics as Prometheus text"""
+    if metrics.store is None:
+        return {"error": "Metrics are disabled"}, 404
+
+    if METRICS_TOKEN and request.headers.get("Authorization") != f"Bearer {METRICS_TOKEN}":
+        return {"error": "Unauthorized"}, 401
+
+    return current_app.response_class(metrics.render(), status=200, content_type=CONTENT_TYPE)
+
+def init_metrics(app):
+    """Open the shared store and time every request (call from create_app)"""
+    if not METRICS_ENABLED:
+        print("📈 Metrics: off")
+        return
+
+    path = METRICS_DB or os.path.join(app.instance_path, "metrics.db")
+    metrics.store = MetricsStore(path)
+    with app.app_context():
+        metrics.engine = db.engine
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    atexit.register(metrics.flush, True)
+    print(f"📈 Metrics: {path}")
@@ -0,0 +1,127 @@
+from flask import request
+from marshmallow import Schema, fields, validate
+from sqlalchemy import select
+from db import db
+from urllib.parse import urlencode
+from datetime import datetime, time, timedelta
+import base64
+
+MAX_PAGE_SIZE = 500
+
+# Schemas
+class ListArgsSchema(Schema):
+    limit = fields.Integer(required=False, validate=validate.Range(min=1, max=MAX_PAGE_SIZE), metadata={"description": "Page size (enables cursor pagination)"})
+    cursor = fields.String(required=False, metadata={"description": "Opaque cursor from the X-Next-Cursor header of the previous page"})
+    projection = fields.String(required=False, data_key="fields", metadata={"description": "Comma-separated fields to return, nested with dots (e.g. id,status,team1.name)"})
+
+class DateRangeArgsSchema(ListArgsSchema):
+    date_from = fields.Date(required=False, metadata={"description": "Only items on or after this date (YYYY-MM-DD)"})
+    date_to = fields.Date(required=False, metadata={"description": "Only items on or before this date (YYYY-MM-DD)"})
+
+class StatusListArgsSchema(DateRangeArgsSchema):
+    status = fields.String(required=False, metadata={"description": "Filter by status"})
+
+class MatchListArgsSchema(StatusListArgsSchema):
+    phase = fields.String(required=False, validate=validate.OneOf(["group", "knockout"]), metadata={"description": "Filter by phase"})
+
+def encode_cursor(item_id):
+    return base64.urlsafe_b64encode(item_id.encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        return base64.urlsafe_b64decode(cursor.encode()).decode() or None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def sort_columns(model):
+    """Stable keyset order: (created_at, id), or id alone for models without created_at"""
+    if hasattr(model, "created_at"):
+        return [model.created_at, model.id]
+    return [model.id]
+
+def after_cursor(model, cursor_id):
+    """
+    Keyset predicate for rows after cursor_id. The cursor row's sort values
+    are read in SQL, so they compare exactly as stored.
+    """
+    if not hasattr(model, "created_at"):
+        return model.id > cursor_id
+
+    cursor_created_at = select(model.created_at).where(model.id == cursor_id).scalar_subquery()
+    return db.or_(
+        model.created_at > cursor_created_at,
+        db.and_(model.created_at == cursor_created_at, model.id > cursor_id)
+    )
+
+def filter_created_between(query, model, args):
+    """
+    Apply the date_from/date_to args to the model's created_at, as half-open
+    bounds on the raw column so its index can serve both.
+    """
+    if args.get("date_from"):
+        query = query.filter(model.created_at >= datetime.combine(args["date_from"], time.min))
+    if args.get("date_to"):
+        query = query.filter(model.created_at < datetime.combine(args["date_to"] + timedelta(days=1), time.min))
+    return query
+
+def parse_fields(spec):
+    """ "id,team1.name,team1.id" -> {"id": {}, "team1": {"name": {}, "id": {}}} """
+    tree = {}
+    for path in spec.split(","):
+        node = tree
+        for part in path.strip().split("."):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+def project(data, tree):
+    """Keep only the fields in tree (nested dicts and lists are walked)"""
+    if not tree:
+        return data
+    if isinstance(data, list):
+        return [project(item, tree) for item in data]
+    if isinstance(data, dict):
+        return {key: project(data[key], subtree) for key, subtree in tree.items() if key in data}
+    return data
+
+def paginate(query, model, args):
+    """
+    Apply keyset pagination and field projection to a list query.
+
+    Without limit/cursor the whole list is returned (what the dashboard
+    expects). With them, rows are ordered by (created_at, id) and the next
+    page's cursor is sent in the X-Next-Cursor and Link headers.
+    Returns: (body, status, headers)
+    """
+
+    query = query.order_by(*sort_columns(model))
+    headers = {}
+
+    if args.get("cursor"):
+        cursor_id = decode_cursor(args["cursor"])
+        if cursor_id is None:
+            return {"error": "Invalid cursor"}, 400, headers
+        query = query.filter(after_cursor(model, cursor_id))
+
+    limit = args.get("limit")
+    if args.get("cursor") and not limit:
+        limit = MAX_PAGE_SIZE
+
+    if limit:
+        items = query.limit(limit + 1).all()
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].id)
+            headers["X-Next-Cursor"] = next_cursor
+            next_args = request.args.to_dict()
+            next_args["cursor"] = next_cursor
+            headers["Link"] = f'<{request.path}?{urlencode(next_args)}>; rel="next"'
+    else:
+        items = query.all()
+
+    body = [item.to_dict() for item in items]
+
+    if args.get("projection"):
+        body = project(body, parse_fields(args["projection"]))
+
+    return body, 200, headers
@@ -0,0 +1,102 @@
+from db import db
+from models.court_booking import CourtBookingModel
+from models.match import MatchModel
+from benchmarks.generators import generate_courts, generate_teams, generate_tournament
+from sqlalchemy import event, insert
+from datetime import date, timedelta
+import os
+import random
+import sys
+import tempfile
+import uuid
+
+# List endpoints that load their relationship graphs up front (see
+# utils/eager_loading). Each must run the same number of queries whether it
+# returns one row or many; a count that grows with the rows is an N+1.
+LIST_ENDPOINTS = ["/match", "/team", "/tournament"]
+ROW_COUNTS = (1, 50)
+
+def seed_rows(count, seed=2024):
+    """count teams, tournaments and booked matches (every relationship to_dict() walks)"""
+    rng = random.Random(seed)
+    teams = generate_teams(rng, count + 1)
+    courts = generate_courts(rng, 3)
+
+    matches = []
+    bookings = []
+    for i in range(count):
+        team1, team2 = teams[i], teams[i + 1]
+        tournament_id, _ = generate_tournament(rng, [team1, team2])
+        match_id = str(uuid.uuid4())
+        matches.append({
+            "id": match_id,
+            "tournament_id": tournament_id,
+            "team1_id": team1["id"],
+            "team2_id": team2["id"],
+            "team1_score": 6,
+            "team2_score": 3,
+            "winner_id": team1["id"],
+            "status": "finished",
+            "phase": "group"
+        })
+        bookings.append({
+            "id": str(uuid.uuid4()),
+            "match_id": match_id,
+            "court_id": courts[i % len(courts)]["id"],
+            "booking_date": date(2030, 1, 1) + timedelta(days=i),
+            "start_minutes": 600,
+            "end_minutes": 690
+        })
+
+    db.session.execute(insert(MatchModel), matches)
+    db.session.execute(insert(CourtBookingModel), bookings)
+    db.session.commit()
+
+def count_list_queries(app):
+    """
+    Queries run by each list endpoint at every ROW_COUNTS size, on an empty
+    database seeded for each size (response cache off).
+    Returns: {path: {row count: queries}}
+    """
+
+    queries = []
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    counts = {path: {} for path in LIST_ENDPOINTS}
+    client = app.test_client()
+    for rows in ROW_COUNTS:
+        with app.app_context():
+            db.drop_all()
+            db.create_all()
+            seed_rows(rows)
+            db.session.remove()
+
+        for path in LIST_ENDPOINTS:
+            queries.clear()
+            response = client.get(path)
+            if response.status_code != 200 or len(response.get_json()) < rows:
+                raise RuntimeError(f"GET {path} returned {response.status_code} without {rows} rows")
+            counts[path][rows] = len(queries)
+    return counts
+
+if __name__ == "__main__":
+    # Always a throw-away database: the check drops and seeds its tables
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='padel-queries-'), 'queries.db')}"
+    os.environ["RESPONSE_CACHE_BACKEND"] = "none"
+    os.environ["METRICS_ENABLED"] = "0"
+
+    from app import create_app
+
+    counts = count_list_queries(create_app())
+    failures = 0
+    for path, by_rows in counts.items():
+        summary = ", ".join(f"{queries} queries for {rows} rows" for rows, queries in by_rows.items())
+        if len(set(by_rows.values())) > 1:
+            failures += 1
+            print(f"❌ GET {path}: {summary}")
+        else:
+            print(f"✅ GET {path}: {summary}")
+    if failures:
+        sys.exit(1)
+    print("✅ List endpoints run a constant number of queries")
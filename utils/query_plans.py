@@ -0,0 +1,76 @@
+from db import db
+from sqlalchemy import text
+import sys
+
+# Hot queries from advanced_scheduling/occupancy, weather_guard, positions_table
+# and the resources. Each must be answered through an index, never a full scan.
+HOT_QUERIES = {
+    "court bookings by court and date range": (
+        "court_bookings",
+        "SELECT * FROM court_bookings WHERE court_id IN ('a', 'b') "
+        "AND booking_date >= '2030-01-01' AND booking_date <= '2030-01-30'"
+    ),
+    "court bookings by match": (
+        "court_bookings",
+        "SELECT * FROM court_bookings WHERE match_id = 'a'"
+    ),
+    "upcoming court bookings": (
+        "court_bookings",
+        "SELECT * FROM court_bookings WHERE booking_date >= '2030-01-01'"
+    ),
+    "matches by team": (
+        "matches",
+        "SELECT * FROM matches WHERE team1_id = 'a' OR team2_id = 'a'"
+    ),
+    "matches by tournament, status and phase": (
+        "matches",
+        "SELECT * FROM matches WHERE tournament_id = 'a' AND status = 'finished' AND phase = 'group'"
+    ),
+    "team members by team": (
+        "team_members",
+        "SELECT * FROM team_members WHERE team_id IN ('a', 'b')"
+    ),
+    "team members by player": (
+        "team_members",
+        "SELECT * FROM team_members WHERE player_id IN ('a', 'b')"
+    ),
+    "tournament registration": (
+        "tournament_teams",
+        "SELECT * FROM tournament_teams WHERE tournament_id = 'a' AND team_id = 'b'"
+    ),
+    "standings by tournament": (
+        "tournament_standings",
+        "SELECT * FROM tournament_standings WHERE tournament_id = 'a' ORDER BY points DESC"
+    ),
+}
+
+def check_hot_query_plans():
+    """
+    Run EXPLAIN QUERY PLAN on every hot query (SQLite only).
+    Returns: list of (name, plan detail) for queries that scan their table
+    """
+
+    if db.engine.dialect.name != "sqlite":
+        print("ℹ️ Query plan check only runs on SQLite, skipping")
+        return []
+
+    regressions = []
+    for name, (table, sql) in HOT_QUERIES.items():
+        plan = [row[-1] for row in db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+        for detail in plan:
+            # "SCAN court_bookings" is a full scan; "SEARCH ... USING INDEX" is fine
+            if detail.startswith(f"SCAN {table}") and "USING" not in detail:
+                regressions.append((name, detail))
+    return regressions
+
+if __name__ == "__main__":
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        regressions = check_hot_query_plans()
+        for name, detail in regressions:
+            print(f"❌ {name}: {detail}")
+        if regressions:
+            sys.exit(1)
+        print("✅ All hot queries use an index")
\ No newline at end of file
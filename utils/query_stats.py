@@ -0,0 +1,213 @@
+import contextvars
+import heapq
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, request
+from sqlalchemy import event
+from db import db
+
+# Per-request (and per-job) SQL instrumentation from SQLAlchemy engine events.
+#
+# Every request counts its statements, DB time and rows, keeps its slowest
+# statements and counts statements by shape (SQL with parameters and IN lists
+# folded), so one statement repeated for every item of a list shows up as a
+# possible N+1. Responses get a Server-Timing header (visible in the browser's
+# network panel); slow requests, slow statements and N+1 suspects are logged
+# as one JSON line each. Jobs (services/jobs.py) are measured the same way.
+#
+# Rows are what the driver reports: affected rows for writes, rows returned
+# by SELECTs on PostgreSQL; on SQLite, SELECT rows are counted as they are
+# fetched.
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "1") == "1"
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))      # one statement
+SQL_SLOW_REQUEST_MS = float(os.getenv("SQL_SLOW_REQUEST_MS", "250"))  # DB time of a whole request
+SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))  # same shape more often = N+1 suspect, 0 = off
+SQL_SLOWEST_STATEMENTS = int(os.getenv("SQL_SLOWEST_STATEMENTS", "3"))
+SQL_LOG_ALL = os.getenv("SQL_LOG_ALL", "0") == "1"                    # log every request, not just flagged ones
+
+# Longest SQL text kept in logs
+STATEMENT_LOG_CHARS = 300
+
+_current = contextvars.ContextVar("query_stats", default=None)
+
+# Bind parameters of every DB-API style (?, %s, %(name)s, :name, $1)
+_PLACEHOLDER = re.compile(r"%\([^)]*\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+
+def statement_shape(statement):
+    """SQL with every parameter as ? and IN lists of any length as one ?"""
+    shape = _PLACEHOLDER_LIST.sub("?", _PLACEHOLDER.sub("?", statement))
+    return " ".join(shape.split())
+
+class QueryStats:
+    """SQL statements run while one request or job was current"""
+
+    def __init__(self, label):
+        self.label = label
+        self.started = time.perf_counter()
+        self.finished = None
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.shapes = Counter()
+        self._slowest = []  # min-heap of (seconds, order, statement)
+
+    def record(self, statement, seconds, rows):
+        self.queries += 1
+        self.db_seconds += seconds
+        if rows > 0:
+            self.rows += rows
+        self.shapes[statement_shape(statement)] += 1
+
+        item = (seconds, self.queries, statement)
+        if len(self._slowest) < SQL_SLOWEST_STATEMENTS:
+            heapq.heappush(self._slowest, item)
+        elif SQL_SLOWEST_STATEMENTS and seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed_seconds(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def slowest(self):
+        """[(seconds, statement)], slowest first"""
+        return [(seconds, statement) for seconds, _, statement in sorted(self._slowest, reverse=True)]
+
+    def n_plus_one(self, threshold=SQL_N_PLUS_ONE_THRESHOLD):
+        """[(shape, count)] for statement shapes run more than threshold times"""
+        if not threshold:
+            return []
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def is_flagged(self):
+        """Slow, has a slow statement, or looks like an N+1"""
+        slowest = self.slowest()
+        return (
+            self.db_seconds * 1000 >= SQL_SLOW_REQUEST_MS
+            or (slowest and slowest[0][0] * 1000 >= SQL_SLOW_QUERY_MS)
+            or bool(self.n_plus_one())
+        )
+
+    def summary(self):
+        return {
+            "label": self.label,
+            "duration_ms": round(self.elapsed_seconds * 1000, 2),
+            "queries": self.queries,
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "rows": self.rows,
+            "slowest": [
+                {"ms": round(seconds * 1000, 2), "sql": " ".join(statement.split())[:STATEMENT_LOG_CHARS]}
+                for seconds, statement in self.slowest()
+            ],
+            "n_plus_one": [
+                {"count": count, "sql": shape[:STATEMENT_LOG_CHARS]}
+                for shape, count in self.n_plus_one()
+            ]
+        }
+
+    def server_timing(self):
+        """Server-Timing header value: DB time with query and row counts, and total time"""
+        return (
+            f'db;desc="{self.queries} queries, {self.rows} rows";dur={self.db_seconds * 1000:.2f}, '
+            f"app;dur={self.elapsed_seconds * 1000:.2f}"
+        )
+
+def current_query_stats():
+    """QueryStats of the request or job running in this context, or None"""
+    return _current.get()
+
+def log_query_stats(stats, **fields):
+    """Print stats as one JSON line if flagged (or SQL_LOG_ALL)"""
+    if not (SQL_LOG_ALL or stats.is_flagged()):
+        return
+    print(json.dumps({"event": "sql_stats", **fields, **stats.summary()}), flush=True)
+
+@contextmanager
+def collect_queries(label):
+    """Measure the SQL run inside the block (nested blocks count separately)"""
+    stats = QueryStats(label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+        stats.finish()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_started")
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop(), cursor.rowcount)
+
+def _handle_error(exception_context):
+    started = exception_context.connection.info.get("query_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+def _count_row(cursor, row):
+    stats = _current.get()
+    if stats is not None:
+        stats.rows += 1
+    return row
+
+def _count_sqlite_rows(dbapi_connection, connection_record=None):
+    """SQLite reports no rowcount for SELECTs: count rows as they are fetched"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.row_factory = _count_row
+
+def _start_request():
+    stats = QueryStats(f"{request.method} {request.path}")
+    g.query_stats = stats
+    g.query_stats_token = _current.set(stats)
+
+def _finish_request(response):
+    stats = g.pop("query_stats", None)
+    if stats is None:
+        return response
+
+    stats.finish()
+    response.headers.add("Server-Timing", stats.server_timing())
+    log_query_stats(
+        stats,
+        method=request.method,
+        path=request.path,
+        endpoint=request.endpoint,
+        status=response.status_code
+    )
+    return response
+
+def _end_request(exc=None):
+    token = g.pop("query_stats_token", None)
+    if token is not None:
+        _current.reset(token)
+
+def init_query_stats(app):
+    """Hook the instrumentation into the engine and the request lifecycle (call from create_app)"""
+    if not SQL_INSTRUMENTATION:
+        print("📏 SQL instrumentation: off")
+        return
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(db.engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(db.engine, "handle_error", _handle_error)
+        event.listen(db.engine, "connect", _count_sqlite_rows)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_end_request)
+    print(f"📏 SQL instrumentation: on (slow statement {SQL_SLOW_QUERY_MS:g}ms, "
+          f"slow request {SQL_SLOW_REQUEST_MS:g}ms, N+1 above {SQL_N_PLUS_ONE_THRESHOLD} repeats)")
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from utils.auth_decorator import get_jwt_claims
+from utils.metrics import inc
+
+# Read-through cache for GET responses, keyed on role + path + query.
+#
+# Every cached response carries tags (e.g. "tournament:<id>", "matches").
+# Write handlers call invalidate(*tags), which bumps each tag's version; an
+# entry is only served while the versions it was built with are current.
+# "kind:<id>" tags also depend on "kind:*", so invalidate("court:*") drops
+# every per-court entry at once.
+#
+# RESPONSE_CACHE_BACKEND:
+#   sqlite - shared file (RESPONSE_CACHE_DB, default instance/response_cache.db),
+#            so gunicorn workers and job workers see each other's invalidations
+#   memory - in-process LRU, only for a single process (python app.py)
+#   none   - caching off
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "sqlite")
+RESPONSE_CACHE_DB = os.getenv("RESPONSE_CACHE_DB")
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+
+# Response headers kept with a cached body
+CACHED_HEADERS = ("Content-Type", "X-Next-Cursor", "Link")
+
+def expand_tags(tags):
+    """Add the "kind:*" wildcard for every "kind:<id>" tag"""
+    expanded = set(tags)
+    for tag in tags:
+        kind, sep, _ = tag.partition(":")
+        if sep:
+            expanded.add(f"{kind}:*")
+    return sorted(expanded)
+
+class MemoryBackend:
+    """In-process LRU with TTL"""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, entry)
+        self._versions = {}            # tag -> version
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return {tag: self._versions.get(tag, 0) for tag in tags}
+
+    def invalidate(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SQLiteBackend:
+    """Entries and tag versions in a SQLite file shared by all processes"""
+
+    def __init__(self, path, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._execute("PRAGMA journal_mode=WAL")
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, "
+            "entry TEXT NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS response_cache_tags ("
+            "tag TEXT PRIMARY KEY, "
+            "version INTEGER NOT NULL)"
+        )
+
+    def _execute(self, *statements):
+        """Run (sql, params) statements in one transaction, return the last cursor's rows"""
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                rows = []
+                for statement in statements:
+                    sql, params = statement if isinstance(statement, tuple) else (statement, ())
+                    rows = conn.execute(sql, params).fetchall()
+                return rows
+        finally:
+            conn.close()
+
+    def get(self, key):
+        rows = self._execute((
+            "SELECT entry FROM response_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ))
+        return json.loads(rows[0][0]) if rows else None
+
+    def set(self, key, entry, ttl):
+        now = time.time()
+        self._execute(
+            ("INSERT OR REPLACE INTO response_cache (key, entry, expires_at) VALUES (?, ?, ?)",
+             (key, json.dumps(entry), now + ttl)),
+            ("DELETE FROM response_cache WHERE expires_at <= ?", (now,)),
+            # Over the limit: drop the entries closest to expiry
+            ("DELETE FROM response_cache WHERE key IN ("
+             "SELECT key FROM response_cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+             (self.max_entries,)),
+        )
+
+    def tag_versions(self, tags):
+        if not tags:
+            return {}
+        placeholders = ", ".join("?" for _ in tags)
+        rows = self._execute((
+            f"SELECT tag, version FROM response_cache_tags WHERE tag IN ({placeholders})",
+            tuple(tags)
+        ))
+        versions = dict.fromkeys(tags, 0)
+        versions.update(rows)
+        return versions
+
+    def invalidate(self, tags):
+        self._execute(*[
+            ("INSERT INTO response_cache_tags (tag, version) VALUES (?, 1) "
+             "ON CONFLICT(tag) DO UPDATE SET version = version + 1", (tag,))
+            for tag in tags
+        ])
+
+    def clear(self):
+        self._execute("DELETE FROM response_cache")
+
+class ResponseCache:
+    """Tag-versioned response cache over a backend (None = disabled)"""
+
+    def __init__(self, backend=None, ttl=RESPONSE_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+
+    def lookup(self, key):
+        """Cached entry for key if none of its tags changed since it was stored"""
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        if entry["versions"] != self.backend.tag_versions(list(entry["versions"])):
+            return None
+        return entry
+
+    def store(self, key, entry, versions):
+        self.backend.set(key, {**entry, "versions": versions}, self.ttl)
+
+    def invalidate(self, *tags):
+        if self.backend is not None and tags:
+            self.backend.invalidate(sorted(set(tags)))
+
+response_cache = ResponseCache()
+
+def init_response_cache(app):
+    """Pick the backend from RESPONSE_CACHE_BACKEND (call from create_app)"""
+    if RESPONSE_CACHE_BACKEND == "memory":
+        response_cache.backend = MemoryBackend()
+    elif RESPONSE_CACHE_BACKEND == "sqlite":
+        path = RESPONSE_CACHE_DB or os.path.join(app.instance_path, "response_cache.db")
+        response_cache.backend = SQLiteBackend(path)
+    else:
+        response_cache.backend = None
+    print(f"🗄️ Response cache: {RESPONSE_CACHE_BACKEND}")
+
+def invalidate(*tags):
+    """Drop cached responses carrying any of these tags (call after the commit)"""
+    response_cache.invalidate(*tags)
+
+def _cache_key():
+    claims = get_jwt_claims() or {}
+    query = "&".join(f"{name}={value}" for name, value in sorted(request.args.items(multi=True)))
+    return f"{claims.get('role', 'anonymous')}|{request.path}?{query}"
+
+def cached_response(*tags):
+    """
+    Cache a GET view's 200 responses, tagged with tags (formatted with the
+    view's URL arguments, e.g. "tournament:{tournament_id}").
+    Responses carry an ETag; a matching If-None-Match gets 304.
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if response_cache.backend is None:
+                return fn(*args, **kwargs)
+
+            key = _cache_key()
+            entry_tags = expand_tags([tag.format(**kwargs) for tag in tags])
+            entry = response_cache.lookup(key)
+
+            if entry is not None:
+                response = current_app.response_class(entry["body"], status=200, headers=entry["headers"])
+                response.headers["X-Cache"] = "HIT"
+                inc("padel_cache_requests_total", cache="response", result="hit")
+            else:
+                # Versions are read before the view runs, so a write that
+                # lands while it runs leaves this entry already stale
+                versions = response_cache.backend.tag_versions(entry_tags)
+                response = current_app.make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+                body = response.get_data(as_text=True)
+                entry = {
+                    "body": body,
+                    "headers": {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers},
+                    "etag": hashlib.sha1(body.encode()).hexdigest()
+                }
+                response_cache.store(key, entry, versions)
+                response.headers["X-Cache"] = "MISS"
+                inc("padel_cache_requests_total", cache="response", result="miss")
+
+            response.set_etag(entry["etag"])
+            # Browsers keep a private copy but always revalidate (cheap 304s)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response.make_conditional(request)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,8 @@
+def to_minutes(time_str):
+    """Convert "HH:MM" to minutes from midnight"""
+    hours, minutes = time_str.split(":")
+    return int(hours) * 60 + int(minutes)
+
+def to_time_str(minutes):
+    """Convert minutes from midnight to "HH:MM" """
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
\ No newline at end of file
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+import jwt
+from dotenv import load_dotenv
+from db import db
+from models.revoked_token import RevokedTokenModel
+from sqlalchemy.exc import IntegrityError
+
+load_dotenv()
+
+# Access tokens are short-lived and trusted on their signed claims alone
+# (user_id, email, role), so protected endpoints never touch the users table.
+# Refresh tokens last longer and are only accepted by /auth/refresh, which
+# reloads the user - a role change takes effect within ACCESS_TOKEN_MINUTES.
+SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this")
+ACCESS_TOKEN_MINUTES = int(os.getenv("ACCESS_TOKEN_MINUTES", "15"))
+REFRESH_TOKEN_DAYS = int(os.getenv("REFRESH_TOKEN_DAYS", "7"))
+
+# Revoked token ids are kept in memory and reloaded from revoked_tokens at
+# most every REVOCATION_SYNC_SECONDS, so a logout in one worker reaches the
+# others within that window without a query per request.
+REVOCATION_SYNC_SECONDS = int(os.getenv("REVOCATION_SYNC_SECONDS", "30"))
+
+def _encode(user, token_type, lifetime):
+    now = datetime.utcnow()
+    return jwt.encode({
+        "user_id": user.id,
+        "email": user.email,
+        "role": user.role,
+        "type": token_type,
+        "jti": str(uuid.uuid4()),
+        "iat": now,
+        "exp": now + lifetime
+    }, SECRET_KEY, algorithm="HS256")
+
+def issue_tokens(user):
+    """New access + refresh token pair for user"""
+    return {
+        "token": _encode(user, "access", timedelta(minutes=ACCESS_TOKEN_MINUTES)),
+        "refresh_token": _encode(user, "refresh", timedelta(days=REFRESH_TOKEN_DAYS)),
+        "expires_in": ACCESS_TOKEN_MINUTES * 60
+    }
+
+def decode_token(token, token_type="access"):
+    """Verified claims of token if it is a live, unrevoked token of token_type, else None"""
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+    except jwt.InvalidTokenError:
+        return None
+
+    if claims.get("type") != token_type or revocation_list.is_revoked(claims.get("jti")):
+        return None
+
+    return claims
+
+class RevocationList:
+    """In-memory set of revoked token ids, periodically reloaded from the database"""
+
+    def __init__(self, sync_seconds=REVOCATION_SYNC_SECONDS):
+        self.sync_seconds = sync_seconds
+        self._revoked = set()
+        self._synced_at = 0.0
+        self._lock = threading.Lock()
+
+    def _sync(self):
+        # Only tokens that have not expired yet can still be presented
+        rows = db.session.query(RevokedTokenModel.jti).filter(
+            RevokedTokenModel.expires_at > datetime.utcnow()
+        ).all()
+        self._revoked = {jti for (jti,) in rows}
+        self._synced_at = time.monotonic()
+
+    def is_revoked(self, jti):
+        if time.monotonic() - self._synced_at > self.sync_seconds:
+            with self._lock:
+                if time.monotonic() - self._synced_at > self.sync_seconds:
+                    self._sync()
+        return jti in self._revoked
+
+    def _row(self, claims, now):
+        return RevokedTokenModel(
+            jti=claims["jti"],
+            user_id=claims.get("user_id"),
+            token_type=claims["type"],
+            expires_at=datetime.utcfromtimestamp(claims["exp"]),
+            revoked_at=now
+        )
+
+    def revoke(self, claims):
+        """Revoke a decoded token (commits) and drop expired rows"""
+        now = datetime.utcnow()
+        db.session.merge(self._row(claims, now))
+        RevokedTokenModel.query.filter(RevokedTokenModel.expires_at <= now).delete()
+        db.session.commit()
+
+        with self._lock:
+            self._revoked.add(claims["jti"])
+
+    def use_once(self, claims):
+        """
+        Revoke a decoded single-use token (refresh rotation), checked against
+        the database rather than the in-memory set: False if any worker has
+        already used or revoked it. The INSERT on the jti primary key settles
+        concurrent uses. Commits.
+        """
+        if db.session.get(RevokedTokenModel, claims["jti"]) is not None:
+            return False
+
+        db.session.add(self._row(claims, datetime.utcnow()))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return False
+
+        with self._lock:
+            self._revoked.add(claims["jti"])
+        return True
+
+revocation_list = RevocationList()